@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response, HTMLResponse
 import logging
@@ -8,8 +8,11 @@ from enum import Enum
 import uvicorn
 
 # Import config
-from config.settings import api_key, DB_CONFIG
-from utils.db import get_db_connection, get_db_cursor
+from config.settings import api_key, DB_CONFIG, MODEL_WARMUP
+from utils.db import init_db_pool, close_db_pool
+from utils.model_registry import model_registry
+from utils.executor import PoolSaturatedError, shutdown_executors
+from utils.llm_gateway import close_llm_gateway
 
 # Import routers directly from their modules
 from routers.health_router import router as health_router
@@ -19,6 +22,7 @@ from routers.cv_router import router as cv_router
 from routers.query_router import router as query_router
 from routers.scoring_router import router as scoring_router
 from routers.report_router import router as report_router
+from routers.metrics_router import router as metrics_router
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
@@ -44,6 +48,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    """Shed load with a 503 instead of queueing work without bound"""
+    logger.warning(f"Rejected {request.method} {request.url.path}: {str(exc)}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Include routers
 app.include_router(health_router)
 app.include_router(recruitment_router)
@@ -52,6 +66,29 @@ app.include_router(cv_router)
 app.include_router(query_router)
 app.include_router(scoring_router)
 app.include_router(report_router)
+app.include_router(metrics_router)
+
+@app.on_event("startup")
+def startup_event():
+    """Open the shared database connection pool and warm up models"""
+    try:
+        init_db_pool()
+    except Exception as e:
+        # Don't block startup; the pool is created lazily on first use
+        logger.error(f"Failed to initialize database pool: {str(e)}")
+
+    # /health answers immediately; /ready reports when models are loaded
+    if MODEL_WARMUP == "eager":
+        model_registry.warm_up()
+    elif MODEL_WARMUP == "background":
+        model_registry.start_warmup()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Close pooled database connections, worker pools and LLM connections"""
+    close_db_pool()
+    shutdown_executors()
+    close_llm_gateway()
 
 @app.get("/")
 def read_root():
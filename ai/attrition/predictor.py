@@ -1,7 +1,15 @@
 import pickle
+import numpy as np
 import pandas as pd
 from typing import List, Optional
 from pydantic import BaseModel, validator
+from utils.model_registry import model_registry
+
+MODEL_PATH = 'attrition/best_tuned_model.pkl'
+MODEL_NAME = "attrition_model"
+
+# Columns the model was trained on, in order
+FEATURE_COLUMNS = ['age', 'region', 'work_mode', 'skills', 'department', 'duration']
 
 # Model for input data validation
 
@@ -29,18 +37,38 @@ class PredictionResponse(BaseModel):
     risk_level: str
     assessment: str
 
+
+# Model for batch scoring input
+
+
+class AttritionBatchRequest(BaseModel):
+    employees: List[EmployeeData] = []
+    from_database: bool = False  # Score all active employees from Postgres instead
+
 # Load the model
 
 
 def load_model():
+    with open(MODEL_PATH, 'rb') as file:
+        return pickle.load(file)
+
+
+# Unpickled once per process and reloaded when the .pkl file changes
+model_registry.register(MODEL_NAME, load_model, path=MODEL_PATH)
+
+
+def get_model():
     try:
-        with open('attrition/best_tuned_model.pkl', 'rb') as file:
-            model = pickle.load(file)
-        return model
+        return model_registry.get(MODEL_NAME)
     except Exception as e:
         print(f"Error loading model: {e}")
         return None
 
+
+def get_model_info():
+    """Version (content hash) and load time of the attrition model"""
+    return model_registry.info(MODEL_NAME)
+
 # Preprocess the input data
 
 
@@ -59,12 +87,35 @@ def preprocess_data(employee: EmployeeData):
     })
     return input_data
 
+# Preprocess many employees at once
+
+
+def preprocess_batch(frame: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized version of preprocess_data for a frame with one row per employee"""
+    frame = frame.copy()
+    frame['skills'] = [",".join(skills) if skills else "None" for skills in frame['skills']]
+
+    # Same rule as the EmployeeData validator: outside Greater Accra means Remote
+    remote = frame['region'].fillna("").str.lower() != "greater accra"
+    frame.loc[remote, 'work_mode'] = "Remote"
+    return frame[FEATURE_COLUMNS]
+
+# Map a probability to a risk level
+
+
+def assess_risk(probability: int):
+    if probability >= 75:
+        return "High Risk", "This employee has a high probability of leaving the organization soon."
+    elif 50 <= probability < 75:
+        return "Medium Risk", "This employee has a moderate risk of attrition and should be monitored."
+    return "Low Risk", "This employee has a low probability of leaving in the near future."
+
 # Make prediction
 
 
 def predict_attrition(employee: EmployeeData) -> PredictionResponse:
-    # Load model
-    model = load_model()
+    # Get the cached model
+    model = get_model()
     if not model:
         raise Exception("Model could not be loaded")
 
@@ -75,15 +126,7 @@ def predict_attrition(employee: EmployeeData) -> PredictionResponse:
     probability = int(float(model.predict_proba(input_data)[0][1]) * 100)
 
     # Determine risk level and assessment
-    if probability >= 75:
-        risk_level = "High Risk"
-        assessment = "This employee has a high probability of leaving the organization soon."
-    elif 50 <= probability < 75:
-        risk_level = "Medium Risk"
-        assessment = "This employee has a moderate risk of attrition and should be monitored."
-    else:
-        risk_level = "Low Risk"
-        assessment = "This employee has a low probability of leaving in the near future."
+    risk_level, assessment = assess_risk(probability)
 
     # Return prediction results
     return PredictionResponse(
@@ -91,3 +134,26 @@ def predict_attrition(employee: EmployeeData) -> PredictionResponse:
         risk_level=risk_level,
         assessment=assessment
     )
+
+# Make predictions for many employees with a single predict_proba call
+
+
+def predict_attrition_batch(frame: pd.DataFrame) -> List[dict]:
+    model = get_model()
+    if not model:
+        raise Exception("Model could not be loaded")
+    if frame.empty:
+        return []
+
+    input_data = preprocess_batch(frame)
+    probabilities = (model.predict_proba(input_data)[:, 1].astype(float) * 100).astype(np.int64)
+
+    results = []
+    for probability in probabilities.tolist():
+        risk_level, assessment = assess_risk(probability)
+        results.append({
+            "attrition_probability": float(probability),
+            "risk_level": risk_level,
+            "assessment": assessment
+        })
+    return results
@@ -4,6 +4,9 @@ set -e
 # Build the Docker image
 docker build -t rgt-api:latest .
 
+# Check that importing the app stays within the cold-start budget
+docker run --rm -e GROQ_API_KEY=benchmark rgt-api:latest python startup_benchmark.py
+
 # Run the container
 docker run -d -p 8000:8000 --name rgt-api-container rgt-api:latest
 
@@ -17,4 +17,100 @@ DB_CONFIG = {
 }
 
 # Constants
-MAX_PDF_PAGES = 5  # Maximum allowed PDF pages for CV uploads
\ No newline at end of file
+MAX_PDF_PAGES = 5  # Maximum allowed PDF pages for CV uploads
+
+# Database connection pool
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # Seconds to wait for a free connection
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))  # Recycle connections idle longer than this
+DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", "30"))  # Health-check connections idle longer than this
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+
+# Model loading: "background" warms models up after startup, "eager" loads them
+# before serving, "lazy" loads each model on first use
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "background").lower()
+MODEL_RELOAD_CHECK_INTERVAL = float(os.getenv("MODEL_RELOAD_CHECK_INTERVAL", "5"))  # Seconds between model file change checks
+
+# Embedding caches for candidate-side text (job-side embeddings are precomputed)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))  # Max cached embeddings per model
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", "3600"))  # Seconds before a cached embedding expires
+
+# Worker pools for blocking work dispatched from async endpoints (see utils.executor)
+IO_POOL_SIZE = int(os.getenv("IO_POOL_SIZE", "32"))  # Threads for blocking I/O: DB queries, LLM calls
+IO_QUEUE_LIMIT = int(os.getenv("IO_QUEUE_LIMIT", "64"))  # Tasks allowed to wait for a free thread
+INFERENCE_POOL_SIZE = int(os.getenv("INFERENCE_POOL_SIZE", str(min(4, os.cpu_count() or 1))))  # Threads for in-process model inference
+INFERENCE_QUEUE_LIMIT = int(os.getenv("INFERENCE_QUEUE_LIMIT", "32"))
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", str(os.cpu_count() or 1)))  # Processes for CPU-bound parsing
+CPU_QUEUE_LIMIT = int(os.getenv("CPU_QUEUE_LIMIT", "16"))
+EXECUTOR_RETRY_AFTER = int(os.getenv("EXECUTOR_RETRY_AFTER", "5"))  # Retry-After seconds sent with 503s
+
+# Micro-batching of concurrent sentence-transformer encode calls
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "32"))  # Max texts per encode call
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5"))  # Max time to hold a request for a batch
+MICRO_BATCH_RESULT_TIMEOUT = float(os.getenv("MICRO_BATCH_RESULT_TIMEOUT", "120"))  # Max seconds a caller waits for its embeddings (covers a cold model load)
+
+# Report response cache (see report.cache)
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "300"))  # Seconds a report is fresh if its data hasn't changed
+REPORT_STALE_TTL = float(os.getenv("REPORT_STALE_TTL", "3600"))  # Max age at which a stale report is served while it regenerates
+REPORT_FINGERPRINT_TTL = float(os.getenv("REPORT_FINGERPRINT_TTL", "5"))  # Seconds between data-version checks
+REPORT_QUERY_PARALLELISM = int(os.getenv("REPORT_QUERY_PARALLELISM", "4"))  # Report aggregates run at once (each holds a pooled connection)
+REPORT_QUERY_QUEUE_LIMIT = int(os.getenv("REPORT_QUERY_QUEUE_LIMIT", "32"))  # Report queries allowed to wait for a free slot
+REPORT_JOB_TTL = float(os.getenv("REPORT_JOB_TTL", "3600"))  # Seconds finished insight jobs are kept for polling
+REPORT_JOB_MAX = int(os.getenv("REPORT_JOB_MAX", "200"))  # Max insight jobs kept in memory
+
+# Shared LLM gateway (see utils.llm_gateway)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))  # Seconds per completion request
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))  # Idle connections kept open to the LLM API
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() == "true"  # Used when the h2 package is installed
+
+# LLM completion cache (see utils.completion_cache); TTLs are seconds, 0 disables caching for that call site
+# Completions can quote candidate or employee data, so they stay in memory unless LLM_CACHE_BACKEND=sqlite
+# and an explicit LLM_CACHE_PATH are set; the file is created owner-only (0600)
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # "memory" or "sqlite" (memory LRU in front of a local file)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")  # Required for the sqlite backend; no shared-temp default
+LLM_CACHE_PERSIST_PII = os.getenv("LLM_CACHE_PERSIST_PII", "false").lower() == "true"  # Also write CV extractions (names, contact details) to the file
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))  # In-memory LRU size
+LLM_CACHE_TTL_SQL = float(os.getenv("LLM_CACHE_TTL_SQL", "86400"))
+LLM_CACHE_TTL_INSIGHTS = float(os.getenv("LLM_CACHE_TTL_INSIGHTS", "3600"))
+LLM_CACHE_TTL_CV = float(os.getenv("LLM_CACHE_TTL_CV", "604800"))
+
+# Semantic NL-to-SQL cache (see kairo.semantic_cache)
+SQL_SEMANTIC_THRESHOLD = float(os.getenv("SQL_SEMANTIC_THRESHOLD", "0.92"))  # Min cosine similarity to reuse a query's SQL
+SQL_SEMANTIC_CACHE_SIZE = int(os.getenv("SQL_SEMANTIC_CACHE_SIZE", "500"))
+SQL_SEMANTIC_CACHE_TTL = float(os.getenv("SQL_SEMANTIC_CACHE_TTL", "86400"))
+
+# /query execution limits
+QUERY_ROW_CAP = int(os.getenv("QUERY_ROW_CAP", "10000"))  # Max rows returned for one generated query
+QUERY_FETCH_SIZE = int(os.getenv("QUERY_FETCH_SIZE", "1000"))  # Rows per round trip from the server-side cursor
+QUERY_STATEMENT_TIMEOUT_MS = int(os.getenv("QUERY_STATEMENT_TIMEOUT_MS", "15000"))
+QUERY_PUSHDOWN_SAMPLE_ROWS = int(os.getenv("QUERY_PUSHDOWN_SAMPLE_ROWS", "100"))  # Rows returned when stats are computed in Postgres
+QUERY_PUSHDOWN_TOP_K = int(os.getenv("QUERY_PUSHDOWN_TOP_K", "5"))  # Most frequent values reported per column
+
+# Guard for LLM-generated SQL (see kairo.sql_guard); costs are Postgres planner units
+QUERY_MAX_COST = float(os.getenv("QUERY_MAX_COST", "5000000"))  # Plans estimated above this are rejected
+QUERY_DOWNGRADE_COST = float(os.getenv("QUERY_DOWNGRADE_COST", "500000"))  # Above this, run with the reduced limits below
+QUERY_MAX_PLAN_ROWS = float(os.getenv("QUERY_MAX_PLAN_ROWS", "50000000"))  # Any plan node estimating more rows is rejected (e.g. cross joins)
+QUERY_DOWNGRADE_ROW_CAP = int(os.getenv("QUERY_DOWNGRADE_ROW_CAP", "1000"))
+QUERY_DOWNGRADE_TIMEOUT_MS = int(os.getenv("QUERY_DOWNGRADE_TIMEOUT_MS", "5000"))
+
+# Bulk CV screening (/upload-cv/batch)
+CV_BATCH_MAX_FILES = int(os.getenv("CV_BATCH_MAX_FILES", "100"))  # CVs per batch, after expanding zips
+CV_BATCH_MAX_FILE_BYTES = int(os.getenv("CV_BATCH_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+CV_BATCH_MAX_TOTAL_BYTES = int(os.getenv("CV_BATCH_MAX_TOTAL_BYTES", str(200 * 1024 * 1024)))  # Uploads plus decompressed zip members per batch
+CV_BATCH_LLM_CONCURRENCY = int(os.getenv("CV_BATCH_LLM_CONCURRENCY", "4"))  # Extraction LLM calls in flight per batch
+CV_LLM_REQUESTS_PER_MINUTE = float(os.getenv("CV_LLM_REQUESTS_PER_MINUTE", "30"))  # Token buckets shared by all batches, sized to the Groq quota
+CV_LLM_TOKENS_PER_MINUTE = float(os.getenv("CV_LLM_TOKENS_PER_MINUTE", "60000"))
+CV_LOCAL_EXTRACTION = os.getenv("CV_LOCAL_EXTRACTION", "true").lower() == "true"  # Regex/gazetteer fast path before the CV LLM call
+CV_TEXT_TOKEN_BUDGET = int(os.getenv("CV_TEXT_TOKEN_BUDGET", "3000"))  # Max CV text tokens sent for extraction; 0 disables truncation
+
+# Processed-CV cache (see cv_screening.result_cache): re-uploads skip parsing and extraction
+# Entries hold candidate PII (name, contact details, employment), so they stay in memory unless
+# CV_RESULT_CACHE_BACKEND=sqlite and an explicit CV_RESULT_CACHE_PATH are set; the file is created owner-only (0600)
+CV_RESULT_CACHE_BACKEND = os.getenv("CV_RESULT_CACHE_BACKEND", "memory")  # "memory" or "sqlite"
+CV_RESULT_CACHE_PATH = os.getenv("CV_RESULT_CACHE_PATH")  # Required for the sqlite backend; no shared-temp default
+CV_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("CV_RESULT_CACHE_MAX_ENTRIES", "512"))  # In-memory LRU size
+CV_RESULT_CACHE_TTL = float(os.getenv("CV_RESULT_CACHE_TTL", "604800"))  # Retention: 7 days, expired rows are purged; 0 disables the cache
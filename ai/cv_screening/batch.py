@@ -0,0 +1,219 @@
+import asyncio
+import io
+import json
+import logging
+import os
+import time
+import zipfile
+from config.settings import (
+    MAX_PDF_PAGES,
+    CPU_POOL_SIZE,
+    CV_BATCH_MAX_FILES,
+    CV_BATCH_MAX_FILE_BYTES,
+    CV_BATCH_MAX_TOTAL_BYTES,
+    CV_BATCH_LLM_CONCURRENCY,
+    CV_LLM_REQUESTS_PER_MINUTE,
+    CV_LLM_TOKENS_PER_MINUTE
+)
+from cv_screening.cv_processor import CV_EXTRACTION_PROMPT, extract_cv_text, process_cv_text
+from cv_screening.text_compaction import count_tokens, record_compaction
+from cv_screening.result_cache import file_key, text_key, lookup_cv_info, store_cv_info, mark_cached
+from cv_screening.pdf_utils import PageLimitExceeded
+from utils.executor import run_cpu, run_io
+from utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+CV_EXTENSIONS = ('.pdf', '.doc', '.docx')
+
+# Rough completion size of the extraction JSON, counted against the token quota
+EXPECTED_COMPLETION_TOKENS = 600
+
+# Result cache lookups/stores in flight per batch, so a large batch holds only a few io workers
+CACHE_CONCURRENCY = 4
+
+# Groq quotas are per API key, so every batch shares the same buckets
+llm_requests = TokenBucket("cv_llm_requests", CV_LLM_REQUESTS_PER_MINUTE / 60, max(1.0, CV_LLM_REQUESTS_PER_MINUTE / 6))
+llm_tokens = TokenBucket("cv_llm_tokens", CV_LLM_TOKENS_PER_MINUTE / 60, CV_LLM_TOKENS_PER_MINUTE / 6)
+
+
+class BatchItem:
+    """One CV of a batch, or the reason it couldn't be read"""
+
+    def __init__(self, filename, content=None, error=None):
+        self.filename = filename
+        self.content = content
+        self.error = error
+
+
+def expand_uploads(uploads, max_files=CV_BATCH_MAX_FILES, max_bytes=CV_BATCH_MAX_FILE_BYTES,
+                   max_total_bytes=CV_BATCH_MAX_TOTAL_BYTES):
+    """
+    Flatten uploaded files and zip archives into individual CVs.
+
+    ``uploads`` is a list of (filename, bytes), with None for bytes when the
+    upload was over its size limit. Zip members are listed and counted, and
+    their declared sizes checked against ``max_bytes`` and ``max_total_bytes``,
+    before any of them is decompressed. Anything unreadable becomes an item
+    carrying an error rather than failing the batch.
+    """
+    entries = []  # (label, content, zip member, archive, error)
+    archives = []
+    try:
+        for filename, content in uploads:
+            if content is None:
+                entries.append((filename, None, None, None, "File exceeds the upload size limit"))
+            elif filename.lower().endswith('.zip'):
+                try:
+                    archive = zipfile.ZipFile(io.BytesIO(content))
+                except zipfile.BadZipFile as e:
+                    entries.append((filename, None, None, None, f"Invalid zip archive: {str(e)}"))
+                    continue
+                archives.append(archive)
+                for member in archive.infolist():
+                    name = member.filename
+                    if member.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+                        continue
+                    label = f"{filename}/{name}"
+                    if not name.lower().endswith(CV_EXTENSIONS):
+                        entries.append((label, None, None, None, "Unsupported file format"))
+                    elif member.file_size > max_bytes:
+                        entries.append((label, None, None, None, f"File exceeds {max_bytes} bytes"))
+                    else:
+                        entries.append((label, None, member, archive, None))
+            elif len(content) > max_bytes:
+                entries.append((filename, None, None, None, f"File exceeds {max_bytes} bytes"))
+            else:
+                entries.append((filename, content, None, None, None))
+
+            # Checked as entries are listed, so a huge archive is rejected before it is read
+            if len(entries) > max_files:
+                raise ValueError(f"Batch contains more than {max_files} files, the limit is {max_files}")
+
+        # Zip members can't decompress past their declared size, so this bounds the batch's memory
+        total_bytes = sum(len(content) if member is None else member.file_size
+                          for _, content, member, _, error in entries if error is None)
+        if total_bytes > max_total_bytes:
+            raise ValueError(f"Batch expands to {total_bytes} bytes, the limit is {max_total_bytes}")
+
+        items = []
+        for label, content, member, archive, error in entries:
+            if error is not None:
+                items.append(BatchItem(label, error=error))
+            elif member is None:
+                items.append(BatchItem(label, content))
+            else:
+                try:
+                    items.append(BatchItem(label, archive.read(member)))
+                except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError, RuntimeError) as e:
+                    items.append(BatchItem(label, error=f"Unreadable zip member: {str(e)}"))
+        return items
+    finally:
+        for archive in archives:
+            archive.close()
+
+
+async def read_upload(file, limit, chunk_size=1 << 20):
+    """Upload contents, or None as soon as more than ``limit`` bytes have been read"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+
+
+def estimate_tokens(text):
+    """Prompt plus completion tokens of one extraction call (~4 characters per token)"""
+    return count_tokens(CV_EXTRACTION_PROMPT + text) + EXPECTED_COMPLETION_TOKENS
+
+
+class CVBatch:
+    """
+    Screens a batch of CVs concurrently.
+
+    Text extraction runs in the CPU process pool, at most one task per worker
+    so a large batch never saturates the pool; LLM extraction runs with at
+    most ``llm_concurrency`` calls in flight and is paced by the shared
+    request and token buckets. Result cache reads and writes share
+    ``CACHE_CONCURRENCY`` slots, so the io workers a batch can hold are
+    bounded by its cache and LLM slots. Results are yielded as they complete.
+    """
+
+    def __init__(self, items, llm_concurrency=CV_BATCH_LLM_CONCURRENCY):
+        self.items = items
+        self._parse_slots = asyncio.Semaphore(max(1, CPU_POOL_SIZE))
+        self._llm_slots = asyncio.Semaphore(max(1, llm_concurrency))
+        self._cache_slots = asyncio.Semaphore(CACHE_CONCURRENCY)
+
+    async def process(self, index, item):
+        start = time.perf_counter()
+        result = {"index": index, "filename": item.filename}
+        try:
+            if item.error:
+                raise ValueError(item.error)
+            # Previously processed CVs don't count against the parse slots or the LLM quota
+            upload_key = file_key(item.content)
+            cv_info = await self.cache_call(lookup_cv_info, upload_key)
+            match, text_stats = "file", None
+            if cv_info is None:
+                cv_info, match, text_stats = await self.extract(item, upload_key)
+            if "error" in cv_info:
+                result.update(status="error", error=cv_info["error"])
+            else:
+                result.update(status="ok", result=mark_cached(cv_info, match))
+                if text_stats is not None:
+                    result["text_compaction"] = text_stats
+        except PageLimitExceeded as e:
+            result.update(status="error", error=f"CV contains {e.page_count} pages, which exceeds our limit of {MAX_PDF_PAGES} pages")
+        except Exception as e:
+            # A bad file never fails the batch
+            logger.warning(f"CV batch item {item.filename} failed: {str(e)}")
+            result.update(status="error", error=str(e) or type(e).__name__)
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    async def extract(self, item, upload_key):
+        """Parse one CV and extract its fields, unless the same text was processed before"""
+        async with self._parse_slots:
+            text, text_stats = await run_cpu(extract_cv_text, item.content, item.filename, MAX_PDF_PAGES)
+        record_compaction(text_stats)
+        content_key = text_key(text)
+        cv_info = await self.cache_call(lookup_cv_info, content_key)
+        if cv_info is not None:
+            await self.cache_call(store_cv_info, [upload_key], cv_info)
+            return cv_info, "text", text_stats
+        async with self._llm_slots:
+            await llm_requests.acquire()
+            await llm_tokens.acquire(estimate_tokens(text))
+            cv_info = await run_io(process_cv_text, text)
+        await self.cache_call(store_cv_info, [upload_key, content_key], cv_info)
+        return cv_info, None, text_stats
+
+    async def cache_call(self, func, *args):
+        """Run a result cache operation on the io pool, within the batch's cache slots"""
+        async with self._cache_slots:
+            return await run_io(func, *args)
+
+    async def results(self):
+        """Yield per-file results in completion order"""
+        tasks = [asyncio.ensure_future(self.process(i, item)) for i, item in enumerate(self.items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away: stop the work that hasn't started yet
+            for task in tasks:
+                task.cancel()
+
+    async def ndjson(self):
+        succeeded = 0
+        async for result in self.results():
+            succeeded += result["status"] == "ok"
+            yield json.dumps(result, default=str) + "\n"
+        yield json.dumps({"summary": {"files": len(self.items), "succeeded": succeeded,
+                                      "failed": len(self.items) - succeeded}}) + "\n"
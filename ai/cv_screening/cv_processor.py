@@ -1,51 +1,74 @@
 import os
 import re
 import json
-from langchain_groq import ChatGroq
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+import io
+from functools import lru_cache
+from cv_screening.pdf_utils import extract_pdf_pages, PageLimitExceeded
+from cv_screening.text_compaction import compact_cv_text
+from utils.llm_gateway import CV_MODEL, complete, render_prompt
+from cv_screening.local_extract import extract_local_fields, extract_hint_fields, merge_languages
+from config.settings import LLM_CACHE_TTL_CV, LLM_CACHE_PERSIST_PII, CV_LOCAL_EXTRACTION
 
 
-def extract_text_from_file(file_path):
-    """Extract text from PDF or DOCX using Langchain loaders and text splitter"""
-    try:
-        # Get appropriate loader
-        if file_path.lower().endswith('.pdf'):
-            loader = PyPDFLoader(file_path)
-        elif file_path.lower().endswith(('.doc', '.docx')):
-            loader = Docx2txtLoader(file_path)
-        else:
-            raise ValueError("Unsupported file format")
-
-        # Load documents
-        documents = loader.load()
-
-        # Split text into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=100
-        )
-        docs = text_splitter.split_documents(documents)
-
-        # Combine all text
-        return " ".join([doc.page_content for doc in docs])
+def extract_cv_text(content, filename, max_pages=None):
+    """
+    Extract prompt-ready text from an uploaded PDF or DOCX held in memory.
+
+    PDFs are parsed once: the page limit is checked from the page tree and
+    text is only extracted when the CV is within ``max_pages``. Returns
+    ``(text, stats)`` with the token counts from compaction.
+    """
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        pages = extract_pdf_pages(content, max_pages)
+    elif name.endswith(('.doc', '.docx')):
+        import docx2txt
+        pages = [docx2txt.process(io.BytesIO(content)).strip()]
+    else:
+        raise ValueError("Unsupported file format")
+    return compact_cv_text(pages)
+
+
+def extract_text_from_bytes(content, filename, max_pages=None):
+    """Extract prompt-ready text from an uploaded PDF or DOCX held in memory"""
+    text, _ = extract_cv_text(content, filename, max_pages)
+    return text
 
+
+def extract_text_from_file(file_path, max_pages=None):
+    """Extract text from a PDF or DOCX file on disk"""
+    try:
+        with open(file_path, 'rb') as file:
+            return extract_text_from_bytes(file.read(), file_path, max_pages)
     except Exception as e:
         print(f"Error extracting text: {str(e)}")
         raise
 
 
-def extract_cv_info(text):
-    # Initialize Groq LLM
-    llm = ChatGroq(
-        api_key=os.getenv("GROQ_API_KEY"),
-        model_name="llama-3.3-70b-versatile"
-    )
-
-    # Create a more comprehensive prompt template
-    template = """
+# (JSON key, response key, description, kind) for every extracted CV field
+CV_FIELDS = [
+    ("full_name", "name", "Full Name", "text"),
+    ("email", "email", "Email Address", "text"),
+    ("phone", "phoneNumber", "Phone Number", "text"),
+    ("location", "location", "Location/Address", "text"),
+    ("current_title", "currentTitle", "Current Title", "text"),
+    ("current_company", "currentCompany", "Current Company", "text"),
+    ("total_years_in_tech", "totalYearsInTech", "Total Years in Tech (estimate if not explicitly stated)", "number"),
+    ("highest_degree", "highestDegree", "Highest Degree", "text"),
+    ("program", "programOfStudy", "Program/Major", "text"),
+    ("school", "university", "School/University", "text"),
+    ("graduation_year", "graduationYear", "Graduation Year", "number"),
+    ("technical_skills", "technicalSkills", "Technical Skills (comma-separated)", "list"),
+    ("programming_languages", "programmingLanguages", "Programming Languages (comma-separated)", "list"),
+    ("tools_and_technologies", "toolsAndTechnologies", "Tools & Technologies (comma-separated)", "list"),
+    ("soft_skills", "softSkills", "Soft Skills (comma-separated)", "list"),
+    ("industries", "industries", "Industries Experience (comma-separated)", "list"),
+    ("certifications", "certifications", "Certifications", "list"),
+    ("key_projects", "keyProjects", "Key Projects", "list"),
+    ("recent_achievements", "recentAchievements", "Recent Achievements", "list"),
+]
+
+CV_EXTRACTION_PROMPT = """
     You are an expert CV analyzer. Extract the following information from the CV below in a structured format.
     If any field is not found, indicate with "Not specified".
 
@@ -53,96 +76,92 @@ def extract_cv_info(text):
     {cv_text}
 
     EXTRACT THE FOLLOWING INFORMATION:
-    1. Full Name
-    2. Email Address
-    3. Phone Number
-    4. Location/Address
-    5. Current Title
-    6. Current Company
-    7. Total Years in Tech (estimate if not explicitly stated)
-    8. Highest Degree
-    9. Program/Major
-    10. School/University
-    11. Graduation Year
-    12. Technical Skills (comma-separated)
-    13. Programming Languages (comma-separated)
-    14. Tools & Technologies (comma-separated)
-    15. Soft Skills (comma-separated)
-    16. Industries Experience (comma-separated)
-    17. Certifications
-    18. Key Projects
-    19. Recent Achievements
+{field_list}
 
     IMPORTANT: Your response must be a valid, parseable JSON object with the following format:
-    {{
-        "full_name": "String value",
-        "email": "String value",
-        "phone": "String value",
-        "location": "String value",
-        "current_title": "String value",
-        "current_company": "String value",
-        "total_years_in_tech": number or "Not specified",
-        "highest_degree": "String value",
-        "program": "String value",
-        "school": "String value",
-        "graduation_year": number or "Not specified",
-        "technical_skills": "String value",
-        "programming_languages": "String value",
-        "tools_and_technologies": "String value",
-        "soft_skills": "String value",
-        "industries": "String value",
-        "certifications": "String value",
-        "key_projects": "String value",
-        "recent_achievements": "String value"
-    }}
+    {{{{
+{json_format}
+    }}}}
     DO NOT include ANY explanatory text before or after the JSON object.
     Your entire response must be ONLY valid, parseable JSON, nothing else.
     """
 
-    prompt = PromptTemplate(
-        input_variables=["cv_text"],
-        template=template
+# Bump when the extraction logic changes (local rules, merging, field mapping) so cached results are recomputed
+CV_EXTRACTION_VERSION = 2
+
+# Sampling temperature the extraction prompt was tuned with (ChatGroq's default)
+CV_EXTRACTION_TEMPERATURE = 0.7
+
+
+@lru_cache(maxsize=64)
+def build_extraction_template(fields):
+    """Prompt template asking only for ``fields`` (JSON keys), built once per field set"""
+    requested = [field for field in CV_FIELDS if field[0] in fields]
+    field_list = "\n".join(f"    {i}. {description}" for i, (_, _, description, _) in enumerate(requested, 1))
+    json_format = ",\n".join(
+        f'        "{key}": ' + ('number or "Not specified"' if kind == "number" else '"String value"')
+        for key, _, _, kind in requested
     )
+    return CV_EXTRACTION_PROMPT.format(cv_text="{cv_text}", field_list=field_list, json_format=json_format)
+
+
+def parse_cv_json(result):
+    # Try to extract JSON from the result if there's extra text
+    json_match = re.search(r'({.*})', result, re.DOTALL)
+    if json_match:
+        return json.loads(json_match.group(1))
+    # If no JSON pattern found, try to parse the whole result
+    return json.loads(result)
+
+
+def is_cv_json(result):
+    """Only parseable responses are worth caching"""
+    try:
+        parse_cv_json(result)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def format_cv_info(cv_data):
+    """Map extracted JSON fields to the response format expected by the rest of the application"""
+    cv_info = {}
+    for key, response_key, _, kind in CV_FIELDS:
+        value = cv_data.get(key, 'Not specified')
+        if kind == "list":
+            value = value if isinstance(value, list) else str(value).split(",")
+        cv_info[response_key] = value
+    return cv_info
 
-    chain = LLMChain(llm=llm, prompt=prompt)
+
+def extract_cv_info(text):
+    # Email and phone are found locally, so the LLM only gets asked for the rest;
+    # the other regex hints never override the LLM
+    local_fields = extract_local_fields(text) if CV_LOCAL_EXTRACTION else {}
+    hint_fields = extract_hint_fields(text) if CV_LOCAL_EXTRACTION else {}
+    remaining = tuple(field[0] for field in CV_FIELDS if field[0] not in local_fields)
+
+    # Prompt template is built and parsed once per field set; the LLM client and its connections are shared
+    prompt = render_prompt(build_extraction_template(remaining), cv_text=text)
 
     max_retries = 2  # Maximum number of retries
     for attempt in range(max_retries):
         try:
             # Get response from Groq
-            result = chain.run(cv_text=text)
+            # A re-uploaded CV is answered from the completion cache; its PII stays in memory unless opted in
+            result = complete(CV_MODEL, prompt, temperature=CV_EXTRACTION_TEMPERATURE,
+                              cache_ttl=LLM_CACHE_TTL_CV, call_site="cv_extraction", validate=is_cv_json,
+                              cache_persist=LLM_CACHE_PERSIST_PII)
 
-            # Try to extract JSON from the result if there's extra text
-            json_match = re.search(r'({.*})', result, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                cv_data = json.loads(json_str)
-            else:
-                # If no JSON pattern found, try to parse the whole result
-                cv_data = json.loads(result)
+            cv_data = parse_cv_json(result)
+            if "programming_languages" in hint_fields:
+                cv_data["programming_languages"] = merge_languages(
+                    cv_data.get("programming_languages"), hint_fields["programming_languages"])
 
             # Return extracted information in the format expected by the rest of the application
-            return {
-                'name': cv_data.get('full_name', 'Not specified'),
-                'email': cv_data.get('email', 'Not specified'),
-                'phoneNumber': cv_data.get('phone', 'Not specified'),
-                'location': cv_data.get('location', 'Not specified'),
-                'currentTitle': cv_data.get('current_title', 'Not specified'),
-                'currentCompany': cv_data.get('current_company', 'Not specified'),
-                'totalYearsInTech': cv_data.get('total_years_in_tech', 'Not specified'),
-                'highestDegree': cv_data.get('highest_degree', 'Not specified'),
-                'programOfStudy': cv_data.get('program', 'Not specified'),
-                'university': cv_data.get('school', 'Not specified'),
-                'graduationYear': cv_data.get('graduation_year', 'Not specified'),
-                'technicalSkills': cv_data.get('technical_skills', 'Not specified').split(","),
-                'programmingLanguages': cv_data.get('programming_languages', 'Not specified').split(","),
-                'toolsAndTechnologies': cv_data.get('tools_and_technologies', 'Not specified').split(","),
-                'softSkills': cv_data.get('soft_skills', 'Not specified').split(","),
-                'industries': cv_data.get('industries', 'Not specified').split(","),
-                'certifications': cv_data.get('certifications', 'Not specified').split(","),
-                'keyProjects': cv_data.get('key_projects', 'Not specified').split(","),
-                'recentAchievements': cv_data.get('recent_achievements', 'Not specified').split(",")
-            }
+            cv_info = format_cv_info({**cv_data, **local_fields})
+            cv_info['extractionMode'] = "hybrid" if local_fields else "llm"
+            return cv_info
 
         except json.JSONDecodeError:
             print(
@@ -151,22 +170,43 @@ def extract_cv_info(text):
         except Exception as e:
             print(f"Attempt {attempt + 1} failed: {str(e)}")
             if attempt == max_retries - 1:
+                if local_fields or hint_fields:
+                    # LLM unreachable: return what was found locally rather than nothing
+                    cv_info = format_cv_info({**hint_fields, **local_fields})
+                    cv_info['extractionMode'] = "local"
+                    return cv_info
                 return {"error": "An unexpected error occurred during CV extraction after multiple attempts."}
 
 
-def process_cv(file_path):
-    """Process the CV file and return extracted information"""
-    if not os.path.isfile(file_path):
-        return {"error": "The specified file does not exist."}
+def process_cv_text(text):
+    """Run LLM extraction on already extracted CV text"""
+    try:
+        return extract_cv_info(text)
+    except Exception as e:
+        print(f"Error processing CV: {str(e)}")
+        return {"error": "An unexpected error occurred while processing the CV."}
+
+
+def process_cv_bytes(content, filename, max_pages=None):
+    """Process an uploaded CV held in memory and return extracted information"""
     try:
-        text = extract_text_from_file(file_path)
-        cv_info = extract_cv_info(text)
-        return cv_info
+        text = extract_text_from_bytes(content, filename, max_pages)
+    except PageLimitExceeded:
+        raise
     except ValueError as ve:
         return {"error": str(ve)}
     except Exception as e:
         print(f"Error processing CV: {str(e)}")
         return {"error": "An unexpected error occurred while processing the CV."}
+    return process_cv_text(text)
+
+
+def process_cv(file_path):
+    """Process the CV file and return extracted information"""
+    if not os.path.isfile(file_path):
+        return {"error": "The specified file does not exist."}
+    with open(file_path, 'rb') as file:
+        return process_cv_bytes(file.read(), file_path)
 
 
 def create_cv_text(applicant_data):
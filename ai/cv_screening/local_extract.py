@@ -0,0 +1,165 @@
+import re
+from datetime import date
+
+# Regex/gazetteer extraction of CV fields.
+# Email and phone are precise enough to stand in for the LLM. Degree, graduation
+# year and programming languages are only hints: the fallback when the LLM is
+# unavailable, and (for languages) additions to the LLM's list.
+# Each extractor returns None when it isn't confident.
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# International (+233 24 123 4567), local (024 123 4567) and bracketed forms
+PHONE_PATTERN = re.compile(r"(?<![\w/])(\+?\d{1,3}[\s.-]?)?(\(?\d{2,4}\)?[\s.-]?)\d{3}[\s.-]?\d{3,4}(?![\w/])")
+
+YEAR_PATTERN = re.compile(r"\b(19[6-9]\d|20\d\d)\b")
+
+# Highest first; labels keep the keywords predict_score's education ranking looks for.
+# Only degree phrases count, so "Scrum Master" or "Master data management" don't.
+DEGREE_LEVELS = [
+    ("PhD", re.compile(r"\bph\.?\s?d\b|\bdoctor(?:ate)? (?:of|in)\b|\bd\.phil\b", re.I)),
+    ("Master's Degree", re.compile(
+        r"\bmaster'?s? (?:of|in|degree)\b|\bm\.?sc\b|\bmba\b|\bm\.eng\b|\bm\.?phil\b|\bm\.tech\b|\bm\.a\.(?=\s)", re.I)),
+    ("Bachelor's Degree", re.compile(
+        r"\bbachelor'?s? (?:of|in|degree)\b|\bb\.?sc\b|\bb\.eng\b|\bb\.tech\b|\bb\.com\b|\bbba\b|\bb\.a\.(?=\s)|\bb\.?s\.? (?:in|of)\b",
+        re.I)),
+    ("HND", re.compile(r"\bhnd\b|\bhigher national diploma\b", re.I)),
+    ("Diploma", re.compile(r"\bdiploma (?:in|of)\b", re.I)),
+]
+
+# Section headings, on their own line or inline ("... / Education: BSc ...")
+HEADING_START = r"(?:^|[/|•])[ \t]*"
+HEADING_END = r"[ \t]*(?::|$)"
+EDUCATION_HEADING = re.compile(
+    HEADING_START + r"(?:education(?:al background)?|academic (?:background|qualifications|history)|qualifications)" + HEADING_END,
+    re.I | re.M)
+OTHER_HEADING = re.compile(
+    HEADING_START + r"(?:(?:work |professional |employment |relevant )?experience|employment(?: history)?|work history|"
+    r"career history|(?:technical |core )?skills|projects|certifications?|licen[cs]es|awards|achievements|publications|"
+    r"references|referees|hobbies|interests|languages|profile|summary|objective|volunteering|training|courses)" + HEADING_END,
+    re.I | re.M)
+
+# Names that are also everyday words or first names ("Ruby", "Swift") only count
+# inside a comma/slash separated list; single letters (C, R) are left to the LLM
+LISTED = r"(?:(?<=[,/])\s*{0}|{0}(?=\s*[,/]))"
+
+# Canonical name -> pattern
+PROGRAMMING_LANGUAGES = {
+    "Python": re.compile(r"\bpython\b", re.I),
+    "Java": re.compile(r"\bjava\b(?!\s*script)", re.I),
+    "JavaScript": re.compile(r"\bjava\s?script\b|\bES6\b", re.I),
+    "TypeScript": re.compile(r"\btype\s?script\b", re.I),
+    "C#": re.compile(r"(?<![\w#])C#|\bc\s?sharp\b", re.I),
+    "C++": re.compile(r"(?<![\w+])C\+\+|\bcpp\b", re.I),
+    "Go": re.compile(r"\bgolang\b", re.I),
+    "Rust": re.compile(LISTED.format(r"\bRust\b")),
+    "Ruby": re.compile(r"\bruby on rails\b|" + LISTED.format(r"\bruby\b"), re.I),
+    "PHP": re.compile(r"\bphp\b", re.I),
+    "Kotlin": re.compile(r"\bkotlin\b", re.I),
+    "Swift": re.compile(LISTED.format(r"\bSwift\b")),
+    "Scala": re.compile(r"\bscala\b", re.I),
+    "MATLAB": re.compile(r"\bmatlab\b", re.I),
+    "SQL": re.compile(r"\b(?:my|postgre|ms|pl/|t-)?sql\b", re.I),
+    "Dart": re.compile(LISTED.format(r"\bDart\b")),
+    "Bash": re.compile(r"\bbash\b|\bshell scripting\b", re.I),
+    "HTML": re.compile(r"\bhtml5?\b", re.I),
+    "CSS": re.compile(r"\bcss3?\b", re.I),
+    "Perl": re.compile(r"\bperl\b", re.I),
+    "Haskell": re.compile(r"\bhaskell\b", re.I),
+    "Elixir": re.compile(r"\belixir\b", re.I),
+    "Solidity": re.compile(r"\bsolidity\b", re.I),
+    "VBA": re.compile(r"\bvba\b", re.I),
+}
+
+
+def extract_email(text):
+    match = EMAIL_PATTERN.search(text)
+    return match.group(0).rstrip(".") if match else None
+
+
+def extract_phone(text):
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = match.group(0).strip()
+        digits = re.sub(r"\D", "", candidate)
+        # Years and date ranges look like numbers too
+        if 9 <= len(digits) <= 15 and not YEAR_PATTERN.fullmatch(candidate):
+            return candidate
+    return None
+
+
+def education_section(text):
+    """Text of the education section(s), or None when the CV has no education heading"""
+    sections = []
+    for heading in EDUCATION_HEADING.finditer(text):
+        end = OTHER_HEADING.search(text, heading.end())
+        sections.append(text[heading.end():end.start() if end else len(text)])
+    return "\n".join(sections) if sections else None
+
+
+def extract_highest_degree(text):
+    """Highest degree phrase, looked up in the education section when there is one"""
+    section = education_section(text)
+    for label, pattern in DEGREE_LEVELS:
+        if pattern.search(section if section is not None else text):
+            return label
+    return None
+
+
+def extract_graduation_year(text):
+    """Latest plausible year in the education section; employment dates elsewhere are ignored"""
+    section = education_section(text)
+    if section is None:
+        return None
+    latest = date.today().year + 6
+    years = [int(year) for year in YEAR_PATTERN.findall(section) if int(year) <= latest]
+    return max(years) if years else None
+
+
+def extract_programming_languages(text):
+    found = [name for name, pattern in PROGRAMMING_LANGUAGES.items() if pattern.search(text)]
+    return found or None
+
+
+def merge_languages(llm_languages, local_languages):
+    """The LLM's languages plus any gazetteer matches it missed, without duplicates"""
+    if isinstance(llm_languages, list):
+        merged = [str(name).strip() for name in llm_languages]
+    else:
+        merged = [name.strip() for name in str(llm_languages or "").split(",")]
+    merged = [name for name in merged if name and name.lower() != "not specified"]
+    seen = {name.lower() for name in merged}
+    merged += [name for name in local_languages or [] if name.lower() not in seen]
+    return merged or llm_languages
+
+
+# JSON field -> extractor for the fields taken locally instead of from the LLM
+LOCAL_EXTRACTORS = {
+    "email": extract_email,
+    "phone": extract_phone,
+}
+
+# JSON field -> extractor for hints used only alongside, or instead of, the LLM's answer
+HINT_EXTRACTORS = {
+    "highest_degree": extract_highest_degree,
+    "graduation_year": extract_graduation_year,
+    "programming_languages": extract_programming_languages,
+}
+
+
+def run_extractors(text, extractors):
+    fields = {}
+    for field, extractor in extractors.items():
+        value = extractor(text)
+        if value is not None:
+            fields[field] = value
+    return fields
+
+
+def extract_local_fields(text):
+    """High-precision fields found deterministically, keyed like the LLM's JSON response"""
+    return run_extractors(text, LOCAL_EXTRACTORS)
+
+
+def extract_hint_fields(text):
+    """Lower-precision fields, never preferred over the LLM's answer"""
+    return run_extractors(text, HINT_EXTRACTORS)
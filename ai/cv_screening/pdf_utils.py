@@ -0,0 +1,41 @@
+import io
+from pypdf import PdfReader
+
+
+class PageLimitExceeded(ValueError):
+    """Raised when a PDF has more pages than allowed"""
+
+    def __init__(self, page_count, max_pages):
+        super().__init__(f"CV contains {page_count} pages, which exceeds the limit of {max_pages} pages")
+        self.page_count = page_count
+        self.max_pages = max_pages
+
+    def __reduce__(self):
+        # Raised inside worker processes, so it has to survive pickling
+        return PageLimitExceeded, (self.page_count, self.max_pages)
+
+
+def open_pdf(source):
+    """PdfReader over a path or the raw bytes of an upload"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return PdfReader(source)
+
+
+def count_pdf_pages(source):
+    """Number of pages in a PDF, read from its page tree without extracting any text"""
+    return len(open_pdf(source).pages)
+
+
+def extract_pdf_pages(source, max_pages=None):
+    """
+    Text of every page, parsing the PDF once.
+
+    The page count comes from the document's page tree before any text is
+    extracted, so PDFs over ``max_pages`` are rejected without further work.
+    """
+    reader = open_pdf(source)
+    page_count = len(reader.pages)
+    if max_pages is not None and page_count > max_pages:
+        raise PageLimitExceeded(page_count, max_pages)
+    return [page.extract_text().strip() for page in reader.pages]
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from config.settings import (
+    CV_RESULT_CACHE_BACKEND,
+    CV_RESULT_CACHE_PATH,
+    CV_RESULT_CACHE_MAX_ENTRIES,
+    CV_RESULT_CACHE_TTL,
+    CV_LOCAL_EXTRACTION
+)
+from cv_screening.cv_processor import CV_EXTRACTION_PROMPT, CV_EXTRACTION_VERSION
+from utils.completion_cache import CompletionCache, MemoryBackend, SqliteBackend
+from utils.llm_gateway import CV_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Results depend on the extraction model, prompt and local rules, so changing any of them starts a fresh keyspace
+CACHE_NAMESPACE = hashlib.sha256(
+    f"{CV_MODEL}\n{CV_EXTRACTION_PROMPT}\n{CV_EXTRACTION_VERSION}\nlocal={CV_LOCAL_EXTRACTION}".encode("utf-8")
+).hexdigest()[:16]
+
+NON_WORD = re.compile(r"\W+")
+
+
+def file_key(content: bytes) -> str:
+    """Key for the exact uploaded file"""
+    return "file:" + hashlib.sha256(CACHE_NAMESPACE.encode() + content).hexdigest()
+
+
+def text_key(text: str) -> str:
+    """
+    Key for the CV's text, ignoring case, punctuation and layout, so the same
+    CV re-exported (new PDF metadata, DOCX instead of PDF) still matches.
+    """
+    normalized = NON_WORD.sub(" ", text.lower()).strip()
+    return "text:" + hashlib.sha256(f"{CACHE_NAMESPACE}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def create_cv_result_cache(backend=CV_RESULT_CACHE_BACKEND):
+    persistent = None
+    if backend == "sqlite" and not CV_RESULT_CACHE_PATH:
+        logger.warning("CV_RESULT_CACHE_BACKEND=sqlite needs CV_RESULT_CACHE_PATH, using memory only")
+    elif backend == "sqlite":
+        try:
+            persistent = SqliteBackend(CV_RESULT_CACHE_PATH, table="cv_results")
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"CV result cache file unavailable, using memory only: {str(e)}")
+    elif backend != "memory":
+        logger.warning(f"Unknown CV_RESULT_CACHE_BACKEND '{backend}', using memory only")
+    return CompletionCache(MemoryBackend(CV_RESULT_CACHE_MAX_ENTRIES), persistent)
+
+
+_cv_result_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cv_result_cache():
+    """Process-wide cache of extracted CV information, created on first use"""
+    global _cv_result_cache
+    with _cache_lock:
+        if _cv_result_cache is None:
+            _cv_result_cache = create_cv_result_cache()
+        return _cv_result_cache
+
+
+def lookup_cv_info(key):
+    """Cached extraction result for a file or text key, or None"""
+    if CV_RESULT_CACHE_TTL <= 0:
+        return None
+    cached = get_cv_result_cache().get(key, call_site=key.split(":", 1)[0])
+    return None if cached is None else json.loads(cached)
+
+
+def store_cv_info(keys, cv_info):
+    """
+    Remember an extraction result under every key it was computed for.
+
+    Errors and local-only results (the LLM was unavailable) aren't stored,
+    so the next upload gets a full extraction.
+    """
+    if CV_RESULT_CACHE_TTL <= 0 or "error" in cv_info or cv_info.get("extractionMode") == "local":
+        return
+    cache = get_cv_result_cache()
+    text = json.dumps(cv_info, default=str)
+    for key in keys:
+        cache.set(key, text, CV_RESULT_CACHE_TTL, call_site=key.split(":", 1)[0])
+
+
+def mark_cached(cv_info, match):
+    """Response indicator: ``cached`` plus which key matched (file or text)"""
+    cv_info["cached"] = match is not None
+    if match is not None:
+        cv_info["cacheMatch"] = match
+    return cv_info
+
+
+def get_cv_result_cache_stats():
+    return get_cv_result_cache().stats()
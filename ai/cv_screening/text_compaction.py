@@ -0,0 +1,176 @@
+import re
+import threading
+from config.settings import CV_TEXT_TOKEN_BUDGET
+
+# Normalisation of extracted CV text before it goes into the extraction prompt:
+# whitespace is collapsed, page furniture (repeated headers/footers, page numbers)
+# is dropped and the result is cut to a token budget, least useful sections first.
+
+# Same rough ratio the batch token bucket uses for Groq's tokenizer
+CHARS_PER_TOKEN = 4
+
+# Lines per page edge that are checked for repeated headers/footers
+EDGE_LINES = 3
+
+INLINE_WHITESPACE = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u205f\u3000\ufeff]+")
+PAGE_NUMBER = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.I)
+DIGITS = re.compile(r"\d+")
+
+# Section heading -> priority; lower priorities are cut first when over budget.
+# Text before the first heading (name, contact details) ranks above all of them.
+SECTION_PRIORITIES = [
+    (re.compile(r"references?|referees?|hobbies|interests|declaration|personal interests", re.I), 0),
+    (re.compile(r"personal (details|information|data)|languages? spoken|languages|volunteer(ing)?( experience)?|extra-?curricular( activities)?", re.I), 1),
+    (re.compile(r"awards?|honou?rs|achievements|publications|activities|leadership", re.I), 2),
+    (re.compile(r"(professional )?summary|profile|objective|about me|certifications?|licen[cs]es|training|courses|projects|key projects", re.I), 3),
+    # Experience is the long one, so its oldest entries go before the short, dense education and skills blocks
+    (re.compile(r"((work|professional|employment|relevant) )?(experience|history)|employment|career history", re.I), 4),
+    (re.compile(r"education(al background)?|academic (background|qualifications)|qualifications|(technical |core )?skills|competencies|technologies|tools", re.I), 5),
+]
+PREAMBLE_PRIORITY = 6
+MAX_HEADING_LENGTH = 40
+
+_stats_lock = threading.Lock()
+_totals = {"cvs": 0, "original_tokens": 0, "compacted_tokens": 0, "truncated": 0}
+
+
+def count_tokens(text):
+    """Approximate token count, good enough for budgeting"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def normalize_lines(text):
+    """Lines with whitespace runs and invisible characters collapsed, blank lines dropped"""
+    lines = (INLINE_WHITESPACE.sub(" ", line).strip() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
+def edge_key(line):
+    # Page numbers and dates inside a header differ per page
+    return DIGITS.sub("#", line.lower())
+
+
+def strip_page_furniture(pages):
+    """
+    Drop page numbers and lines repeated at the top or bottom of most pages.
+
+    The first page keeps its copy of a repeated header, since that is usually
+    the candidate's name and contact details.
+    """
+    pages = [[line for line in page if not PAGE_NUMBER.match(line)] for page in pages]
+    if len(pages) < 2:
+        return pages
+
+    seen_on = {}
+    for page in pages:
+        for key in {edge_key(line) for line in page[:EDGE_LINES] + page[-EDGE_LINES:]}:
+            seen_on[key] = seen_on.get(key, 0) + 1
+    threshold = max(2, (len(pages) + 1) // 2)
+    repeated = {key for key, count in seen_on.items() if count >= threshold}
+    if not repeated:
+        return pages
+
+    stripped = [pages[0]]
+    for page in pages[1:]:
+        edge = set(range(min(EDGE_LINES, len(page)))) | set(range(max(0, len(page) - EDGE_LINES), len(page)))
+        stripped.append([line for i, line in enumerate(page) if i not in edge or edge_key(line) not in repeated])
+    return stripped
+
+
+def merge_pages(pages):
+    """Join pages into lines, dropping lines duplicated across a page break or extraction layer"""
+    lines = []
+    for page in pages:
+        for line in page:
+            if not lines or line != lines[-1]:
+                lines.append(line)
+    return lines
+
+
+def section_priority(line):
+    """Priority of the section a heading line starts, or None if the line isn't a heading"""
+    if len(line) > MAX_HEADING_LENGTH:
+        return None
+    heading = line.strip(" :-|•*#").strip()
+    for pattern, priority in SECTION_PRIORITIES:
+        if pattern.fullmatch(heading):
+            return priority
+    return None
+
+
+def split_sections(lines):
+    """[priority, lines] blocks, starting a new block at every recognised heading"""
+    sections = [[PREAMBLE_PRIORITY, []]]
+    for line in lines:
+        priority = section_priority(line)
+        if priority is not None:
+            sections.append([priority, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def fit_to_budget(lines, budget):
+    """
+    Cut lines until the text fits ``budget`` tokens.
+
+    Lowest-priority sections go first, later sections before earlier ones
+    (older jobs are usually listed last), each trimmed from its end; a
+    section emptied down to its heading is dropped entirely.
+    """
+    sections = split_sections(lines)
+    # Excess in characters; every line also costs its newline
+    excess = len("\n".join(lines)) - budget * CHARS_PER_TOKEN
+    order = sorted(range(len(sections)), key=lambda i: (sections[i][0], -i))
+    for i in order:
+        if excess <= 0:
+            break
+        section_lines = sections[i][1]
+        while section_lines and excess > 0:
+            excess -= len(section_lines.pop()) + 1
+        if len(section_lines) == 1 and section_priority(section_lines[0]) is not None:
+            excess -= len(section_lines.pop()) + 1
+    kept = [line for _, section_lines in sections for line in section_lines]
+    text = "\n".join(kept)
+    # A single oversized block (no headings found) is cut by characters
+    return text[:budget * CHARS_PER_TOKEN]
+
+
+def compact_cv_text(pages, budget=CV_TEXT_TOKEN_BUDGET):
+    """
+    Normalise the text of a CV's pages into prompt-ready text.
+
+    Returns ``(text, stats)`` where stats reports the token counts before and
+    after compaction and whether the budget forced truncation.
+    """
+    original_tokens = count_tokens(" ".join(pages))
+    lines = merge_pages(strip_page_furniture([normalize_lines(page) for page in pages]))
+    text = "\n".join(lines)
+    truncated = budget is not None and budget > 0 and count_tokens(text) > budget
+    if truncated:
+        text = fit_to_budget(lines, budget)
+    compacted_tokens = count_tokens(text)
+    stats = {
+        "originalTokens": original_tokens,
+        "compactedTokens": compacted_tokens,
+        "tokensSaved": max(0, original_tokens - compacted_tokens),
+        "truncated": truncated
+    }
+    return text, stats
+
+
+def record_compaction(stats):
+    """Add one CV's compaction stats to the process totals reported on /metrics"""
+    with _stats_lock:
+        _totals["cvs"] += 1
+        _totals["original_tokens"] += stats["originalTokens"]
+        _totals["compacted_tokens"] += stats["compactedTokens"]
+        _totals["truncated"] += stats["truncated"]
+
+
+def get_compaction_stats():
+    with _stats_lock:
+        totals = dict(_totals)
+    totals["tokens_saved"] = totals["original_tokens"] - totals["compacted_tokens"]
+    totals["saved_ratio"] = round(totals["tokens_saved"] / totals["original_tokens"], 4) if totals["original_tokens"] else 0.0
+    return totals
@@ -1,25 +1,13 @@
-import psycopg2
-import psycopg2.extras
-from groq import Groq
-import os
+import logging
 from dotenv import load_dotenv
+# LLM calls share one pooled Groq client (see utils.llm_gateway)
+from utils.llm_gateway import SQL_MODEL, complete
+from config.settings import LLM_CACHE_TTL_SQL
+from kairo.semantic_cache import SemanticSQLCache
 
 # Load environment variables from .env file
 load_dotenv()
-
-# Database configuration using environment variables
-DB_CONFIG = {
-    "host": os.getenv("DB_HOST"),
-    "port": int(os.getenv("DB_PORT")),
-    "user": os.getenv("DB_USER"),
-    "password": os.getenv("DB_PASSWORD"),
-    "database": os.getenv("DB_NAME")
-}
-
-# Initialize Groq client with API key from environment variable
-groq_client = Groq(
-    api_key=os.getenv("GROQ_API_KEY")
-)
+logger = logging.getLogger(__name__)
 
 # System prompt for recruitment analysis
 system_prompt = """
@@ -69,22 +57,11 @@ RECRUITMENTS_SCHEMA = [
     "keyProjects", "recentAchievements", "id"
 ]
 
+# Paraphrased questions reuse SQL that already ran successfully
+sql_cache = SemanticSQLCache(RECRUITMENTS_SCHEMA)
 
-def get_db_connection():
-    """Get a connection to the PostgreSQL database"""
-    conn = psycopg2.connect(
-        host=DB_CONFIG["host"],
-        port=DB_CONFIG["port"],
-        user=DB_CONFIG["user"],
-        password=DB_CONFIG["password"],
-        database=DB_CONFIG["database"]
-    )
-    return conn
-
-
-def get_db_cursor(conn):
-    """Get a cursor that returns results as dictionaries"""
-    return conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+# System prompt for natural language to SQL conversion
+SQL_SYSTEM_PROMPT = "You are an expert in PostgreSQL who creates precise, syntactically correct SQL queries. You always use double quotes for column names and fully qualify them with table names."
 
 
 def natural_language_to_sql(query: str) -> str:
@@ -136,22 +113,9 @@ SQL Query:
 """
 
     # Generate SQL query
-    response = groq_client.chat.completions.create(
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an expert in PostgreSQL who creates precise, syntactically correct SQL queries. You always use double quotes for column names and fully qualify them with table names."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        model="gemma2-9b-it"
-    )
-
-    # Get the SQL query from the response
-    sql_query = response.choices[0].message.content.strip()
+    # Repeated questions are answered from the completion cache
+    sql_query = complete(SQL_MODEL, prompt, system_prompt=SQL_SYSTEM_PROMPT,
+                         cache_ttl=LLM_CACHE_TTL_SQL, call_site="nl_to_sql").strip()
 
     # Additional validation: ensure column names are properly quoted
     for column in RECRUITMENTS_SCHEMA:
@@ -170,3 +134,19 @@ SQL Query:
                 f' {column})', f' "recruitments"."{column}")')
 
     return sql_query
+
+
+def resolve_sql(query: str):
+    """
+    SQL for a natural language query, from the semantic cache when a similar
+    question was answered before, otherwise from the LLM.
+
+    Returns:
+        (SQL query string, whether it came from the cache)
+    """
+    cached = sql_cache.lookup(query)
+    if cached is not None:
+        sql_query, similarity = cached
+        logger.info(f"Semantic SQL cache hit (similarity {similarity:.3f})")
+        return sql_query, True
+    return natural_language_to_sql(query), False
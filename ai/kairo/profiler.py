@@ -0,0 +1,208 @@
+import numpy as np
+from datetime import datetime, date, time
+from decimal import Decimal
+
+# Distinct values kept by the distinct-count sketch; counts below this are exact
+DISTINCT_SKETCH_SIZE = 1024
+# Numeric values kept (uniformly sampled) for quantile estimates
+QUANTILE_SAMPLE_SIZE = 2048
+# Distinct sample values reported per column
+SAMPLE_VALUES = 10
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def value_type(value) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float, Decimal)):
+        return "number"
+    if isinstance(value, (datetime, date, time)):
+        return "date"
+    return "string"
+
+
+def value_hash(value) -> int:
+    try:
+        return hash(value)
+    except TypeError:
+        # Arrays and JSON columns
+        return hash(repr(value))
+
+
+def mix_hashes(hashes: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, so Python's hashes (small ints hash to themselves) look uniform"""
+    with np.errstate(over="ignore"):
+        z = hashes.astype(np.uint64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9) & _MASK64
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB) & _MASK64
+        return z ^ (z >> np.uint64(31))
+
+
+class ColumnProfile:
+    """
+    Statistics for one result column, folded in batch by batch.
+
+    Every batch is handled with a few array operations: counts, min/max and
+    sums directly, distinct values with a k-minimum-values sketch (exact up to
+    DISTINCT_SKETCH_SIZE distinct values), numeric quantiles from a bottom-k
+    random sample and sample values from the smallest value hashes, which
+    gives a uniform sample of distinct values.
+    """
+
+    def __init__(self, name, rng):
+        self.name = name
+        self.type = None
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self._numeric_count = 0
+        self._numeric_sum = 0.0
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._samples = {}  # hash -> value for the smallest SAMPLE_VALUES hashes
+        self._rng = rng
+        self._quantile_keys = np.empty(0)
+        self._quantile_values = np.empty(0)
+
+    def update(self, values):
+        self.count += len(values)
+        present = [value for value in values if value is not None]
+        self.nulls += len(values) - len(present)
+        if not present:
+            return
+        if self.type is None:
+            self.type = value_type(present[0])
+
+        if self.type == "number":
+            numbers = np.fromiter(
+                (float(value) for value in present if isinstance(value, (int, float, Decimal))),
+                dtype=float)
+            if numbers.size:
+                self._update_numbers(numbers)
+        elif self.type == "date":
+            comparable = [value for value in present if type(value) is type(present[0])]
+            low, high = min(comparable), max(comparable)
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+
+        self._update_distinct(present)
+
+    def _update_numbers(self, numbers):
+        low, high = float(numbers.min()), float(numbers.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self._numeric_count += numbers.size
+        self._numeric_sum += float(numbers.sum())
+
+        keys = np.concatenate([self._quantile_keys, self._rng.random(numbers.size)])
+        values = np.concatenate([self._quantile_values, numbers])
+        if keys.size > QUANTILE_SAMPLE_SIZE:
+            keep = np.argpartition(keys, QUANTILE_SAMPLE_SIZE)[:QUANTILE_SAMPLE_SIZE]
+            keys, values = keys[keep], values[keep]
+        self._quantile_keys, self._quantile_values = keys, values
+
+    def _update_distinct(self, present):
+        raw = np.fromiter((value_hash(value) for value in present), dtype=np.int64, count=len(present))
+        hashes = mix_hashes(raw.view(np.uint64))
+        self._hashes = np.unique(np.concatenate([self._hashes, hashes]))[:DISTINCT_SKETCH_SIZE]
+
+        # The batch can only contribute samples whose hashes beat the current cut-off
+        smallest = self._hashes[:SAMPLE_VALUES]
+        candidates = np.flatnonzero(np.isin(hashes, smallest))
+        for i in candidates.tolist():
+            self._samples.setdefault(int(hashes[i]), present[i])
+        if len(self._samples) > SAMPLE_VALUES:
+            keep = set(smallest.tolist())
+            self._samples = {key: value for key, value in self._samples.items() if key in keep}
+
+    def distinct(self):
+        """(distinct count, whether it is an estimate)"""
+        if self._hashes.size < DISTINCT_SKETCH_SIZE:
+            return int(self._hashes.size), False
+        kth = float(self._hashes[-1]) / 2.0 ** 64
+        return int(round((DISTINCT_SKETCH_SIZE - 1) / kth)), True
+
+    def summary(self):
+        distinct, approximate = self.distinct()
+        summary = {
+            "type": self.type or "string",
+            "count": self.count,
+            "nulls": self.nulls,
+            "distinct": distinct,
+            "distinct_approximate": approximate,
+            "samples": [self._samples[key] for key in sorted(self._samples)]
+        }
+        if self.min is not None:
+            summary["min"] = self.min
+            summary["max"] = self.max
+        if self._numeric_count:
+            summary["mean"] = self._numeric_sum / self._numeric_count
+            summary["quantiles"] = {
+                f"p{int(q * 100)}": float(value)
+                for q, value in zip(QUANTILES, np.quantile(self._quantile_values, QUANTILES))
+            }
+        return summary
+
+
+class QueryProfiler:
+    """Profiles a result set in one pass, one batch of rows at a time (e.g. while streaming)"""
+
+    def __init__(self, headers, seed=0):
+        rng = np.random.default_rng(seed)
+        self.headers = list(headers)
+        self.rows = 0
+        self.columns = [ColumnProfile(name, rng) for name in self.headers]
+
+    def update(self, rows):
+        if not rows:
+            return
+        self.rows += len(rows)
+        for column, values in zip(self.columns, zip(*rows)):
+            column.update(values)
+
+    def summary(self):
+        return {column.name: column.summary() for column in self.columns}
+
+
+def profile_rows(headers, rows):
+    """Column statistics for a fetched result set"""
+    profiler = QueryProfiler(headers)
+    profiler.update(rows)
+    return profiler.summary()
+
+
+def format_stat(value):
+    if isinstance(value, float):
+        return f"{value:.4g}" if abs(value) < 1e6 else f"{value:,.0f}"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def describe_profile(profile) -> str:
+    """Column summary lines for the report prompt"""
+    lines = []
+    for column, stats in profile.items():
+        lines.append(f"- Column: {column} (Type: {stats['type']})")
+        distinct = f"~{stats['distinct']}" if stats["distinct_approximate"] else str(stats["distinct"])
+        lines.append(f"  - Non-null: {stats['count'] - stats['nulls']}, Nulls: {stats['nulls']}, Distinct: {distinct}")
+        if "min" in stats:
+            line = f"  - Min: {format_stat(stats['min'])}, Max: {format_stat(stats['max'])}"
+            if "mean" in stats:
+                line += f", Average: {format_stat(stats['mean'])}"
+            lines.append(line)
+        if "quantiles" in stats:
+            quantiles = ", ".join(f"{name}: {format_stat(value)}" for name, value in stats["quantiles"].items())
+            lines.append(f"  - Quantiles: {quantiles}")
+        if stats.get("top_values"):
+            top = ", ".join(f"{value} ({count})" for value, count in stats["top_values"])
+            lines.append(f"  - Most frequent: {top}")
+        elif stats["samples"]:
+            samples_str = ", ".join(format_stat(sample) for sample in stats["samples"][:5])
+            if len(stats["samples"]) > 5:
+                samples_str += "..."
+            lines.append(f"  - Sample values: {samples_str}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,111 @@
+import logging
+from psycopg2 import sql
+from config.settings import QUERY_PUSHDOWN_SAMPLE_ROWS, QUERY_PUSHDOWN_TOP_K
+from kairo.sql_guard import guard_query
+from utils.db import get_db_cursor
+
+logger = logging.getLogger(__name__)
+
+# Postgres type OIDs, grouped the way the profiler reports column types
+NUMERIC_TYPES = {20, 21, 23, 26, 700, 701, 790, 1700}
+DATE_TYPES = {1082, 1083, 1114, 1184, 1266}
+BOOLEAN_TYPES = {16}
+
+
+def column_type(type_code) -> str:
+    if type_code in NUMERIC_TYPES:
+        return "number"
+    if type_code in DATE_TYPES:
+        return "date"
+    if type_code in BOOLEAN_TYPES:
+        return "boolean"
+    return "string"
+
+
+def column_stats_sql(columns):
+    """One aggregate per column over the wrapped query ``q``"""
+    selects = [sql.SQL("count(*)")]
+    for name, kind in columns:
+        column = sql.SQL("q.{}").format(sql.Identifier(name))
+        selects.append(sql.SQL("count({})").format(column))
+        selects.append(sql.SQL("count(DISTINCT {}::text)").format(column))
+        if kind in ("number", "date"):
+            selects.append(sql.SQL("min({})").format(column))
+            selects.append(sql.SQL("max({})").format(column))
+        if kind == "number":
+            selects.append(sql.SQL("avg({})::float").format(column))
+            selects.append(sql.SQL("percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY {}::float8)").format(column))
+    return sql.SQL(", ").join(selects)
+
+
+def top_values_sql(columns, top_k):
+    """Most frequent values of every column, in one UNION ALL"""
+    parts = [
+        sql.SQL("(SELECT {index} AS col, q.{name}::text AS value, count(*) AS n FROM q "
+                "WHERE q.{name} IS NOT NULL GROUP BY 2 ORDER BY 3 DESC LIMIT {top_k})").format(
+            index=sql.Literal(index), name=sql.Identifier(name), top_k=sql.Literal(top_k))
+        for index, (name, _) in enumerate(columns)
+    ]
+    return sql.SQL(" UNION ALL ").join(parts)
+
+
+def pushdown_profile(conn, sql_query, sample_rows=QUERY_PUSHDOWN_SAMPLE_ROWS, top_k=QUERY_PUSHDOWN_TOP_K):
+    """
+    Profile a generated query inside Postgres.
+
+    The query is wrapped as a CTE; one aggregate statement computes per-column
+    counts, distinct counts, min/max, mean and quartiles, a second one the
+    top-k values, and only a bounded sample of rows is fetched. The whole
+    (unlimited) query goes through the SQL guard first.
+
+    Returns:
+        (column names, sample rows, total row count, profile in the shape of
+        kairo.profiler.profile_rows)
+    """
+    decision = guard_query(conn, sql_query, limit=False)
+    body = sql.SQL(decision.sql)
+    cursor = get_db_cursor(conn)
+    try:
+        # No query parameters, so '%' in the generated SQL is left alone
+        cursor.execute(sql.SQL("SELECT * FROM ({}) AS q LIMIT {}").format(body, sql.Literal(sample_rows)))
+        sample = cursor.fetchall()
+        columns = [(column.name, column_type(column.type_code)) for column in cursor.description]
+        headers = [name for name, _ in columns]
+        if len(set(headers)) != len(headers):
+            raise ValueError("Result has duplicate column names")
+
+        cursor.execute(sql.SQL("WITH q AS ({}) SELECT {} FROM q").format(body, column_stats_sql(columns)))
+        stats = list(cursor.fetchone())
+
+        top_values = {index: [] for index in range(len(columns))}
+        if columns and top_k > 0:
+            cursor.execute(sql.SQL("WITH q AS ({}) {}").format(body, top_values_sql(columns, top_k)))
+            for index, value, count in cursor.fetchall():
+                top_values[index].append((value, count))
+    finally:
+        cursor.close()
+
+    row_count = stats.pop(0)
+    profile = {}
+    for index, (name, kind) in enumerate(columns):
+        non_null, distinct = stats.pop(0), stats.pop(0)
+        summary = {
+            "type": kind,
+            "count": row_count,
+            "nulls": row_count - non_null,
+            "distinct": distinct,
+            "distinct_approximate": False,
+            "samples": [value for value, _ in top_values[index]],
+            "top_values": top_values[index]
+        }
+        if kind in ("number", "date"):
+            summary["min"], summary["max"] = stats.pop(0), stats.pop(0)
+            if summary["min"] is None:
+                del summary["min"], summary["max"]
+        if kind == "number":
+            mean, quartiles = stats.pop(0), stats.pop(0)
+            if mean is not None:
+                summary["mean"] = mean
+                summary["quantiles"] = dict(zip(("p25", "p50", "p75"), quartiles))
+        profile[name] = summary
+    return headers, sample, row_count, profile
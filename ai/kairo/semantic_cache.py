@@ -0,0 +1,204 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+import numpy as np
+from config.settings import SQL_SEMANTIC_THRESHOLD, SQL_SEMANTIC_CACHE_SIZE, SQL_SEMANTIC_CACHE_TTL
+from smart_match.predict import EMBEDDER_MODEL, embedding_batcher
+from utils.embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+# Words that change a query's meaning while barely moving its embedding ("hired last
+# month" vs "hired last year", "how many" vs "top"), mapped to what they mean so
+# synonyms agree; cached SQL is only reused when these, numbers and quoted values match.
+# Everything else is wording, left to the embedding similarity.
+DISCRIMINATING_TERMS = {
+    "today": "today", "yesterday": "yesterday", "tomorrow": "tomorrow",
+    "day": "day", "daily": "day", "week": "week", "weekly": "week", "month": "month", "monthly": "month",
+    "quarter": "quarter", "quarterly": "quarter", "year": "year", "yearly": "year", "annual": "year",
+    "last": "previous", "previous": "previous", "past": "previous", "this": "current", "current": "current",
+    "next": "next", "before": "before", "after": "after", "since": "after",
+    "top": "max", "highest": "max", "most": "max", "max": "max", "maximum": "max", "largest": "max",
+    "bottom": "min", "lowest": "min", "least": "min", "min": "min", "minimum": "min", "smallest": "min",
+    "many": "count", "count": "count", "number": "count",
+    "average": "avg", "avg": "avg", "mean": "avg", "sum": "sum",
+    "not": "not", "without": "not", "never": "not", "no": "not",
+}
+
+NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6", "seven": "7",
+    "eight": "8", "nine": "9", "ten": "10", "eleven": "11", "twelve": "12", "twenty": "20", "fifty": "50", "hundred": "100"
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z]+|\d+")
+QUOTED_PATTERN = re.compile(r"'([^']+)'|\"([^\"]+)\"")
+SQL_STRING_PATTERN = re.compile(r"'((?:[^']|'')*)'")
+SUFFIXES = ("ing", "ed", "es", "s", "e")
+
+
+def schema_fingerprint(columns) -> str:
+    return hashlib.sha1(",".join(columns).encode("utf-8")).hexdigest()[:12]
+
+
+def stem(token: str) -> str:
+    # Crude, but enough for "hire", "hired", "hiring" and "hires" to agree
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            return token[:-len(suffix)]
+    return token
+
+
+def query_terms(text: str):
+    return {stem(token) for token in TOKEN_PATTERN.findall(text.lower())}
+
+
+def query_signature(query: str):
+    """
+    Numbers, quoted values and discriminating terms (time windows, aggregates,
+    negation) of a query, which must all match for a semantic hit.
+    """
+    signature = set()
+    for token in TOKEN_PATTERN.findall(query.lower()):
+        if token.isdigit():
+            signature.add(str(int(token)))
+        elif token in NUMBER_WORDS:
+            signature.add(NUMBER_WORDS[token])
+        elif token in DISCRIMINATING_TERMS:
+            signature.add(DISCRIMINATING_TERMS[token])
+        elif token.endswith("s") and token[:-1] in DISCRIMINATING_TERMS:
+            signature.add(DISCRIMINATING_TERMS[token[:-1]])
+    signature |= {("quoted", (single or double).strip().lower()) for single, double in QUOTED_PATTERN.findall(query)}
+    return frozenset(signature)
+
+
+def sql_literals_match(sql: str, query: str) -> bool:
+    """
+    True when every word of the SQL's string literals appears in the question,
+    so "from LinkedIn" and "from Indeed" never share SQL however close they embed
+    """
+    terms = query_terms(query)
+    for literal in SQL_STRING_PATTERN.findall(sql):
+        # Dates and numbers are covered by the signature; words must come from the question
+        words = {term for term in query_terms(literal.replace("''", "'")) if not term.isdigit()}
+        if not words <= terms:
+            return False
+    return True
+
+
+class SemanticSQLCache:
+    """
+    Reuses generated SQL for paraphrased questions.
+
+    Questions are embedded with the MiniLM model already used by smart_match.
+    A lookup returns the SQL of the most similar stored question when the
+    cosine similarity reaches ``threshold``, both questions have the same
+    numbers, quoted values and discriminating terms, and every string literal
+    in the cached SQL comes from the new question. Only SQL that executed successfully
+    is stored, and everything is dropped when the table schema changes.
+    """
+
+    def __init__(self, schema, threshold=SQL_SEMANTIC_THRESHOLD, max_size=SQL_SEMANTIC_CACHE_SIZE,
+                 ttl=SQL_SEMANTIC_CACHE_TTL):
+        self.schema = schema
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self.embeddings = EmbeddingCache(f"kairo:{EMBEDDER_MODEL}")
+        self._schema_version = schema_fingerprint(schema)
+        self._matrix = None  # One normalized embedding per row
+        self._entries = []  # (query, signature, sql, stored_at), aligned with _matrix rows
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0, "errors": 0}
+
+    def embed(self, query):
+        embedding = self.embeddings.encode([query], embedding_batcher.encode)[0]
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _check_schema(self):
+        # Called with the lock held; the schema list may be edited at runtime
+        version = schema_fingerprint(self.schema)
+        if version != self._schema_version:
+            if self._entries:
+                logger.info(f"Recruitments schema changed ({self._schema_version} -> {version}), clearing SQL cache")
+                self._counters["invalidations"] += 1
+            self._schema_version = version
+            self._matrix = None
+            self._entries = []
+
+    def lookup(self, query):
+        """(sql, similarity) of the closest stored question, or None"""
+        try:
+            embedding = self.embed(query)
+        except Exception as e:
+            # Without the embedder the caller just asks the LLM
+            logger.warning(f"Semantic SQL cache unavailable: {str(e)}")
+            with self._lock:
+                self._counters["errors"] += 1
+            return None
+
+        signature = query_signature(query)
+        with self._lock:
+            self._check_schema()
+            self._expire()
+            if self._matrix is not None:
+                similarities = self._matrix @ embedding
+                for i in np.argsort(-similarities):
+                    if similarities[i] < self.threshold:
+                        break
+                    if self._entries[i][1] == signature and sql_literals_match(self._entries[i][2], query):
+                        self._counters["hits"] += 1
+                        return self._entries[i][2], float(similarities[i])
+            self._counters["misses"] += 1
+        return None
+
+    def store(self, query, sql):
+        """Remember SQL that ran successfully for ``query``"""
+        try:
+            embedding = self.embed(query)
+        except Exception:
+            return
+        with self._lock:
+            self._check_schema()
+            entry = (query, query_signature(query), sql, time.monotonic())
+            if self._matrix is None:
+                self._matrix = embedding[np.newaxis, :]
+            else:
+                self._matrix = np.vstack([self._matrix, embedding])
+            self._entries.append(entry)
+            if len(self._entries) > self.max_size:
+                # Oldest entries go first
+                overflow = len(self._entries) - self.max_size
+                self._matrix = self._matrix[overflow:]
+                self._entries = self._entries[overflow:]
+            self._counters["stores"] += 1
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        expired = 0
+        while expired < len(self._entries) and self._entries[expired][3] < cutoff:
+            expired += 1
+        if expired:
+            self._entries = self._entries[expired:]
+            self._matrix = self._matrix[expired:] if self._entries else None
+
+    def clear(self):
+        with self._lock:
+            self._matrix = None
+            self._entries = []
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "size": size,
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "schema_version": self._schema_version,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else None
+        }
@@ -0,0 +1,255 @@
+import json
+import logging
+import re
+import time
+from config.settings import (
+    QUERY_ROW_CAP,
+    QUERY_STATEMENT_TIMEOUT_MS,
+    QUERY_MAX_COST,
+    QUERY_DOWNGRADE_COST,
+    QUERY_MAX_PLAN_ROWS,
+    QUERY_DOWNGRADE_ROW_CAP,
+    QUERY_DOWNGRADE_TIMEOUT_MS
+)
+
+logger = logging.getLogger(__name__)
+
+# Statements that write, lock or change session state. Rejected where a statement
+# can start (e.g. a data-modifying CTE body); elsewhere they are ordinary column
+# names or aliases ("comment", "load", "set"), and the READ ONLY transaction
+# stops writes regardless.
+FORBIDDEN_STATEMENTS = {
+    "insert", "update", "delete", "merge", "upsert", "drop", "alter", "create", "truncate",
+    "grant", "revoke", "copy", "call", "do", "vacuum", "analyze", "lock", "set", "reset",
+    "refresh", "reindex", "cluster", "comment", "notify", "listen", "unlisten", "prepare",
+    "execute", "deallocate", "discard", "begin", "commit", "rollback", "savepoint",
+    "import", "load"
+}
+
+# Words following FOR in a row-locking clause (FOR UPDATE, FOR NO KEY UPDATE, FOR SHARE, FOR KEY SHARE)
+LOCKING_CLAUSE_WORDS = {"update", "share", "no", "key"}
+
+# Functions that touch the server, sleep or bypass the read-only transaction
+FORBIDDEN_FUNCTIONS = {
+    "pg_sleep", "pg_sleep_for", "pg_sleep_until", "pg_read_file", "pg_read_binary_file",
+    "pg_ls_dir", "pg_stat_file", "lo_import", "lo_export", "lo_get", "dblink", "dblink_exec",
+    "pg_terminate_backend", "pg_cancel_backend", "set_config", "pg_reload_conf",
+    "pg_advisory_lock", "pg_advisory_xact_lock", "pg_try_advisory_lock", "txid_current",
+    "query_to_xml", "pg_notify"
+}
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<line_comment>--[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<string>[eE]'(?:[^'\\]|\\.|'')*'|'(?:[^']|'')*')
+  | (?P<quoted>"(?:[^"]|"")*")
+  | (?P<dollar>\$(?P<tag>[A-Za-z_][A-Za-z0-9_]*)?\$)
+  | (?P<param>\$\d+)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)
+  | (?P<symbol>::|<=|>=|<>|!=|\|\||[(),;.\[\]+\-*/%<>=~!@#^&|`?:])
+""", re.VERBOSE)
+
+
+class SQLGuardError(ValueError):
+    """Generated SQL rejected before execution"""
+
+
+def tokenize(sql_query):
+    """
+    (kind, lowercased text, parenthesis depth) for every significant token,
+    with strings, quoted identifiers and comments skipped, so keywords inside
+    them can't trip (or slip past) the checks.
+    """
+    tokens = []
+    depth = 0
+    pos = 0
+    while pos < len(sql_query):
+        match = TOKEN_PATTERN.match(sql_query, pos)
+        if match is None:
+            raise SQLGuardError(f"Unexpected character {sql_query[pos]!r} in generated SQL")
+        kind = match.lastgroup if match.lastgroup != "tag" else "dollar"
+        pos = match.end()
+        if kind == "block_comment":
+            # Postgres block comments nest
+            level = 1
+            while level and pos < len(sql_query):
+                if sql_query.startswith("/*", pos):
+                    level, pos = level + 1, pos + 2
+                elif sql_query.startswith("*/", pos):
+                    level, pos = level - 1, pos + 2
+                else:
+                    pos += 1
+            if level:
+                raise SQLGuardError("Unterminated comment in generated SQL")
+            continue
+        if kind == "dollar":
+            end = sql_query.find(match.group(0), pos)
+            if end < 0:
+                raise SQLGuardError("Unterminated dollar-quoted string in generated SQL")
+            pos = end + len(match.group(0))
+            kind = "string"
+        if kind in ("space", "line_comment"):
+            continue
+        text = match.group(0)
+        if kind == "symbol" and text == ")":
+            depth -= 1
+            if depth < 0:
+                raise SQLGuardError("Unbalanced parentheses in generated SQL")
+        tokens.append((kind, text.lower(), depth))
+        if kind == "symbol" and text == "(":
+            depth += 1
+    if depth:
+        raise SQLGuardError("Unbalanced parentheses in generated SQL")
+    return tokens
+
+
+def starts_statement(tokens, i):
+    """
+    True when tokens[i] is where a statement begins: the start of the query or
+    the body of a CTE ("name AS [NOT] [MATERIALIZED] (" ...).
+    """
+    if i == 0:
+        return True
+    if tokens[i - 1][1] != "(" or i < 2:
+        return False
+    previous = tokens[i - 2]
+    return previous[0] == "word" and previous[1] in ("as", "materialized")
+
+
+def check_statement(sql_query: str) -> str:
+    """
+    Accept a single read-only SELECT (or WITH ... SELECT) statement.
+
+    Returns:
+        The statement without a trailing semicolon
+    """
+    statement = sql_query.strip()
+    while statement.endswith(";"):
+        statement = statement[:-1].rstrip()
+    tokens = tokenize(statement)
+
+    words = [text for kind, text, _ in tokens if kind == "word"]
+    if not words:
+        raise SQLGuardError("Generated SQL is empty")
+    if words[0] not in ("select", "with"):
+        raise SQLGuardError(f"Only SELECT queries are allowed, got {words[0].upper()}")
+
+    for i, (kind, text, _) in enumerate(tokens):
+        if kind == "symbol" and text == ";":
+            raise SQLGuardError("Only a single SQL statement is allowed")
+        if kind != "word":
+            continue
+        next_token = tokens[i + 1] if i + 1 < len(tokens) else None
+        if text in FORBIDDEN_STATEMENTS and starts_statement(tokens, i):
+            raise SQLGuardError(f"{text.upper()} is not allowed in generated SQL")
+        # INTO is reserved, so it can only be SELECT INTO / INSERT INTO
+        if text == "into":
+            raise SQLGuardError("INTO is not allowed in generated SQL")
+        if text == "for" and next_token is not None and next_token[0] == "word" and next_token[1] in LOCKING_CLAUSE_WORDS:
+            raise SQLGuardError("Row-locking clauses (FOR UPDATE/SHARE) are not allowed in generated SQL")
+        if text in FORBIDDEN_FUNCTIONS and next_token is not None and next_token[1] == "(":
+            raise SQLGuardError(f"Function {text} is not allowed in generated SQL")
+    return statement
+
+
+def has_top_level_limit(statement: str) -> bool:
+    return any(kind == "word" and text in ("limit", "fetch") and depth == 0
+               for kind, text, depth in tokenize(statement))
+
+
+def inject_limit(statement: str, limit: int):
+    """(statement with a LIMIT, whether one was added)"""
+    if has_top_level_limit(statement):
+        return statement, False
+    return f"{statement}\nLIMIT {int(limit)}", True
+
+
+def plan_estimates(plan):
+    """(total cost of the plan, largest row estimate of any node)"""
+    max_rows = 0.0
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        max_rows = max(max_rows, float(node.get("Plan Rows", 0)))
+        stack.extend(node.get("Plans", []))
+    return float(plan.get("Total Cost", 0)), max_rows
+
+
+def explain(conn, statement):
+    with conn.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + statement)
+        result = cursor.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    return plan_estimates(result[0]["Plan"])
+
+
+class GuardDecision:
+    """Outcome of guarding one statement: what to run and under which limits"""
+
+    def __init__(self, sql, action, row_cap, timeout_ms, cost=None, plan_rows=None,
+                 limit_injected=False, reason=None):
+        self.sql = sql
+        self.action = action  # allow | downgrade | reject
+        self.row_cap = row_cap
+        self.timeout_ms = timeout_ms
+        self.cost = cost
+        self.plan_rows = plan_rows
+        self.limit_injected = limit_injected
+        self.reason = reason
+
+
+def guard_query(conn, sql_query, row_cap=QUERY_ROW_CAP, timeout_ms=QUERY_STATEMENT_TIMEOUT_MS, limit=True):
+    """
+    Vet LLM-generated SQL before running it on ``conn``.
+
+    Parses the statement (read-only single SELECT), adds a LIMIT when there is
+    none (``limit=False`` for aggregate wrappers), opens a read-only transaction
+    with a statement_timeout and checks the EXPLAIN estimates: plans above
+    QUERY_MAX_COST or QUERY_MAX_PLAN_ROWS are rejected, plans above
+    QUERY_DOWNGRADE_COST run with a smaller row cap and timeout. Raises
+    SQLGuardError on rejection; the decision is logged with timings either way.
+    """
+    start = time.perf_counter()
+    try:
+        statement = check_statement(sql_query)
+    except SQLGuardError as e:
+        logger.warning(f"SQL guard rejected (parse, {(time.perf_counter() - start) * 1000:.1f} ms): {e}")
+        raise
+    injected = False
+    if limit:
+        # One extra row tells the caller the result was cut short
+        statement, injected = inject_limit(statement, row_cap + 1)
+    parsed = time.perf_counter()
+
+    with conn.cursor() as cursor:
+        cursor.execute("SET TRANSACTION READ ONLY")
+        cursor.execute("SET LOCAL statement_timeout = %s", (int(timeout_ms),))
+    cost, plan_rows = explain(conn, statement)
+    explained = time.perf_counter()
+
+    decision = GuardDecision(statement, "allow", row_cap, timeout_ms, cost, plan_rows, injected)
+    if cost > QUERY_MAX_COST or plan_rows > QUERY_MAX_PLAN_ROWS:
+        decision.action = "reject"
+        decision.reason = (f"estimated cost {cost:,.0f} / {plan_rows:,.0f} rows exceeds the limit "
+                           f"({QUERY_MAX_COST:,.0f} / {QUERY_MAX_PLAN_ROWS:,.0f})")
+    elif cost > QUERY_DOWNGRADE_COST:
+        decision.action = "downgrade"
+        decision.reason = f"estimated cost {cost:,.0f} above {QUERY_DOWNGRADE_COST:,.0f}"
+        decision.row_cap = min(row_cap, QUERY_DOWNGRADE_ROW_CAP)
+        decision.timeout_ms = min(timeout_ms, QUERY_DOWNGRADE_TIMEOUT_MS)
+        if injected:
+            decision.sql, _ = inject_limit(check_statement(sql_query), decision.row_cap + 1)
+        with conn.cursor() as cursor:
+            cursor.execute("SET LOCAL statement_timeout = %s", (decision.timeout_ms,))
+
+    logger.info(
+        f"SQL guard {decision.action}: cost={cost:,.0f} plan_rows={plan_rows:,.0f} "
+        f"limit_injected={injected} parse_ms={(parsed - start) * 1000:.1f} "
+        f"explain_ms={(explained - parsed) * 1000:.1f}"
+        + (f" reason={decision.reason}" if decision.reason else ""))
+    if decision.action == "reject":
+        raise SQLGuardError(f"Query rejected: {decision.reason}")
+    return decision
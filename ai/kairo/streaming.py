@@ -0,0 +1,190 @@
+import csv
+import html
+import io
+import json
+import logging
+import threading
+from datetime import datetime, date, time
+from decimal import Decimal
+import psycopg2.extras
+from config.settings import QUERY_ROW_CAP, QUERY_FETCH_SIZE
+from kairo.sql_guard import guard_query
+from utils.db import get_db_pool
+from utils.html_formatter import add_report_styling
+
+logger = logging.getLogger(__name__)
+
+STREAM_MEDIA_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson"
+}
+
+
+def open_query_cursor(conn, sql_query, row_cap=QUERY_ROW_CAP, fetch_size=QUERY_FETCH_SIZE):
+    """
+    Guard ``sql_query`` (see kairo.sql_guard) and execute it on a named
+    (server-side) cursor, so rows are pulled from Postgres ``fetch_size`` at a
+    time instead of all at once.
+
+    Returns:
+        (cursor, guard decision with the effective row cap)
+    """
+    decision = guard_query(conn, sql_query, row_cap=row_cap)
+    cursor = conn.cursor(name="query_stream", cursor_factory=psycopg2.extras.DictCursor)
+    cursor.itersize = fetch_size
+    cursor.execute(decision.sql)
+    return cursor, decision
+
+
+def fetch_query_rows(conn, sql_query, row_cap=QUERY_ROW_CAP):
+    """
+    Run a generated query with the row cap and statement timeout.
+
+    Returns:
+        (column names, rows, whether the cap cut the result short)
+    """
+    cursor, decision = open_query_cursor(conn, sql_query, row_cap=row_cap)
+    try:
+        rows = cursor.fetchmany(decision.row_cap + 1)
+        headers = [column.name for column in cursor.description] if cursor.description else []
+    finally:
+        cursor.close()
+    truncated = len(rows) > decision.row_cap
+    return headers, rows[:decision.row_cap], truncated
+
+
+def format_cell(value):
+    """Markdown table cell text for a database value"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value).replace("|", "\\|")  # Escape pipe characters
+
+
+def json_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (list, dict, str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def csv_value(value):
+    if value is None:
+        return ""
+    value = json_value(value)
+    return json.dumps(value) if isinstance(value, (list, dict)) else value
+
+
+class QueryStream:
+    """
+    A query running on a pooled connection whose rows are streamed out.
+
+    ``open`` executes the statement and fetches the first batch, so SQL errors
+    surface before any response is sent. Iterating ``chunks`` renders the rows
+    batch by batch and returns the connection to the pool when done (or when
+    the client goes away and the generator is closed).
+    """
+
+    def __init__(self, sql_query, row_cap=QUERY_ROW_CAP):
+        self.sql_query = sql_query
+        self.row_cap = row_cap
+        self.rows_sent = 0
+        self.truncated = False
+        self._pool = get_db_pool()
+        self._conn = None
+        self._cursor = None
+        self._first = []
+        self.headers = []
+        self._close_lock = threading.Lock()
+
+    def open(self):
+        self._conn = self._pool.getconn()
+        try:
+            self._cursor, decision = open_query_cursor(self._conn, self.sql_query, row_cap=self.row_cap)
+            self.row_cap = decision.row_cap
+            self._first = self._cursor.fetchmany(min(self._cursor.itersize, self.row_cap + 1))
+            self.headers = [column.name for column in self._cursor.description] if self._cursor.description else []
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def close(self):
+        """Return the connection to the pool; safe to call more than once, from any thread"""
+        with self._close_lock:
+            cursor, self._cursor = self._cursor, None
+            conn, self._conn = self._conn, None
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        if conn is not None:
+            self._pool.putconn(conn)
+
+    def batches(self):
+        """Lists of rows, stopping at the row cap"""
+        try:
+            rows = self._first
+            self._first = []
+            while rows:
+                remaining = self.row_cap - self.rows_sent
+                if len(rows) > remaining:
+                    rows = rows[:remaining]
+                    self.truncated = True
+                if rows:
+                    self.rows_sent += len(rows)
+                    yield rows
+                if self.truncated:
+                    break
+                rows = self._cursor.fetchmany(self._cursor.itersize)
+        finally:
+            self.close()
+
+    def chunks(self, format):
+        return {"html": self._html_chunks, "csv": self._csv_chunks, "ndjson": self._ndjson_chunks}[format]()
+
+    def _html_chunks(self):
+        head, tail = add_report_styling("<!--rows-->").split("<!--rows-->")
+        yield head + "<h1>Query Results</h1>\n<pre><code>" + html.escape(self.sql_query) + "</code></pre>\n<table>\n<thead><tr>"
+        yield "".join(f"<th>{html.escape(name)}</th>" for name in self.headers) + "</tr></thead>\n<tbody>\n"
+        try:
+            for rows in self.batches():
+                yield "".join(
+                    "<tr>" + "".join(f"<td>{html.escape(format_cell(value))}</td>" for value in row) + "</tr>\n"
+                    for row in rows
+                )
+        except Exception as e:
+            logger.error(f"Query stream failed after {self.rows_sent} rows: {str(e)}")
+            yield f"</tbody></table>\n<p><strong>Error:</strong> {html.escape(str(e))}</p>" + tail
+            return
+        yield f"</tbody></table>\n<p><em>{self.summary()}</em></p>" + tail
+
+    def _csv_chunks(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.headers)
+        for rows in self.batches():
+            writer.writerows([csv_value(value) for value in row] for row in rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def _ndjson_chunks(self):
+        for rows in self.batches():
+            yield "".join(
+                json.dumps({name: json_value(value) for name, value in zip(self.headers, row)}) + "\n"
+                for row in rows
+            )
+
+    def summary(self):
+        if self.truncated:
+            return f"Showing the first {self.rows_sent} results (row limit {self.row_cap} reached)"
+        return f"Total Results: {self.rows_sent}"
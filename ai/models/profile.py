@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class Profile(BaseModel):
@@ -40,8 +40,13 @@ class CandidateProfile(BaseModel):
 class JobRequest(BaseModel):
     profile: Profile
     applied_position: str
+    top_k: Optional[int] = Field(3, ge=1, le=20)  # Number of ranked matches to return
 
 
 class CandidateRequest(BaseModel):
     profile: CandidateProfile
-    applied_position: str
\ No newline at end of file
+    applied_position: str
+
+class CandidateRankingRequest(BaseModel):
+    profile: CandidateProfile
+    top_k: Optional[int] = Field(None, ge=1)  # Return only the best top_k positions (default: all)
@@ -1,12 +1,10 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 import io
 import base64
 from typing import Dict, List, Optional, Any, Tuple
 from pydantic import BaseModel
-from langchain_groq import ChatGroq
+from utils.llm_gateway import NSP_MODEL, complete
 
 
 class NSPAnalyzer:
@@ -109,12 +107,18 @@ class NSPVisualizer:
     
     def __init__(self, df: pd.DataFrame):
         self.df = df
+        # Plotting libraries are slow to import, so only load them when charts are drawn
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         # Set plotting style
         sns.set_style("whitegrid")
         plt.rcParams['figure.figsize'] = (10, 6)
     
     def visualize_subject_success_rates(self) -> str:
         """Create a bar chart of hiring success rates by subject and return as base64 string"""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         # Group by program and calculate success rates
         program_stats = []
         for program, group in self.df.groupby('Standardized Program'):
@@ -190,6 +194,8 @@ class NSPVisualizer:
     
     def visualize_retention_comparison(self) -> str:
         """Create a visualization comparing retention by subject and return as base64 string"""
+        import matplotlib.pyplot as plt
+
         # Group data by program
         program_data = {}
         
@@ -251,8 +257,8 @@ class NSPVisualizer:
         img_str = base64.b64encode(buf.read()).decode('utf-8')
         return img_str
 
-def generate_recommendations(subject_data: pd.DataFrame, api_key: str, top_n: int = 3) -> List[str]:
-    """Generate recommendations using LangChain and Groq synchronously"""
+def generate_recommendations(subject_data: pd.DataFrame, top_n: int = 3) -> List[str]:
+    """Generate recommendations with Groq through the shared LLM gateway"""
     # Handle empty data
     if subject_data.empty or len(subject_data) < top_n:
         return ["Not enough data to generate recommendations."]
@@ -272,17 +278,8 @@ def generate_recommendations(subject_data: pd.DataFrame, api_key: str, top_n: in
     )
     
     try:
-        # Initialize LLM
-        llm = ChatGroq(
-            model="llama-3.1-8b-instant", 
-            api_key=api_key
-        )
-        
-        # Invoke synchronously
-        response = llm.invoke(prompt)
-        
-        # Get the response content
-        response_text = response.content if hasattr(response, 'content') else str(response)
+        # Invoke synchronously (ChatGroq's default temperature, as before)
+        response_text = complete(NSP_MODEL, prompt, temperature=0.7)
         
         # Split into individual recommendations
         recommendations = [rec.strip() for rec in response_text.split('\n') if rec.strip()]
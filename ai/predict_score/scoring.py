@@ -1,10 +1,28 @@
 import pandas as pd
 import numpy as np
 import re
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
+from functools import partial
 from dateutil.relativedelta import relativedelta
 import datetime
+from utils.model_registry import model_registry, load_sentence_transformer
+from utils.embedding_cache import EmbeddingCache
+from utils.micro_batcher import MicroBatcher
+
+
+def cosine_similarity(u, v):
+    """Cosine similarity of two vectors (numpy instead of sklearn, which is slow to import)"""
+    u = np.asarray(u, dtype=np.float32)
+    v = np.asarray(v, dtype=np.float32)
+    denominator = np.linalg.norm(u) * np.linalg.norm(v)
+    return float(np.dot(u, v) / denominator) if denominator else 0.0
+
+
+def normalize_rows(matrix):
+    """L2-normalise each row so dot products are cosine similarities (zero rows stay zero)"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
 
 
 class CandidateJobMatcher:
@@ -15,7 +33,18 @@ class CandidateJobMatcher:
         Args:
             model_name: The pre-trained model to use for embeddings
         """
-        self.model = SentenceTransformer(model_name)
+        # The transformer is loaded lazily through the model registry
+        self.model_name = model_name
+        model_registry.register(model_name, partial(load_sentence_transformer, model_name))
+
+        # Job-side embeddings are pinned by precompute_job_embeddings,
+        # candidate-side ones are kept in a bounded LRU with a TTL
+        self.embedding_cache = EmbeddingCache(f"scoring:{model_name}")
+        # Cache misses from concurrent requests are encoded together
+        self.batcher = MicroBatcher(f"scoring:{model_name}", lambda texts: self.model.encode(texts))
+
+        # (jobs list, prepared arrays) of the last list passed to predict_match_scores
+        self._prepared_jobs = None
 
         # Define weights for different matching factors
         self.weights = {
@@ -38,6 +67,37 @@ class CandidateJobMatcher:
             'DevOps': ['devops', 'cicd', 'infrastructure', 'automation', 'cloud', 'aws', 'azure']
         }
 
+    @property
+    def model(self):
+        """The sentence transformer, loaded on first use"""
+        return model_registry.get(self.model_name)
+
+    def encode_texts(self, texts):
+        """Embed texts through the cache; uncached texts are micro-batched with other requests"""
+        return self.embedding_cache.encode(texts, self.batcher.encode)
+
+    @staticmethod
+    def join_terms(terms, sort=False):
+        """Text that is embedded for a list of skills or industries"""
+        terms = [term.lower() for term in terms]
+        # Order-insensitive inputs are sorted so the same set always maps to the same embedding
+        return ' '.join(sorted(terms) if sort else terms)
+
+    def precompute_job_embeddings(self, jobs):
+        """Encode the skill and industry texts of every job in one batch and pin them in the cache"""
+        texts = []
+        for job in jobs:
+            requirements = self.parse_job_requirements(job)
+            if requirements['required_skills']:
+                texts.append(self.join_terms(requirements['required_skills']))
+            if requirements['industry_focus']:
+                texts.append(self.join_terms(requirements['industry_focus'], sort=True))
+        texts = list(dict.fromkeys(texts))
+
+        embeddings = self.model.encode(texts) if texts else []
+        self.embedding_cache.pin(texts, embeddings)
+        return len(texts)
+
     def extract_years_experience(self, candidate_data):
         """
         Extract total years of experience from candidate data
@@ -231,14 +291,14 @@ class CandidateJobMatcher:
         job_preferred_skills_lower = [
             skill.lower() for skill in job_preferred_skills] if job_preferred_skills else []
 
-        # Calculate semantic similarity using embeddings
-        candidate_embedding = self.model.encode(
-            [' '.join(candidate_skills_lower)])[0]
-        job_embedding = self.model.encode(
-            [' '.join(job_required_skills_lower)])[0]
+        # Calculate semantic similarity using (cached) embeddings
+        candidate_embedding, job_embedding = self.encode_texts([
+            self.join_terms(candidate_skills, sort=True),
+            self.join_terms(job_required_skills)
+        ])
 
         semantic_similarity = cosine_similarity(
-            [candidate_embedding], [job_embedding])[0][0]
+            candidate_embedding, job_embedding)
 
         # Count direct matches (exact or substring)
         required_matches = 0
@@ -314,13 +374,14 @@ class CandidateJobMatcher:
                                       for ind in candidate_industries]
         job_industries_lower = [ind.lower() for ind in job_industries]
 
-        # Calculate semantic similarity using embeddings
-        candidate_embedding = self.model.encode(
-            [' '.join(candidate_industries_lower)])[0]
-        job_embedding = self.model.encode([' '.join(job_industries_lower)])[0]
+        # Calculate semantic similarity using (cached) embeddings
+        candidate_embedding, job_embedding = self.encode_texts([
+            self.join_terms(candidate_industries, sort=True),
+            self.join_terms(job_industries, sort=True)
+        ])
 
         semantic_similarity = cosine_similarity(
-            [candidate_embedding], [job_embedding])[0][0]
+            candidate_embedding, job_embedding)
 
         # Count direct matches
         direct_matches = 0
@@ -341,6 +402,163 @@ class CandidateJobMatcher:
 
         return combined_score
 
+    @staticmethod
+    def direct_match_pct(candidate_terms_lower, job_terms):
+        """Share of job terms that appear in (or contain) one of the candidate's terms"""
+        if not job_terms:
+            return 0.0
+        matches = 0
+        for job_term in job_terms:
+            job_term = job_term.lower()
+            for candidate_term in candidate_terms_lower:
+                if job_term in candidate_term or candidate_term in job_term:
+                    matches += 1
+                    break
+        return min(matches / len(job_terms), 1.0)
+
+    @staticmethod
+    def to_candidate_dict(candidate_data):
+        """Accept a dict, Series or single-row DataFrame for the candidate"""
+        if isinstance(candidate_data, pd.Series):
+            return candidate_data.to_dict()
+        if isinstance(candidate_data, pd.DataFrame):
+            return candidate_data.iloc[0].to_dict() if len(candidate_data) > 0 else {}
+        return candidate_data
+
+    @staticmethod
+    def semantic_scores(job_matrix, candidate_embedding, job_count):
+        """Cosine similarity of the candidate to every job, zero when no job has an embedding"""
+        if job_matrix is None:
+            return np.zeros(job_count)
+        return job_matrix @ normalize_rows(candidate_embedding)[0]
+
+    def prepare_jobs(self, jobs):
+        """
+        Parse every job's requirements into arrays for predict_match_scores.
+
+        The result for the most recent jobs list is kept, so scoring many
+        candidates against the same (registry-cached) list parses it once.
+        """
+        if self._prepared_jobs is not None and self._prepared_jobs[0] is jobs:
+            return self._prepared_jobs[1]
+
+        requirements = [self.parse_job_requirements(job) for job in jobs]
+        has_skills = np.array([bool(r['required_skills']) for r in requirements], dtype=bool)
+        has_industries = np.array([bool(r['industry_focus']) for r in requirements], dtype=bool)
+
+        def embedding_matrix(texts, present):
+            # Job-side texts are pinned in the cache, so this rarely reaches the transformer.
+            # None when no job has the texts: there is nothing to compare the candidate against
+            if not present.any():
+                return None
+            embeddings = np.stack(self.encode_texts([text for text, keep in zip(texts, present) if keep]))
+            matrix = np.zeros((len(texts), embeddings.shape[1]), dtype=np.float32)
+            matrix[present] = embeddings
+            return normalize_rows(matrix)
+
+        prepared = {
+            'requirements': requirements,
+            'has_skills': has_skills,
+            'has_industries': has_industries,
+            'skill_matrix': embedding_matrix([self.join_terms(r['required_skills']) for r in requirements], has_skills),
+            'industry_matrix': embedding_matrix(
+                [self.join_terms(r['industry_focus'], sort=True) for r in requirements], has_industries),
+            'min_experience': np.array([r['min_experience'] for r in requirements], dtype=np.float64),
+            'education_level': np.array([r['education_level'] for r in requirements], dtype=np.float64)
+        }
+        self._prepared_jobs = (jobs, prepared)
+        return prepared
+
+    def predict_match_scores(self, candidate_data, jobs):
+        """
+        Score one candidate against every job in one pass.
+
+        The candidate is encoded once (at most one transformer call, none when
+        cached) and each match component is computed as an array across all jobs.
+
+        Returns:
+            List of dicts with the job ``index``, ``match_score`` (0-100) and the
+            component scores, best match first
+        """
+        if not jobs:
+            return []
+        candidate_dict = self.to_candidate_dict(candidate_data)
+        prepared = self.prepare_jobs(jobs)
+        requirements = prepared['requirements']
+
+        candidate_years = self.extract_years_experience(candidate_dict)
+        candidate_education = self.extract_education_level(candidate_dict)
+        candidate_skills = self.extract_skills(candidate_dict)
+        candidate_industries = self.extract_industries(candidate_dict)
+        candidate_skills_lower = [skill.lower() for skill in candidate_skills]
+        candidate_industries_lower = [ind.lower() for ind in candidate_industries]
+
+        # Both candidate texts go to the encoder together
+        texts = []
+        if candidate_skills:
+            texts.append(self.join_terms(candidate_skills, sort=True))
+        if candidate_industries:
+            texts.append(self.join_terms(candidate_industries, sort=True))
+        embeddings = iter(self.encode_texts(texts)) if texts else iter(())
+
+        # Skill match: 70% semantic similarity, 20% required matches, 10% preferred matches
+        if candidate_skills:
+            semantic = self.semantic_scores(prepared['skill_matrix'], next(embeddings), len(jobs))
+            required_pct = np.array([self.direct_match_pct(candidate_skills_lower, r['required_skills'])
+                                     for r in requirements])
+            preferred_pct = np.array([self.direct_match_pct(candidate_skills_lower, r['preferred_skills'])
+                                      for r in requirements])
+            skill_scores = np.where(
+                prepared['has_skills'], 0.7 * semantic + 0.2 * required_pct + 0.1 * preferred_pct, 0.0)
+        else:
+            skill_scores = np.zeros(len(jobs))
+
+        # Experience match, same rules as calculate_experience_match
+        min_years = prepared['min_experience']
+        safe_min_years = np.where(min_years == 0, 1.0, min_years)
+        experience_scores = np.where(
+            min_years == 0,
+            1.0,
+            np.where(candidate_years >= min_years,
+                     np.minimum(1.0 + ((candidate_years - min_years) / safe_min_years) * 0.5, 2.0) / 2,
+                     np.maximum(0.0, candidate_years / safe_min_years))
+        )
+
+        # Education match, same rules as calculate_education_match
+        levels = prepared['education_level']
+        safe_levels = np.where(levels == 0, 1.0, levels)
+        education_scores = np.where(
+            (levels == 0) | (candidate_education >= levels), 1.0, np.maximum(0.0, candidate_education / safe_levels))
+
+        # Industry match: 70% semantic similarity, 30% direct matches, neutral without information
+        if candidate_industries:
+            semantic = self.semantic_scores(prepared['industry_matrix'], next(embeddings), len(jobs))
+            match_pct = np.array([self.direct_match_pct(candidate_industries_lower, r['industry_focus'])
+                                  for r in requirements])
+            industry_scores = np.where(prepared['has_industries'], 0.7 * semantic + 0.3 * match_pct, 0.5)
+        else:
+            industry_scores = np.full(len(jobs), 0.5)
+
+        total_scores = 100 * (
+            skill_scores * self.weights['skill_match'] +
+            experience_scores * self.weights['experience_match'] +
+            education_scores * self.weights['education_match'] +
+            industry_scores * self.weights['industry_match']
+        )
+
+        ranking = np.argsort(-total_scores, kind="stable")
+        return [
+            {
+                'index': int(i),
+                'match_score': float(total_scores[i]),
+                'skill_match': float(skill_scores[i]),
+                'experience_match': float(experience_scores[i]),
+                'education_match': float(education_scores[i]),
+                'industry_match': float(industry_scores[i])
+            }
+            for i in ranking
+        ]
+
     def predict_match_score(self, candidate_data, job_data):
         """
         Predict match score between a candidate and a job
@@ -358,13 +576,7 @@ class CandidateJobMatcher:
             job_dict = job_data
 
         # Convert candidate_data to a dictionary if it's a Series or DataFrame
-        if isinstance(candidate_data, pd.Series):
-            candidate_dict = candidate_data.to_dict()
-        elif isinstance(candidate_data, pd.DataFrame):
-            candidate_dict = candidate_data.iloc[0].to_dict() if len(
-                candidate_data) > 0 else {}
-        else:
-            candidate_dict = candidate_data
+        candidate_dict = self.to_candidate_dict(candidate_data)
 
         # Extract candidate information
         candidate_years = self.extract_years_experience(candidate_dict)
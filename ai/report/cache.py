@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime
+from config.settings import REPORT_CACHE_TTL, REPORT_STALE_TTL, REPORT_FINGERPRINT_TTL
+from utils.executor import run_io
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(content: str) -> str:
+    return '"' + hashlib.sha1(content.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """Evaluate an If-None-Match header (weak comparison, as RFC 9110 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class CachedReport:
+    """A generated report, the data version it was built from and its rendered formats"""
+
+    def __init__(self, fingerprint, markdown_content):
+        self.fingerprint = fingerprint
+        self.markdown = markdown_content
+        self.created = time.monotonic()
+        self.generated_at = datetime.now().isoformat()
+        self._rendered = {}
+
+    @property
+    def age(self):
+        return time.monotonic() - self.created
+
+    def render(self, format, renderer):
+        """(content, etag) for ``format``, rendering it on first request"""
+        if format not in self._rendered:
+            content = renderer(self.markdown, format)
+            self._rendered[format] = (content, make_etag(content))
+        return self._rendered[format]
+
+
+class ReportCache:
+    """
+    Cache of generated reports keyed by report type and data version.
+
+    Each report registers a blocking ``generate`` function and a cheap
+    ``fingerprint`` function (row counts, latest timestamps) that changes
+    whenever the underlying data does. A cached report is served as long as
+    its fingerprint matches and it is younger than ``ttl``; after that it is
+    still served (stale-while-revalidate) for up to ``stale_ttl`` while one
+    background task regenerates it. Concurrent misses share one generation.
+    """
+
+    def __init__(self, ttl=REPORT_CACHE_TTL, stale_ttl=REPORT_STALE_TTL, fingerprint_ttl=REPORT_FINGERPRINT_TTL):
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.fingerprint_ttl = fingerprint_ttl
+        self._reports = {}
+        self._entries = {}
+        self._fingerprints = {}  # report type -> (fingerprint, checked at)
+        self._inflight = {}
+        self._counters = {"hits": 0, "stale": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def register(self, report_type, generate, fingerprint):
+        self._reports[report_type] = (generate, fingerprint)
+
+    async def get(self, report_type):
+        """Return (CachedReport, cache status) where status is HIT, STALE or MISS"""
+        fingerprint = await self._current_fingerprint(report_type)
+        entry = self._entries.get(report_type)
+
+        if entry is not None:
+            unchanged = fingerprint is None or fingerprint == entry.fingerprint
+            if unchanged and entry.age < self.ttl:
+                self._counters["hits"] += 1
+                return entry, "HIT"
+            if entry.age < self.stale_ttl:
+                self._counters["stale"] += 1
+                self._refresh_in_background(report_type, fingerprint)
+                return entry, "STALE"
+
+        self._counters["misses"] += 1
+        return await self._generate(report_type, fingerprint), "MISS"
+
+    async def _current_fingerprint(self, report_type):
+        """Data version, re-queried at most every ``fingerprint_ttl`` seconds; None if unavailable"""
+        cached = self._fingerprints.get(report_type)
+        if cached is not None and time.monotonic() - cached[1] < self.fingerprint_ttl:
+            return cached[0]
+        _, fingerprint_func = self._reports[report_type]
+        try:
+            fingerprint = await run_io(fingerprint_func)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint {report_type} report data: {str(e)}")
+            return None
+        self._fingerprints[report_type] = (fingerprint, time.monotonic())
+        return fingerprint
+
+    def _generate(self, report_type, fingerprint):
+        """Start (or join) the single generation of a report"""
+        task = self._inflight.get(report_type)
+        if task is None:
+            task = asyncio.ensure_future(self._build(report_type, fingerprint))
+            self._inflight[report_type] = task
+            task.add_done_callback(lambda _: self._inflight.pop(report_type, None))
+        # Shielded so a disconnecting client doesn't cancel the work other requests wait on
+        return asyncio.shield(task)
+
+    async def _build(self, report_type, fingerprint):
+        generate, _ = self._reports[report_type]
+        start = time.perf_counter()
+        markdown_content = await run_io(generate)
+        entry = CachedReport(fingerprint, markdown_content)
+        self._entries[report_type] = entry
+        logger.info(f"Generated {report_type} report in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return entry
+
+    def _refresh_in_background(self, report_type, fingerprint):
+        if report_type in self._inflight:
+            return
+        self._counters["refreshes"] += 1
+        task = self._generate(report_type, fingerprint)
+
+        def log_failure(done):
+            if not done.cancelled() and done.exception() is not None:
+                self._counters["refresh_errors"] += 1
+                logger.error(f"Background refresh of {report_type} report failed: {str(done.exception())}")
+        task.add_done_callback(log_failure)
+
+    def invalidate(self, report_type=None):
+        for key in [report_type] if report_type else list(self._entries):
+            self._entries.pop(key, None)
+            self._fingerprints.pop(key, None)
+
+    def stats(self):
+        return {
+            **self._counters,
+            "reports": {
+                report_type: {
+                    "age_seconds": round(entry.age, 1),
+                    "generated_at": entry.generated_at,
+                    "fingerprint": entry.fingerprint
+                }
+                for report_type, entry in list(self._entries.items())
+            },
+            "regenerating": list(self._inflight)
+        }
+
+
+# Shared cache for the /api report endpoints
+report_cache = ReportCache()
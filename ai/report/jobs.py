@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from config.settings import REPORT_JOB_TTL, REPORT_JOB_MAX
+
+logger = logging.getLogger(__name__)
+
+
+class InsightJob:
+    """
+    A background LLM insights generation.
+
+    The worker thread appends text chunks as they stream in; async readers
+    (status polling, SSE) are woken through the event loop that created the job.
+    """
+
+    def __init__(self, report_type):
+        self.id = uuid.uuid4().hex
+        self.report_type = report_type
+        self.status = "pending"  # pending -> running -> completed | failed
+        self.chunks = []
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.completed_at = None
+        self.finished = None  # monotonic time the job finished, for expiry
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._updated = asyncio.Event()
+
+    @property
+    def done(self):
+        return self.status in ("completed", "failed")
+
+    @property
+    def text(self):
+        with self._lock:
+            return "".join(self.chunks)
+
+    def run(self, stream_func, *args):
+        """Consume ``stream_func(*args)`` chunk by chunk (runs in a worker thread)"""
+        self.status = "running"
+        self._notify()
+        try:
+            for chunk in stream_func(*args):
+                with self._lock:
+                    self.chunks.append(chunk)
+                self._notify()
+            self.status = "completed"
+        except Exception as e:
+            logger.error(f"Insight job {self.id} ({self.report_type}) failed: {str(e)}")
+            self.error = str(e)
+            self.status = "failed"
+        self.completed_at = datetime.now().isoformat()
+        self.finished = time.monotonic()
+        self._notify()
+
+    def fail(self, error):
+        self.error = error
+        self.status = "failed"
+        self.completed_at = datetime.now().isoformat()
+        self.finished = time.monotonic()
+        self._notify()
+
+    def _notify(self):
+        # Callable from any thread; the swap happens on the loop so waiters see every update
+        def wake():
+            self._updated.set()
+            self._updated = asyncio.Event()
+        try:
+            self._loop.call_soon_threadsafe(wake)
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    async def updates(self, keepalive=15):
+        """
+        Async iterator over (new chunks, done) as the job progresses;
+        yields ([], False) every ``keepalive`` seconds while nothing happens.
+        """
+        sent = 0
+        while True:
+            event = self._updated
+            with self._lock:
+                new_chunks = self.chunks[sent:]
+            sent += len(new_chunks)
+            done = self.done
+            if new_chunks or done:
+                yield new_chunks, done
+            if done:
+                return
+            try:
+                await asyncio.wait_for(event.wait(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield [], False
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "report_type": self.report_type,
+            "status": self.status,
+            "insights": self.text if self.chunks else None,
+            "error": self.error,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at
+        }
+
+
+class InsightJobStore:
+    """In-memory jobs by id; finished jobs expire after ``ttl`` and the oldest are dropped past ``max_jobs``"""
+
+    def __init__(self, ttl=REPORT_JOB_TTL, max_jobs=REPORT_JOB_MAX):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+
+    def create(self, report_type):
+        self._expire()
+        job = InsightJob(report_type)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id):
+        self._expire()
+        return self._jobs.get(job_id)
+
+    def _expire(self):
+        now = time.monotonic()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished is not None and now - job.finished > self.ttl]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        statuses = [job.status for job in list(self._jobs.values())]
+        return {status: statuses.count(status) for status in ("pending", "running", "completed", "failed")}
+
+
+# Shared store for the report insight job endpoints
+insight_jobs = InsightJobStore()
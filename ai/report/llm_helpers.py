@@ -1,36 +1,16 @@
-import os
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 import json
 import logging
 from dotenv import load_dotenv
+from utils.llm_gateway import REPORT_MODEL, complete, stream_complete, render_prompt
+from config.settings import LLM_CACHE_TTL_INSIGHTS
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Sampling temperature the insight prompts were tuned with (ChatGroq's default)
+INSIGHTS_TEMPERATURE = 0.7
 
-def get_llm_client():
-    """Initialize and return a Groq LLM client using langchain"""
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY environment variable not set")
-    
-    # Initialize the LLM
-    llm = ChatGroq(
-        api_key=api_key,
-        model_name="llama-3.3-70b-versatile"  # You can adjust the model as needed
-    )
-    return llm
-
-def generate_employee_insights(employee_data_json):
-    """Generate insights on employee data using LLM"""
-    try:
-        llm = get_llm_client()
-        
-        # Create a prompt template
-        prompt = ChatPromptTemplate.from_template(
-            """You are an expert HR analyst. Analyze the following employee data and provide 
+EMPLOYEE_INSIGHTS_PROMPT = """You are an expert HR analyst. Analyze the following employee data and provide 
             strategic insights and actionable recommendations:
             
             {employee_data}
@@ -57,31 +37,8 @@ def generate_employee_insights(employee_data_json):
             
             Keep your analysis concise yet insightful, based strictly on the data provided.
             """
-        )
-        
-        # Process with LLM
-        chain = prompt | llm | StrOutputParser()
-        result = chain.invoke({"employee_data": employee_data_json})
-        
-        return result
-    except Exception as e:
-        logger.error(f"Error generating employee insights: {str(e)}")
-        return f"""
-## LLM Analysis Error
 
-We couldn't generate AI insights at this time: {str(e)}
-
-Please ensure your GROQ_API_KEY is properly set in your environment variables.
-"""
-
-def generate_recruitment_insights(recruitment_data_json):
-    """Generate insights on recruitment data using LLM"""
-    try:
-        llm = get_llm_client()
-        
-        # Create a prompt template
-        prompt = ChatPromptTemplate.from_template(
-            """You are an expert recruitment analyst. Analyze the following recruitment data and provide 
+RECRUITMENT_INSIGHTS_PROMPT = """You are an expert recruitment analyst. Analyze the following recruitment data and provide 
             strategic insights and recommendations to improve the recruitment process:
             
             {recruitment_data}
@@ -107,19 +64,53 @@ def generate_recruitment_insights(recruitment_data_json):
             
             Keep your analysis concise yet insightful, based strictly on the data provided.
             """
-        )
-        
-        # Process with LLM
-        chain = prompt | llm | StrOutputParser()
-        result = chain.invoke({"recruitment_data": recruitment_data_json})
-        
-        return result
-    except Exception as e:
-        logger.error(f"Error generating recruitment insights: {str(e)}")
-        return f"""
+
+
+def complete_insights(template, **values):
+    """Run one of the insight prompts through the shared LLM gateway (cached for identical data)"""
+    return complete(REPORT_MODEL, render_prompt(template, **values), temperature=INSIGHTS_TEMPERATURE,
+                    cache_ttl=LLM_CACHE_TTL_INSIGHTS, call_site="report_insights")
+
+
+def stream_insights(template, **values):
+    """Streaming variant of complete_insights"""
+    return stream_complete(REPORT_MODEL, render_prompt(template, **values), temperature=INSIGHTS_TEMPERATURE,
+                           cache_ttl=LLM_CACHE_TTL_INSIGHTS, call_site="report_insights")
+
+
+def llm_error_message(e):
+    return f"""
 ## LLM Analysis Error
 
 We couldn't generate AI insights at this time: {str(e)}
 
 Please ensure your GROQ_API_KEY is properly set in your environment variables.
-"""
\ No newline at end of file
+"""
+
+def generate_employee_insights(employee_data_json, raise_errors=False):
+    """Generate insights on employee data using LLM (an error section on failure, unless ``raise_errors``)"""
+    try:
+        return complete_insights(EMPLOYEE_INSIGHTS_PROMPT, employee_data=employee_data_json)
+    except Exception as e:
+        logger.error(f"Error generating employee insights: {str(e)}")
+        if raise_errors:
+            raise
+        return llm_error_message(e)
+
+def generate_recruitment_insights(recruitment_data_json, raise_errors=False):
+    """Generate insights on recruitment data using LLM (an error section on failure, unless ``raise_errors``)"""
+    try:
+        return complete_insights(RECRUITMENT_INSIGHTS_PROMPT, recruitment_data=recruitment_data_json)
+    except Exception as e:
+        logger.error(f"Error generating recruitment insights: {str(e)}")
+        if raise_errors:
+            raise
+        return llm_error_message(e)
+
+def stream_employee_insights(employee_data_json):
+    """Yield employee insight text chunks as the LLM produces them (errors are raised)"""
+    yield from stream_insights(EMPLOYEE_INSIGHTS_PROMPT, employee_data=employee_data_json)
+
+def stream_recruitment_insights(recruitment_data_json):
+    """Yield recruitment insight text chunks as the LLM produces them (errors are raised)"""
+    yield from stream_insights(RECRUITMENT_INSIGHTS_PROMPT, recruitment_data=recruitment_data_json)
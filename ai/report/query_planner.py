@@ -0,0 +1,69 @@
+import logging
+import threading
+import time
+from utils.db import db_connection, get_db_cursor
+from utils.executor import report_query_pool
+
+logger = logging.getLogger(__name__)
+
+# Timings of the latest run of each report, for the metrics endpoint
+_last_timings = {}
+_timings_lock = threading.Lock()
+
+
+def run_query(sql, fetch):
+    """Run one query on its own pooled connection; returns (rows, elapsed ms)"""
+    start = time.perf_counter()
+    with db_connection() as conn:
+        cursor = get_db_cursor(conn)
+        try:
+            cursor.execute(sql)
+            rows = cursor.fetchone() if fetch == "one" else cursor.fetchall()
+        finally:
+            cursor.close()
+    return rows, round((time.perf_counter() - start) * 1000, 2)
+
+
+def run_report_queries(report_type, queries):
+    """
+    Run a report's independent aggregate queries in parallel.
+
+    Args:
+        report_type: Name used for logging and timings
+        queries: Mapping of section name to (sql, "one" | "all")
+
+    Returns:
+        Mapping of section name to its fetched row(s)
+    """
+    start = time.perf_counter()
+    # Shared by all reports (bounded, so concurrent reports can't take more than
+    # REPORT_QUERY_PARALLELISM pooled connections); a full queue raises PoolSaturatedError
+    futures = {}
+    try:
+        for name, (sql, fetch) in queries.items():
+            futures[name] = report_query_pool.submit(run_query, sql, fetch)
+    except Exception:
+        for future in futures.values():
+            future.cancel()
+        raise
+
+    results, timings = {}, {}
+    for name, future in futures.items():
+        results[name], timings[name] = future.result()
+    total_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    slowest = max(timings, key=timings.get) if timings else None
+    logger.info(f"{report_type} report queries took {total_ms} ms (slowest: {slowest} {timings.get(slowest)} ms)")
+    with _timings_lock:
+        _last_timings[report_type] = {
+            "total_ms": total_ms,
+            "sum_ms": round(sum(timings.values()), 2),
+            "slowest": slowest,
+            "queries_ms": timings
+        }
+    return results
+
+
+def get_report_query_timings():
+    with _timings_lock:
+        return dict(_last_timings)
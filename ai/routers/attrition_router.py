@@ -1,11 +1,131 @@
-from fastapi import APIRouter, HTTPException
-from attrition.predictor import EmployeeData, PredictionResponse, predict_attrition
+import json
+import time
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from attrition.predictor import (
+    EmployeeData, PredictionResponse, AttritionBatchRequest, FEATURE_COLUMNS,
+    predict_attrition, predict_attrition_batch, get_model_info
+)
+from utils.db import db_connection, get_db_cursor
+from utils.executor import run_inference, PoolSaturatedError
 
 router = APIRouter(tags=["Attrition Prediction"], prefix="/predict-attrition")
 
+# Number of NDJSON lines written per chunk of the streamed response
+NDJSON_CHUNK_LINES = 500
+
+# Active employees with the model's features, derived the way the StayOrStrayPredictor
+# client builds its /predict-attrition request: age and duration are differences of
+# calendar years, region is the agency name and work_mode the raw workType value.
+# Employees the client would refuse to score (missing fields, no skills) are skipped.
+ACTIVE_EMPLOYEES_QUERY = """
+    SELECT e.id,
+           (DATE_PART('year', NOW()) - DATE_PART('year', e."birthDate"))::int AS age,
+           e.agency->>'name' AS region,
+           e."workType"::text AS work_mode,
+           e.skills,
+           d.name AS department,
+           (DATE_PART('year', NOW()) - DATE_PART('year', e."hireDate"))::int AS duration
+    FROM employees e
+    JOIN departments d ON e."departmentId" = d.id
+    WHERE e."endDate" IS NULL
+      AND e."birthDate" IS NOT NULL
+      AND e."hireDate" IS NOT NULL
+      AND e."workType" IS NOT NULL
+      AND COALESCE(e.agency->>'name', '') <> ''
+      AND COALESCE(d.name, '') <> ''
+      AND COALESCE(CARDINALITY(e.skills), 0) > 0
+"""
+
+
+def model_headers(response_headers):
+    # Expose which model version served the prediction
+    model_info = get_model_info()
+    response_headers["X-Model-Version"] = str(model_info["version"])
+    response_headers["X-Model-Load-Time-Ms"] = str(model_info["load_time_ms"])
+
+
+def fetch_active_employees() -> pd.DataFrame:
+    """Load every active employee as one frame with an id column plus FEATURE_COLUMNS"""
+    with db_connection() as conn:
+        cursor = get_db_cursor(conn)
+        try:
+            cursor.execute(ACTIVE_EMPLOYEES_QUERY)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    frame = pd.DataFrame([dict(row) for row in rows], columns=["id"] + FEATURE_COLUMNS)
+    frame["id"] = frame["id"].astype(str)
+    frame["duration"] = frame["duration"].astype(float)
+    return frame
+
+
+def iter_ndjson(results, ids=None):
+    """Yield predictions as newline-delimited JSON, a chunk of lines at a time"""
+    lines = []
+    for i, result in enumerate(results):
+        record = {"index": i, **result}
+        if ids is not None:
+            record["id"] = ids[i]
+        lines.append(json.dumps(record))
+        if len(lines) >= NDJSON_CHUNK_LINES:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
 @router.post("", response_model=PredictionResponse)
-def predict_attrition_endpoint(employee: EmployeeData):
+async def predict_attrition_endpoint(employee: EmployeeData, response: Response):
     try:
-        return predict_attrition(employee)
+        prediction = await run_inference(predict_attrition, employee)
+    except PoolSaturatedError:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+    model_headers(response.headers)
+    return prediction
+
+
+@router.post("/batch")
+async def predict_attrition_batch_endpoint(request: AttritionBatchRequest):
+    """
+    Score many employees in one pass and stream the results as NDJSON.
+
+    Send ``employees`` for ad-hoc batches, or ``from_database: true`` to score
+    every active employee straight from Postgres.
+    """
+    return await run_inference(predict_attrition_batch_response, request)
+
+
+def predict_attrition_batch_response(request: AttritionBatchRequest):
+    ids = None
+    if request.from_database:
+        try:
+            frame = fetch_active_employees()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to load employees: {str(e)}")
+        ids = frame.pop("id").tolist()
+    elif request.employees:
+        frame = pd.DataFrame({
+            column: [getattr(employee, column) for employee in request.employees]
+            for column in FEATURE_COLUMNS
+        })
+    else:
+        raise HTTPException(status_code=400, detail="Provide employees or set from_database")
+
+    start = time.perf_counter()
+    try:
+        results = predict_attrition_batch(frame)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    headers = {
+        "X-Batch-Size": str(len(results)),
+        "X-Scoring-Time-Ms": f"{elapsed_ms:.2f}"
+    }
+    model_headers(headers)
+    return StreamingResponse(iter_ndjson(results, ids), media_type="application/x-ndjson", headers=headers)
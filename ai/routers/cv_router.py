@@ -1,11 +1,14 @@
-from fastapi import APIRouter, File, UploadFile
-from fastapi.responses import JSONResponse
-import os
-import tempfile
+from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List
 import logging
-from config.settings import MAX_PDF_PAGES
-from cv_screening.cv_processor import process_cv
-from langchain_community.document_loaders import PyPDFLoader
+from config.settings import MAX_PDF_PAGES, CV_BATCH_MAX_FILES, CV_BATCH_MAX_FILE_BYTES, CV_BATCH_MAX_TOTAL_BYTES
+from cv_screening.cv_processor import extract_cv_text, process_cv_text
+from cv_screening.text_compaction import record_compaction
+from cv_screening.result_cache import file_key, text_key, lookup_cv_info, store_cv_info, mark_cached
+from cv_screening.pdf_utils import PageLimitExceeded
+from cv_screening.batch import CVBatch, expand_uploads, read_upload
+from utils.executor import run_io, run_cpu, PoolSaturatedError
 
 router = APIRouter(tags=["CV Processing"], prefix="/upload-cv")
 logger = logging.getLogger(__name__)
@@ -14,52 +17,60 @@ logger = logging.getLogger(__name__)
 async def upload_cv(file: UploadFile = File(...)):
     """
     Upload and process a CV file, and return extracted information.
-    Rejects CVs that exceed the page limit.
+    Rejects CVs that exceed the page limit. A CV processed before (same file,
+    or the same text) is answered from the result cache.
     """
-    temp_file_path = None
-
     try:
-        # Read content
+        # The upload stays in memory (or Starlette's spooled file), no temp file round trip
         content = await file.read()
 
-        # Save the uploaded file to a temporary location
-        suffix = os.path.splitext(file.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
-        # Check page count for PDF files
-        if suffix.lower() == '.pdf':
-            try:
-                # Use PyPDFLoader to count pages
-                loader = PyPDFLoader(temp_file_path)
-                documents = loader.load()
-
-                # Count pages
-                page_count = len(documents)
+        # Identical re-upload: skip parsing and extraction entirely
+        upload_key = await run_io(file_key, content)
+        cv_info = await run_io(lookup_cv_info, upload_key)
+        if cv_info is not None:
+            return mark_cached(cv_info, "file")
 
-                if page_count > MAX_PDF_PAGES:
-                    # Clean up the temporary file before returning
-                    if temp_file_path:
-                        os.unlink(temp_file_path)
-                        temp_file_path = None
+        # Parse the document once in a worker process (PDF parsing is CPU-bound);
+        # the page limit is checked from the page tree before any text is extracted
+        try:
+            text, text_stats = await run_cpu(extract_cv_text, content, file.filename, MAX_PDF_PAGES)
+        except PageLimitExceeded as e:
+            # Return a direct response with the error
+            return JSONResponse(
+                status_code=413,  # Payload Too Large
+                content={
+                    "detail": f"CV contains {e.page_count} pages, which exceeds our limit of {MAX_PDF_PAGES} pages. Please reduce the length of your CV and try again."}
+            )
+        except PoolSaturatedError:
+            raise
+        except ValueError as ve:
+            return {"error": str(ve)}
+        except Exception as e:
+            logger.error(f"Error extracting CV text: {str(e)}")
+            return {"error": "An unexpected error occurred while processing the CV."}
 
-                    # Return a direct response with the error
-                    return JSONResponse(
-                        status_code=413,  # Payload Too Large
-                        content={
-                            "detail": f"CV contains {page_count} pages, which exceeds our limit of {MAX_PDF_PAGES} pages. Please reduce the length of your CV and try again."}
-                    )
-            except Exception as e:
-                # If there's an error counting pages, log it but continue processing
-                logger.error(f"Error counting PDF pages: {str(e)}")
+        # Same CV in a different file (re-export, DOCX instead of PDF)
+        content_key = text_key(text)
+        cv_info = await run_io(lookup_cv_info, content_key)
+        if cv_info is not None:
+            await run_io(store_cv_info, [upload_key], cv_info)
+            match = "text"
+        else:
+            # Hand the text straight to the extractor (a blocking LLM call)
+            cv_info = await run_io(process_cv_text, text)
+            await run_io(store_cv_info, [upload_key, content_key], cv_info)
+            match = None
 
-        # Process the CV file
-        cv_info = process_cv(temp_file_path)
+        record_compaction(text_stats)
+        if "error" not in cv_info:
+            cv_info["textCompaction"] = text_stats
+            mark_cached(cv_info, match)
 
         # Return all extracted information directly
         return cv_info
 
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         # Return a properly formatted error
         return JSONResponse(
@@ -67,10 +78,43 @@ async def upload_cv(file: UploadFile = File(...)):
             content={"detail": f"Error processing request: {str(e)}"}
         )
 
-    finally:
-        # Always clean up the temporary file in a finally block
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception as e:
-                logger.error(f"Error removing temporary file: {str(e)}")
\ No newline at end of file
+
+@router.post("/batch")
+async def upload_cv_batch(files: List[UploadFile] = File(...)):
+    """
+    Screen many CVs in one request (PDF/DOCX files and/or zip archives of them).
+
+    Results are streamed as NDJSON, one line per CV as soon as it is done,
+    followed by a summary line. A file that can't be processed gets an error
+    line instead of failing the batch.
+    """
+    if len(files) > CV_BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"Batch contains {len(files)} files, the limit is {CV_BATCH_MAX_FILES}")
+
+    # Sizes are checked while reading, so an oversized upload is never held in memory
+    uploads = []
+    remaining = CV_BATCH_MAX_TOTAL_BYTES
+    for i, file in enumerate(files):
+        filename = file.filename or f"file-{i}"
+        is_zip = filename.lower().endswith('.zip')
+        limit = remaining if is_zip else min(CV_BATCH_MAX_FILE_BYTES, remaining)
+        content = await read_upload(file, limit)
+        if content is None and limit == remaining:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {CV_BATCH_MAX_TOTAL_BYTES} bytes")
+        uploads.append((filename, content))
+        remaining -= len(content or b"")
+    try:
+        items = await run_io(expand_uploads, uploads)
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No CV files found in the upload")
+
+    return StreamingResponse(
+        CVBatch(items).ndjson(),
+        media_type="application/x-ndjson",
+        headers={"X-Batch-Size": str(len(items))}
+    )
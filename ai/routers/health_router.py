@@ -1,8 +1,24 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
+from utils.model_registry import model_registry
 
 router = APIRouter(tags=["Health"])
 
 @router.get("/health")
-def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
\ No newline at end of file
+async def health_check():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness: models have finished loading and requests won't wait on a cold start"""
+    ready = model_registry.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "loading",
+            "timestamp": datetime.now().isoformat(),
+            "models": model_registry.status()
+        }
+    )
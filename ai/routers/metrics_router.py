@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+from datetime import datetime
+from utils.db import get_db_pool_stats
+from utils.model_registry import model_registry
+from utils.embedding_cache import get_embedding_cache_stats
+from utils.executor import get_executor_stats
+from utils.micro_batcher import get_batcher_stats
+from report.cache import report_cache
+from report.query_planner import get_report_query_timings
+from report.jobs import insight_jobs
+from utils.completion_cache import get_completion_cache_stats
+from kairo.helper import sql_cache
+from utils.rate_limiter import get_rate_limiter_stats
+from cv_screening.text_compaction import get_compaction_stats
+from cv_screening.result_cache import get_cv_result_cache_stats
+
+router = APIRouter(tags=["Health"])
+
+@router.get("/metrics")
+async def metrics():
+    """Runtime metrics for connection pools and caches"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "db_pool": get_db_pool_stats(),
+        "executors": get_executor_stats(),
+        "models": model_registry.status(),
+        "embedding_caches": get_embedding_cache_stats(),
+        "micro_batchers": get_batcher_stats(),
+        "report_cache": report_cache.stats(),
+        "report_queries": get_report_query_timings(),
+        "report_jobs": insight_jobs.stats(),
+        "llm_cache": get_completion_cache_stats(),
+        "sql_semantic_cache": sql_cache.stats(),
+        "rate_limiters": get_rate_limiter_stats(),
+        "cv_text_compaction": get_compaction_stats(),
+        "cv_result_cache": get_cv_result_cache_stats()
+    }
@@ -1130,14 +1130,19 @@
 #             return MarkdownResponse(content=error_content)
 
 
-from fastapi import APIRouter, Form, Query
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi import APIRouter, Form, Query, HTTPException
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from models.query import QueryReport
 from utils.responses import MarkdownResponse
-from utils.db import get_db_connection, get_db_cursor
-from kairo.helper import natural_language_to_sql, system_prompt, groq_client
+from utils.db import run_with_connection
+from utils.executor import run_io, PoolSaturatedError
+from kairo.helper import resolve_sql, sql_cache, system_prompt
+from kairo.streaming import QueryStream, STREAM_MEDIA_TYPES, fetch_query_rows, format_cell
+from kairo.profiler import profile_rows, describe_profile
+from kairo.pushdown import pushdown_profile
+from utils.llm_gateway import SQL_MODEL, complete
 from utils.html_formatter import add_report_styling
-from datetime import datetime, date, time
 import logging
 from typing import Optional
 import statistics
@@ -1153,11 +1158,16 @@ class QueryRequest(BaseModel):
     generate_report: bool = False
     format: str = "html"  # "markdown" or "html"
 
+def execute_sql(conn, sql_query):
+    """Execute a query on the given connection with the row cap and statement timeout"""
+    return fetch_query_rows(conn, sql_query)
+
 @router.post("/query")
 async def process_query(
     query: str = Form(...),
     generate_report: bool = Form(False),
-    format: str = Form("html")  # Options: "markdown" or "html"
+    format: str = Form("html"),  # Options: "markdown" or "html"
+    stats_source: str = Form("python")  # "database" computes report statistics in Postgres
 ):
     """
     Process a natural language query, execute it against the database,
@@ -1167,21 +1177,29 @@ async def process_query(
         query: Natural language query string
         generate_report: Whether to generate an analytical report based on results
         format: Response format - "markdown" or "html"
+        stats_source: "python" profiles the fetched rows; "database" has Postgres
+            compute the statistics and returns only a sample of rows
 
     Returns:
         JSONResponse with queryResponse and queryReport fields
     """
     try:
-        # Convert natural language to SQL
-        sql_query = natural_language_to_sql(query)
+        # Convert natural language to SQL (cache lookup plus a blocking Groq call, so run it in the I/O pool)
+        sql_query, from_cache = await run_io(resolve_sql, query)
 
-        # Execute the query
-        conn = get_db_connection()
-        cursor = get_db_cursor(conn)
-        
+        # Statistics pushed down to Postgres only pay off when a report is wanted
+        pushdown = generate_report and stats_source == "database"
+        total_rows = None
+
+        # Execute the query on a pooled connection without blocking the event loop
         try:
-            cursor.execute(sql_query)
-            data = cursor.fetchall()
+            if pushdown:
+                headers, data, total_rows, data_summary = await run_with_connection(pushdown_profile, sql_query)
+                truncated = total_rows > len(data)
+            else:
+                headers, data, truncated = await run_with_connection(execute_sql, sql_query)
+        except PoolSaturatedError:
+            raise
         except Exception as e:
             error_content = f"""
 # Error
@@ -1201,8 +1219,13 @@ async def process_query(
             }
             return JSONResponse(content=response_data)
 
-        # Initialize markdown content with query results
-        markdown_content = f"""
+        # The SQL ran, so similar questions can reuse it
+        if not from_cache:
+            # Embedding the question (and loading the model when cold) blocks, so it runs in a worker
+            await run_io(sql_cache.store, query, sql_query)
+
+        # Initialize markdown content with query results (parts are joined once at the end)
+        markdown_parts = [f"""
 # Query Results
 
 ## SQL Query
@@ -1211,80 +1234,38 @@ async def process_query(
 ```
 
 ## Results
-"""
+"""]
 
-        data_summary = {}
+        if not pushdown:
+            data_summary = {}
         result_count = 0
         report_html = ""
         
         # Only proceed if we have data
         if data and len(data) > 0:
-            result_count = len(data)
-            # Get column headers from first row
-            headers = list(data[0].keys())
+            result_count = len(data) if total_rows is None else total_rows
 
             # Create markdown table header
-            markdown_content += "| " + " | ".join(headers) + " |\n"
-            markdown_content += "| " + " | ".join(["---" for _ in headers]) + " |\n"
-
-            # Prepare data for summary if report generation is requested
-            if generate_report:
-                data_summary = {
-                    "columnTypes": {},
-                    "samplesPerColumn": {}
-                }
-                
-                # Initialize data structures for column analysis
-                for header in headers:
-                    data_summary["samplesPerColumn"][header] = []
-                    
-                    # Detect column type from first non-null value
-                    column_type = "string"  # default
-                    for row in data:
-                        if row[header] is not None:
-                            if isinstance(row[header], (int, float)):
-                                column_type = "number"
-                                break
-                            elif isinstance(row[header], (datetime, date, time)):
-                                column_type = "date"
-                                break
-                    
-                    data_summary["columnTypes"][header] = column_type
-                    
-                    # For numeric columns, collect values for statistics
-                    if column_type == "number":
-                        values = [row[header] for row in data if row[header] is not None]
-                        if values:
-                            data_summary[f"{header}_min"] = min(values)
-                            data_summary[f"{header}_max"] = max(values)
-                            data_summary[f"{header}_avg"] = sum(values) / len(values)
+            markdown_parts.append("| " + " | ".join(headers) + " |\n")
+            markdown_parts.append("| " + " | ".join(["---" for _ in headers]) + " |\n")
+
+            # Profile every column in one pass for the report prompt
+            if generate_report and not pushdown:
+                data_summary = await run_io(profile_rows, headers, data)
 
             # Add data rows
             for row in data:
-                row_values = []
-                for header in headers:
-                    value = row[header]
-                    
-                    # For report generation, collect sample values
-                    if generate_report and header in data_summary["samplesPerColumn"] and len(data_summary["samplesPerColumn"][header]) < 10 and value is not None:
-                        if value not in data_summary["samplesPerColumn"][header]:
-                            data_summary["samplesPerColumn"][header].append(value)
-                    
-                    # Format value for markdown display
-                    if value is None:
-                        formatted_value = "NULL"
-                    elif isinstance(value, (datetime, date, time)):
-                        formatted_value = value.isoformat()
-                    else:
-                        formatted_value = str(value).replace("|", "\\|")  # Escape pipe characters
-                    
-                    row_values.append(formatted_value)
-
-                markdown_content += "| " + " | ".join(row_values) + " |\n"
-
-            markdown_content += f"\n*Total Results: {len(data)}*"
+                # Format values for markdown display
+                markdown_parts.append("| " + " | ".join(format_cell(value) for value in row) + " |\n")
+
+            if total_rows is not None and truncated:
+                markdown_parts.append(f"\n*Showing the first {len(data)} of {total_rows} results*")
+            elif truncated:
+                markdown_parts.append(f"\n*Showing the first {len(data)} results (row limit reached)*")
+            else:
+                markdown_parts.append(f"\n*Total Results: {len(data)}*")
         else:
-            markdown_content += "\n*No results found*"
+            markdown_parts.append("\n*No results found*")
             result_count = 0
 
         # Generate report if requested and we have data
@@ -1302,27 +1283,7 @@ Data Summary:
 """
 
                 # Add column information to the prompt
-                column_types = data_summary.get('columnTypes', {})
-                for column, type_name in column_types.items():
-                    report_prompt += f"- Column: {column} (Type: {type_name})\n"
-
-                    # Add statistical info for number columns
-                    if type_name == 'number':
-                        min_val = data_summary.get(f'{column}_min', 'N/A')
-                        max_val = data_summary.get(f'{column}_max', 'N/A')
-                        avg_val = data_summary.get(f'{column}_avg', 'N/A')
-                        if avg_val != 'N/A':
-                            avg_val = round(avg_val, 2)
-
-                        report_prompt += f"  - Min: {min_val}, Max: {max_val}, Average: {avg_val}\n"
-
-                    # Add sample values
-                    samples = data_summary.get('samplesPerColumn', {}).get(column, [])
-                    if samples:
-                        samples_str = ", ".join([str(s) for s in samples[:5]])
-                        if len(samples) > 5:
-                            samples_str += "..."
-                        report_prompt += f"  - Sample values: {samples_str}\n"
+                report_prompt += describe_profile(data_summary)
 
                 report_prompt += """
 Based on the query and data summary above, create a professional report with the following sections:
@@ -1337,26 +1298,14 @@ Format the report with Markdown headings and bullet points where appropriate to
 """
 
                 # Generate a report using Groq
-                chat_completion = groq_client.chat.completions.create(
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": report_prompt,
-                        }
-                    ],
-                    model="gemma2-9b-it",
-                )
-
-                report = chat_completion.choices[0].message.content
+                report = await run_io(complete, SQL_MODEL, report_prompt, system_prompt=system_prompt)
                 
                 # Convert report to HTML separately
                 report_html = markdown2.markdown(report, extras=["tables", "fenced-code-blocks"])
                 report_html = add_report_styling(report_html)
                 
+            except PoolSaturatedError:
+                raise
             except Exception as e:
                 report_error = f"""
 # Report Generation Error
@@ -1366,11 +1315,8 @@ An error occurred while generating the report: {str(e)}
                 report_html = markdown2.markdown(report_error, extras=["tables", "fenced-code-blocks"])
                 report_html = add_report_styling(report_html)
 
-        cursor.close()
-        conn.close()
-
         # Convert the main content to HTML
-        query_response_html = markdown2.markdown(markdown_content, extras=["tables", "fenced-code-blocks"])
+        query_response_html = markdown2.markdown("".join(markdown_parts), extras=["tables", "fenced-code-blocks"])
         query_response_html = add_report_styling(query_response_html)
         
         # Prepare the response in the requested JSON format
@@ -1381,6 +1327,8 @@ An error occurred while generating the report: {str(e)}
         
         return JSONResponse(content=response_data)
 
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         error_content = f"""
 # Error
@@ -1395,4 +1343,49 @@ An error occurred while processing your query: {str(e)}
             "queryReport": ""
         }
         
-        return JSONResponse(content=response_data)
\ No newline at end of file
+        return JSONResponse(content=response_data)
+
+
+@router.post("/query/stream")
+async def stream_query(
+    query: str = Form(...),
+    format: str = Form("html")  # Options: "html", "csv" or "ndjson"
+):
+    """
+    Run a natural language query and stream the rows as they are fetched from a
+    server-side cursor, for result sets too large to buffer. The row cap and
+    statement timeout of /query apply.
+    """
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(STREAM_MEDIA_TYPES)}")
+
+    try:
+        sql_query, from_cache = await run_io(resolve_sql, query)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Could not generate SQL: {str(e)}")
+
+    # Execute and fetch the first batch up front so SQL errors get a proper status code
+    try:
+        stream = await run_io(QueryStream(sql_query).open)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"SQL Error: {str(e)}")
+
+    # The connection goes back to the pool when the body is done, and also if the
+    # body never starts (client gone, or a failure below); close() is idempotent
+    try:
+        if not from_cache:
+            await run_io(sql_cache.store, query, sql_query)
+
+        return StreamingResponse(
+            stream.chunks(format),
+            media_type=STREAM_MEDIA_TYPES[format],
+            headers={"X-Row-Limit": str(stream.row_cap)},
+            background=BackgroundTask(stream.close)
+        )
+    except BaseException:
+        stream.close()
+        raise
@@ -7,12 +7,13 @@ from utils.profiles import format_profile
 from smart_match.predict import match_jobs_to_applicant, df
 from nsp_retention.nsp_analyzer import NSPAnalyzer, generate_recommendations, generate_report
 from nsp_retention.nsp_models import ReportResponse
-from config.settings import api_key
 from dropoff_final.predict import DropoffPredictor, RawCandidateData, PredictionResult
 from typing import List, Dict, Any
 from pydantic import BaseModel
 import os
 import logging
+from utils.model_registry import model_registry
+from utils.executor import run_io, run_inference
 
 router = APIRouter(tags=["Recruitment"])
 logger = logging.getLogger(__name__)
@@ -31,16 +32,25 @@ REQUIRED_FIELDS = [
 ]
 
 
-# Initialize the updated dropoff predictor.
-try:
-    # Adjust the path if necessary.
-    predictor = DropoffPredictor(os.path.join('dropoff_final', 'best_dropoff_model.pkl'))
-except Exception as e:
-    logger.error(f"Failed to initialize predictor: {str(e)}")
-    raise RuntimeError(f"Failed to initialize predictor: {str(e)}")
+# The dropoff predictor is loaded on first use or by the startup warm-up
+model_registry.register(
+    "dropoff_predictor",
+    lambda: DropoffPredictor(os.path.join('dropoff_final', 'best_dropoff_model.pkl'))
+)
+
+
+def get_dropoff_predictor():
+    try:
+        return model_registry.get("dropoff_predictor")
+    except Exception as e:
+        raise RuntimeError(f"Failed to initialize predictor: {str(e)}")
 
 @router.post("/predict-match")
-def match_job_endpoint(request: JobRequest):
+async def match_job_endpoint(request: JobRequest):
+    return await run_inference(match_job, request)
+
+
+def match_job(request: JobRequest):
     try:
         # Get formatted profile with fallback for missing values
         profile_str = format_profile(request.profile)
@@ -57,7 +67,8 @@ def match_job_endpoint(request: JobRequest):
         return match_jobs_to_applicant(
             profile_str,
             request.applied_position,
-            df
+            df,
+            top_k=request.top_k or 3
         )
     except HTTPException:
         raise  # Re-raise HTTP exceptions
@@ -67,10 +78,15 @@ def match_job_endpoint(request: JobRequest):
 
 @router.post("/report", response_model=ReportResponse)
 async def generate_report_endpoint(input_data: NSPDataDirectInput):
+    # Analysis plus a blocking LLM call, run in the I/O pool
+    return await run_io(generate_nsp_report, input_data)
+
+
+def generate_nsp_report(input_data: NSPDataDirectInput):
     try:
         analyzer = NSPAnalyzer(pd.DataFrame(input_data.records))
         subject_outcomes = analyzer.analyze_hiring_success()
-        recommendations = generate_recommendations(subject_outcomes, api_key)
+        recommendations = generate_recommendations(subject_outcomes)
         report_markdown = generate_report(subject_outcomes, recommendations)
         return ReportResponse(report_markdown=report_markdown, report_html=report_markdown)
     except Exception as e:
@@ -80,7 +96,11 @@ async def generate_report_endpoint(input_data: NSPDataDirectInput):
 
 
 @router.post("/predict-dropoff", response_model=List[PredictionResult])
-def predict_dropoff_endpoint(request: DropoffRequest):
+async def predict_dropoff_endpoint(request: DropoffRequest):
+    return await run_inference(predict_dropoff, request)
+
+
+def predict_dropoff(request: DropoffRequest):
     try:
         validated_applicants = []
         errors = []
@@ -102,7 +122,7 @@ def predict_dropoff_endpoint(request: DropoffRequest):
         if errors:
             raise HTTPException(status_code=400, detail=errors)
 
-        predictions = predictor.predict_from_raw(validated_applicants)
+        predictions = get_dropoff_predictor().predict_from_raw(validated_applicants)
         return predictions
 
     except HTTPException:
@@ -417,85 +417,159 @@
 #             styled_html = add_report_styling(html_basic)
 #             return HTMLResponse(content=styled_html)
 
-from fastapi import APIRouter, Query, HTTPException
-from fastapi.responses import Response, HTMLResponse
+from fastapi import APIRouter, Query, HTTPException, Request
+from fastapi.responses import Response, HTMLResponse, StreamingResponse
 import markdown
 import logging
 import json
+import asyncio
 from datetime import datetime
 from utils.responses import FormatType
-from utils.db import get_db_connection, get_db_cursor
+from utils.db import db_connection, get_db_cursor
+from utils.executor import run_io, PoolSaturatedError
 from utils.data import DecimalEncoder
 from utils.html_formatter import add_report_styling
-from report.llm_helpers import generate_employee_insights, generate_recruitment_insights
+from report.llm_helpers import (
+    generate_employee_insights, generate_recruitment_insights,
+    stream_employee_insights, stream_recruitment_insights
+)
+from report.jobs import insight_jobs
+from report.cache import report_cache, etag_matches
+from report.query_planner import run_report_queries
 
 router = APIRouter(tags=["Reports"], prefix="/api")
 logger = logging.getLogger(__name__)
 
-def generate_employees_report():
-    """Generate a report for employees table"""
+# Report sections: name -> (SQL, fetch "one" row or "all" rows)
+EMPLOYEE_REPORT_QUERIES = {
+    # Get summary data
+    "summary": ("""
+        SELECT 
+            COUNT(*) as total_employees,
+            COUNT(*) FILTER (WHERE "endDate" IS NULL) as active_employees,
+            COUNT(*) FILTER (WHERE "endDate" IS NOT NULL) as former_employees,
+            AVG(EXTRACT(EPOCH FROM (CURRENT_DATE - "hireDate")) / 86400 / 365)::numeric(10,2) as avg_tenure_years,
+            COUNT(DISTINCT "departmentId") as departments,
+            AVG("vacationDaysBalance")::numeric(10,2) as avg_vacation_balance
+        FROM employees
+    """, "one"),
+    # Get employee types
+    "employee_types": ("""
+        SELECT "employeeType", COUNT(*) as count
+        FROM employees
+        GROUP BY "employeeType"
+        ORDER BY count DESC
+    """, "all"),
+    # Get department distribution
+    "departments": ("""
+        SELECT 
+            CASE 
+                WHEN d.name IS NULL THEN 'Not Assigned' 
+                ELSE d.name 
+            END as department_name, 
+            COUNT(e.*) as employee_count
+        FROM employees e
+        LEFT JOIN departments d ON e."departmentId" = d.id
+        GROUP BY department_name
+        ORDER BY employee_count DESC
+    """, "all"),
+    # Get recent hires
+    "recent_hires": ("""
+        SELECT "firstName", "lastName", "position", "hireDate"
+        FROM employees
+        WHERE "endDate" IS NULL
+        ORDER BY "hireDate" DESC
+        LIMIT 5
+    """, "all"),
+    # Get skill distribution (for LLM analysis)
+    "skills": ("""
+        SELECT "skills", COUNT(*) as count
+        FROM employees
+        WHERE "skills" IS NOT NULL
+        GROUP BY "skills"
+        ORDER BY count DESC
+        LIMIT 10
+    """, "all")
+}
+
+RECRUITMENT_REPORT_QUERIES = {
+    # Distinct currentStatus values, logged to help diagnose status mismatches
+    "available_statuses": ("""
+        SELECT DISTINCT "currentStatus"::text 
+        FROM recruitments
+        ORDER BY "currentStatus"::text
+    """, "all"),
+    # Get summary data - Cast to text for comparison
+    "summary": ("""
+        SELECT 
+            COUNT(*) as total_candidates,
+            COUNT(*) FILTER (WHERE "currentStatus"::text = 'HIRED') as hired_candidates,
+            COUNT(*) FILTER (WHERE "currentStatus"::text = 'REJECTED') as rejected_candidates,
+            COUNT(*) FILTER (WHERE "currentStatus"::text = 'IN_PROCESS') as in_process,
+            COUNT(DISTINCT "position") as positions,
+            COUNT(DISTINCT "source") as sources
+        FROM recruitments
+    """, "one"),
+    # Get positions
+    "positions": ("""
+        SELECT "position", COUNT(*) as count
+        FROM recruitments
+        GROUP BY "position"
+        ORDER BY count DESC
+        LIMIT 10
+    """, "all"),
+    # Get recruitment sources
+    "sources": ("""
+        SELECT "source", COUNT(*) as count
+        FROM recruitments
+        GROUP BY "source"
+        ORDER BY count DESC
+    """, "all"),
+    # Get recent applications
+    "recent_applications": ("""
+        SELECT "name", "position", "currentStatus"::text, "createdAt"
+        FROM recruitments
+        ORDER BY "createdAt" DESC
+        LIMIT 5
+    """, "all"),
+    # Get status distribution
+    "status_distribution": ("""
+        SELECT "currentStatus"::text, COUNT(*) as count
+        FROM recruitments
+        GROUP BY "currentStatus"::text
+        ORDER BY count DESC
+    """, "all"),
+    # Get time-to-hire data
+    "time_to_hire": ("""
+        SELECT 
+            AVG(EXTRACT(EPOCH FROM ("updatedAt" - "createdAt")) / 86400)::numeric(10,2) as avg_days_to_process
+        FROM recruitments
+        WHERE "currentStatus"::text = 'HIRED'
+    """, "one"),
+    # Get rejection reasons
+    "rejection_reasons": ("""
+        SELECT "failReason", COUNT(*) as count
+        FROM recruitments
+        WHERE "failReason" IS NOT NULL AND "currentStatus"::text = 'REJECTED'
+        GROUP BY "failReason"
+        ORDER BY count DESC
+        LIMIT 5
+    """, "all")
+}
+
+
+def build_employees_report():
+    """Numeric sections of the employee report and the data summary the LLM analyses"""
     try:
-        conn = get_db_connection()
-        cursor = get_db_cursor(conn)
-        
-        # Get summary data
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_employees,
-                COUNT(*) FILTER (WHERE "endDate" IS NULL) as active_employees,
-                COUNT(*) FILTER (WHERE "endDate" IS NOT NULL) as former_employees,
-                AVG(EXTRACT(EPOCH FROM (CURRENT_DATE - "hireDate")) / 86400 / 365)::numeric(10,2) as avg_tenure_years,
-                COUNT(DISTINCT "departmentId") as departments,
-                AVG("vacationDaysBalance")::numeric(10,2) as avg_vacation_balance
-            FROM employees
-        """)
-        summary = cursor.fetchone()
-        
-        # Get employee types
-        cursor.execute("""
-            SELECT "employeeType", COUNT(*) as count
-            FROM employees
-            GROUP BY "employeeType"
-            ORDER BY count DESC
-        """)
-        employee_types = cursor.fetchall()
-        
-        # Get department distribution
-        cursor.execute("""
-            SELECT 
-                CASE 
-                    WHEN d.name IS NULL THEN 'Not Assigned' 
-                    ELSE d.name 
-                END as department_name, 
-                COUNT(e.*) as employee_count
-            FROM employees e
-            LEFT JOIN departments d ON e."departmentId" = d.id
-            GROUP BY department_name
-            ORDER BY employee_count DESC
-        """)
-        departments = cursor.fetchall()
-        
-        # Get recent hires
-        cursor.execute("""
-            SELECT "firstName", "lastName", "position", "hireDate"
-            FROM employees
-            WHERE "endDate" IS NULL
-            ORDER BY "hireDate" DESC
-            LIMIT 5
-        """)
-        recent_hires = cursor.fetchall()
-
-        # Get skill distribution (for LLM analysis)
-        cursor.execute("""
-            SELECT "skills", COUNT(*) as count
-            FROM employees
-            WHERE "skills" IS NOT NULL
-            GROUP BY "skills"
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        skills = cursor.fetchall()
-        
+        # Independent aggregates run in parallel, each on its own pooled connection,
+        # and no connection is held during the LLM call
+        results = run_report_queries("employees", EMPLOYEE_REPORT_QUERIES)
+        summary = results["summary"]
+        employee_types = results["employee_types"]
+        departments = results["departments"]
+        recent_hires = results["recent_hires"]
+        skills = results["skills"]
+
         # Current date and time for report
         current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -554,125 +628,30 @@ def generate_employees_report():
             "skills": [dict(skill) for skill in skills]
         }
         
-        # Add LLM insights - Use the DecimalEncoder for JSON serialization
-        llm_insights = generate_employee_insights(
-            json.dumps(employee_data_for_llm, cls=DecimalEncoder)
-        )
-        
-        # Format AI insights to ensure proper styling
-        formatted_insights = llm_insights.replace("# ", "## ").replace("## Key", "### Key")
-        
-        markdown_content += f"""
-
----
-
-<div class="ai-insights">
-
-# AI-Powered HR Insights
-
-{formatted_insights}
-
-</div>
-"""
-
-        cursor.close()
-        conn.close()
-        
-        return markdown_content
+        # The LLM gets the same data, serialized with the DecimalEncoder
+        return markdown_content, json.dumps(employee_data_for_llm, cls=DecimalEncoder)
         
     except Exception as e:
+        # Raised rather than rendered so error pages never end up in the report cache
         logger.error(f"Error generating employees report: {str(e)}")
-        return f"""
-# Error Generating Employee Report
-
-An error occurred while generating the employee report: {str(e)}
-"""
+        raise
 
-def generate_recruitment_report():
-    """Generate a report for recruitments table"""
+def build_recruitment_report():
+    """Numeric sections of the recruitment report and the data summary the LLM analyses"""
     try:
-        conn = get_db_connection()
-        cursor = get_db_cursor(conn)
-        
-        # First, let's check the values in the currentStatus field to understand the type
-        cursor.execute("""
-            SELECT DISTINCT "currentStatus"::text 
-            FROM recruitments
-            ORDER BY "currentStatus"::text
-        """)
-        available_statuses = cursor.fetchall()
+        # Independent aggregates run in parallel, each on its own pooled connection,
+        # and no connection is held during the LLM call
+        results = run_report_queries("recruitment", RECRUITMENT_REPORT_QUERIES)
+        available_statuses = results["available_statuses"]
+        summary = results["summary"]
+        positions = results["positions"]
+        sources = results["sources"]
+        recent_applications = results["recent_applications"]
+        status_distribution = results["status_distribution"]
+        time_to_hire = results["time_to_hire"]
+        rejection_reasons = results["rejection_reasons"]
         logger.info(f"Available status values: {[s['currentStatus'] for s in available_statuses]}")
-        
-        # Get summary data - Cast to text for comparison
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_candidates,
-                COUNT(*) FILTER (WHERE "currentStatus"::text = 'HIRED') as hired_candidates,
-                COUNT(*) FILTER (WHERE "currentStatus"::text = 'REJECTED') as rejected_candidates,
-                COUNT(*) FILTER (WHERE "currentStatus"::text = 'IN_PROCESS') as in_process,
-                COUNT(DISTINCT "position") as positions,
-                COUNT(DISTINCT "source") as sources
-            FROM recruitments
-        """)
-        summary = cursor.fetchone()
-        
-        # Get positions
-        cursor.execute("""
-            SELECT "position", COUNT(*) as count
-            FROM recruitments
-            GROUP BY "position"
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        positions = cursor.fetchall()
-        
-        # Get recruitment sources
-        cursor.execute("""
-            SELECT "source", COUNT(*) as count
-            FROM recruitments
-            GROUP BY "source"
-            ORDER BY count DESC
-        """)
-        sources = cursor.fetchall()
-        
-        # Get recent applications
-        cursor.execute("""
-            SELECT "name", "position", "currentStatus"::text, "createdAt"
-            FROM recruitments
-            ORDER BY "createdAt" DESC
-            LIMIT 5
-        """)
-        recent_applications = cursor.fetchall()
-        
-        # Get status distribution
-        cursor.execute("""
-            SELECT "currentStatus"::text, COUNT(*) as count
-            FROM recruitments
-            GROUP BY "currentStatus"::text
-            ORDER BY count DESC
-        """)
-        status_distribution = cursor.fetchall()
-        
-        # Get time-to-hire data
-        cursor.execute("""
-            SELECT 
-                AVG(EXTRACT(EPOCH FROM ("updatedAt" - "createdAt")) / 86400)::numeric(10,2) as avg_days_to_process
-            FROM recruitments
-            WHERE "currentStatus"::text = 'HIRED'
-        """)
-        time_to_hire = cursor.fetchone()
-        
-        # Get rejection reasons
-        cursor.execute("""
-            SELECT "failReason", COUNT(*) as count
-            FROM recruitments
-            WHERE "failReason" IS NOT NULL AND "currentStatus"::text = 'REJECTED'
-            GROUP BY "failReason"
-            ORDER BY count DESC
-            LIMIT 5
-        """)
-        rejection_reasons = cursor.fetchall()
-        
+
         # Current date and time for report
         current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -750,94 +729,224 @@ def generate_recruitment_report():
             "recent_applications": [dict(app) for app in recent_applications]
         }
         
-        # Add LLM insights - Use the DecimalEncoder for JSON serialization
-        llm_insights = generate_recruitment_insights(
-            json.dumps(recruitment_data_for_llm, cls=DecimalEncoder)
-        )
+        # The LLM gets the same data, serialized with the DecimalEncoder
+        return markdown_content, json.dumps(recruitment_data_for_llm, cls=DecimalEncoder)
         
-        # Format AI insights to ensure proper styling
-        formatted_insights = llm_insights.replace("# ", "## ").replace("## Key", "### Key")
-        
-        markdown_content += f"""
+    except Exception as e:
+        # Raised rather than rendered so error pages never end up in the report cache
+        logger.error(f"Error generating recruitment report: {str(e)}")
+        raise
+
+
+def format_insights_section(title, llm_insights):
+    # Format AI insights to ensure proper styling
+    formatted_insights = llm_insights.replace("# ", "## ").replace("## Key", "### Key")
+    return f"""
 
 ---
 
 <div class="ai-insights">
 
-# AI-Powered Recruitment Insights
+# {title}
 
 {formatted_insights}
 
 </div>
 """
 
-        cursor.close()
-        conn.close()
-        
+
+# The cached generators raise on LLM failures too, so a transient error page is never cached and served as a report
+def generate_employees_report():
+    """Generate a report for employees table"""
+    markdown_content, llm_data = build_employees_report()
+    return markdown_content + format_insights_section(
+        "AI-Powered HR Insights", generate_employee_insights(llm_data, raise_errors=True))
+
+
+def generate_recruitment_report():
+    """Generate a report for recruitments table"""
+    markdown_content, llm_data = build_recruitment_report()
+    return markdown_content + format_insights_section(
+        "AI-Powered Recruitment Insights", generate_recruitment_insights(llm_data, raise_errors=True))
+
+
+# Report type -> (numeric sections builder, insights section title, insights streamer)
+REPORT_TYPES = {
+    "employees": (build_employees_report, "AI-Powered HR Insights", stream_employee_insights),
+    "recruitment": (build_recruitment_report, "AI-Powered Recruitment Insights", stream_recruitment_insights)
+}
+
+
+def fetch_fingerprint(sql):
+    """Run a single-row data-version query and join its values into one string"""
+    with db_connection() as conn:
+        cursor = get_db_cursor(conn)
+        try:
+            cursor.execute(sql)
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    return "|".join(str(value) for value in row)
+
+
+def employees_fingerprint():
+    """Changes whenever employees or departments are added, removed or updated"""
+    # employees has no updatedAt column, so combine counts with the columns that change most
+    return fetch_fingerprint("""
+        SELECT
+            COUNT(*),
+            MAX(id),
+            MAX("hireDate"),
+            MAX("endDate"),
+            COUNT("endDate"),
+            SUM("vacationDaysBalance"),
+            (SELECT COUNT(*) FROM departments),
+            (SELECT MAX(id) FROM departments)
+        FROM employees
+    """)
+
+
+def recruitment_fingerprint():
+    """Changes whenever a recruitment is created or updated"""
+    return fetch_fingerprint("""
+        SELECT COUNT(*), MAX("updatedAt"), MAX("createdAt")
+        FROM recruitments
+    """)
+
+
+report_cache.register("employees", generate_employees_report, employees_fingerprint)
+report_cache.register("recruitment", generate_recruitment_report, recruitment_fingerprint)
+
+
+def render_report(markdown_content, format):
+    if format == FormatType.markdown:
         return markdown_content
-        
-    except Exception as e:
-        logger.error(f"Error generating recruitment report: {str(e)}")
-        return f"""
-# Error Generating Recruitment Report
+    # Convert to HTML with proper styling
+    html_basic = markdown.markdown(markdown_content, extensions=['tables'])
+    return add_report_styling(html_basic)
 
-An error occurred while generating the recruitment report: {str(e)}
-"""
 
-@router.get("/employees")
-async def employees_report(format: FormatType = Query(FormatType.html, description="Output format (html or markdown)")):
+async def serve_report(request: Request, report_type: str, format: FormatType, label: str):
+    """Serve a report from the cache, answering 304 when the client's ETag is current"""
     try:
-        report_content = generate_employees_report()
-        
-        if format == FormatType.markdown:
-            # Return raw markdown
-            return Response(content=report_content, media_type="text/markdown")
-        else:
-            # Convert to HTML with proper styling
-            html_basic = markdown.markdown(report_content, extensions=['tables'])
-            styled_html = add_report_styling(html_basic)
-            return HTMLResponse(content=styled_html)
+        entry, cache_status = await report_cache.get(report_type)
+        content, etag = entry.render(format, render_report)
+    except PoolSaturatedError:
+        raise
     except Exception as e:
-        logger.error(f"Route error in employees_report: {str(e)}")
+        logger.error(f"Route error in {report_type} report: {str(e)}")
         error_content = f"""
-# Error Generating Employee Report
+# Error Generating {label.title()} Report
 
-An error occurred while generating the employee report: {str(e)}
+An error occurred while generating the {label} report: {str(e)}
 
 Please check the server logs for more details.
 """
-        if format == FormatType.markdown:
-            return Response(content=error_content, media_type="text/markdown")
-        else:
-            html_basic = markdown.markdown(error_content, extensions=['tables'])
-            styled_html = add_report_styling(html_basic)
-            return HTMLResponse(content=styled_html)
+        return Response(content=render_report(error_content, format),
+                        media_type="text/markdown" if format == FormatType.markdown else "text/html")
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",  # Clients may store it but must revalidate
+        "Age": str(int(entry.age)),
+        "X-Cache": cache_status
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if format == FormatType.markdown:
+        # Return raw markdown
+        return Response(content=content, media_type="text/markdown", headers=headers)
+    return HTMLResponse(content=content, headers=headers)
+
+@router.get("/employees")
+async def employees_report(request: Request, format: FormatType = Query(FormatType.html, description="Output format (html or markdown)")):
+    return await serve_report(request, "employees", format, "employee")
 
 @router.get("/recruitment")
-async def recruitment_report(format: FormatType = Query(FormatType.html, description="Output format (html or markdown)")):
-    try:
-        report_content = generate_recruitment_report()
-        
-        if format == FormatType.markdown:
-            # Return raw markdown
-            return Response(content=report_content, media_type="text/markdown")
-        else:
-            # Convert to HTML with proper styling
-            html_basic = markdown.markdown(report_content, extensions=['tables'])
-            styled_html = add_report_styling(html_basic)
-            return HTMLResponse(content=styled_html)
-    except Exception as e:
-        logger.error(f"Route error in recruitment_report: {str(e)}")
-        error_content = f"""
-# Error Generating Recruitment Report
+async def recruitment_report(request: Request, format: FormatType = Query(FormatType.html, description="Output format (html or markdown)")):
+    return await serve_report(request, "recruitment", format, "recruitment")
 
-An error occurred while generating the recruitment report: {str(e)}
 
-Please check the server logs for more details.
-"""
-        if format == FormatType.markdown:
-            return Response(content=error_content, media_type="text/markdown")
+# Running insight job tasks
+background_jobs = set()
+
+
+@router.post("/reports/{report_type}/jobs", status_code=202)
+async def create_insights_job(report_type: str, format: FormatType = Query(FormatType.html, description="Output format (html or markdown)")):
+    """
+    Return the numeric report sections right away and start generating the
+    AI insights in the background. Poll the status URL or follow the stream
+    URL (server-sent events) for the insights.
+    """
+    if report_type not in REPORT_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown report type '{report_type}'. Available: {', '.join(REPORT_TYPES)}")
+    build_report, _, stream_insights = REPORT_TYPES[report_type]
+
+    try:
+        markdown_content, llm_data = await run_io(build_report)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating {report_type} report: {str(e)}")
+
+    job = insight_jobs.create(report_type)
+
+    async def run_job():
+        try:
+            await run_io(job.run, stream_insights, llm_data)
+        except PoolSaturatedError as e:
+            job.fail(str(e))
+
+    # Keep a reference so the task isn't garbage collected while it runs
+    task = asyncio.ensure_future(run_job())
+    background_jobs.add(task)
+    task.add_done_callback(background_jobs.discard)
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "report": render_report(markdown_content, format),
+        "status_url": f"/api/reports/jobs/{job.id}",
+        "stream_url": f"/api/reports/jobs/{job.id}/stream"
+    }
+
+
+def get_job_or_404(job_id):
+    job = insight_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@router.get("/reports/jobs/{job_id}")
+async def get_insights_job(job_id: str, format: FormatType = Query(FormatType.html, description="Output format (html or markdown)")):
+    """Status of an insights job, with the rendered insights section once it has completed"""
+    job = get_job_or_404(job_id)
+    result = job.to_dict()
+    if job.status == "completed":
+        _, title, _ = REPORT_TYPES[job.report_type]
+        result["insights_section"] = render_report(format_insights_section(title, job.text), format)
+    return result
+
+
+@router.get("/reports/jobs/{job_id}/stream")
+async def stream_insights_job(job_id: str):
+    """Server-sent events: a ``token`` event per chunk, then ``done`` or ``error``"""
+    job = get_job_or_404(job_id)
+
+    def sse(event, data):
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    async def events():
+        async for chunks, done in job.updates():
+            if not chunks and not done:
+                yield ": keepalive\n\n"
+            for chunk in chunks:
+                yield sse("token", chunk)
+        if job.status == "completed":
+            yield sse("done", {"job_id": job.id})
         else:
-            html_basic = markdown.markdown(error_content, extensions=['tables'])
-            styled_html = add_report_styling(html_basic)
-            return HTMLResponse(content=styled_html)
\ No newline at end of file
+            yield sse("error", {"job_id": job.id, "error": job.error})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
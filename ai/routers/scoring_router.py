@@ -116,18 +116,19 @@ import os
 import logging
 import traceback
 import re
-from models.profile import CandidateRequest
+from models.profile import CandidateRequest, CandidateRankingRequest
 from utils.data import clean_nan_values, load_jobs_data
 from predict_score.scoring import CandidateJobMatcher
+from utils.model_registry import model_registry
+from utils.executor import run_inference
 
 router = APIRouter(tags=["Candidate Scoring"])
 logger = logging.getLogger(__name__)
 
-# Initialize the matcher
+# Initialize the matcher (the transformer model itself loads lazily)
 matcher = CandidateJobMatcher()
 
-# Global variable to store jobs data
-JOBS_DATA = []
+JOBS_FILE = "./predict_score/job_descriptions.xlsx"
 
 # Define job title mappings for better matching
 JOB_TITLE_MAPPINGS = {
@@ -144,16 +145,66 @@ JOB_TITLE_MAPPINGS = {
     "social media marketing": ["social media", "marketing", "social media marketing", "digital marketing"]
 }
 
-# Load jobs data on module import
-try:
-    jobs_file = "./predict_score/job_descriptions.xlsx"
-    if os.path.exists(jobs_file):
-        JOBS_DATA = load_jobs_data(jobs_file)
-        logger.info(f"Loaded {len(JOBS_DATA)} jobs from {jobs_file}")
-    else:
-        logger.warning(f"Jobs data file not found: {jobs_file}")
-except Exception as e:
-    logger.error(f"Failed to load jobs data: {str(e)}")
+def load_job_descriptions():
+    """Load the jobs used for candidate scoring from job_descriptions.xlsx"""
+    if not os.path.exists(JOBS_FILE):
+        logger.warning(f"Jobs data file not found: {JOBS_FILE}")
+        return []
+    jobs = load_jobs_data(JOBS_FILE)
+    logger.info(f"Loaded {len(jobs)} jobs from {JOBS_FILE}")
+
+    # Job-side texts only change with the file, so embed them once here
+    try:
+        count = matcher.precompute_job_embeddings(jobs)
+        logger.info(f"Precomputed {count} job embeddings")
+    except Exception as e:
+        logger.warning(f"Could not precompute job embeddings, encoding on demand: {str(e)}")
+    return jobs
+
+
+# Jobs data is read on first use or by the startup warm-up, not on import,
+# and reloaded (with its embeddings) when job_descriptions.xlsx changes
+model_registry.register("job_descriptions", load_job_descriptions, path=JOBS_FILE)
+
+
+def get_jobs_data():
+    """Return the loaded jobs, or an empty list if they could not be loaded"""
+    try:
+        return model_registry.get("job_descriptions")
+    except Exception as e:
+        logger.error(f"Failed to load jobs data: {str(e)}")
+        return []
+
+
+def format_candidate(profile_data):
+    """
+    Format candidate data for the matcher as a pandas Series
+    (the matcher expects a pandas Series with an index attribute)
+    """
+    return pd.Series({
+        'Technical Skills': profile_data.technicalSkills,
+        'Soft Skills': profile_data.softSkills,
+        'Tools & Technologies': profile_data.toolsAndTechnologies,
+        'Programming Languages': profile_data.programmingLanguages,
+        'Total Years in Tech': str(profile_data.totalYearsInTech),
+        'Highest Degree': profile_data.highestDegree,
+        'Industries': profile_data.industries,
+        'Job_1_Title': profile_data.currentTitle,
+        'Job_1_Company': profile_data.currentCompany,
+    })
+
+
+def get_job_title_field(jobs_data):
+    """Name of the field that holds job titles in the jobs data, or None"""
+    title_fields = ['title', 'Title', 'job_title', 'position', 'Position', 'job title']
+    if jobs_data and len(jobs_data) > 0:
+        sample_keys = list(jobs_data[0].keys())
+        for field in title_fields:
+            if field in sample_keys:
+                return field
+        # Log available keys to help diagnose the issue
+        logger.info(f"Available job fields: {sample_keys}")
+    return None
 
 
 def find_matching_job(applied_position, job_field_name, jobs_data):
@@ -216,9 +267,14 @@ def find_matching_job(applied_position, job_field_name, jobs_data):
 @router.post("/predict-score", response_class=JSONResponse)
 async def match_applied_position(candidate_input: CandidateRequest):
     """Match a candidate with a specific applied position using JSON input"""
-    global JOBS_DATA, matcher
+    # Encoding is CPU-heavy, so score in the inference pool instead of on the event loop
+    return await run_inference(score_applied_position, candidate_input)
+
 
-    if not JOBS_DATA:
+def score_applied_position(candidate_input: CandidateRequest):
+    jobs_data = get_jobs_data()
+
+    if not jobs_data:
         raise HTTPException(
             status_code=400, detail="No jobs data available. Check if job_descriptions.xlsx exists in the directory.")
 
@@ -226,44 +282,20 @@ async def match_applied_position(candidate_input: CandidateRequest):
     profile_data = candidate_input.profile
     applied_position = candidate_input.applied_position.lower()  # Convert to lowercase for case-insensitive matching
 
-    # Format candidate data for the matcher as a pandas Series
-    # This is important because the matcher expects a pandas Series with an index attribute
-    formatted_candidate = pd.Series({
-        'Technical Skills': profile_data.technicalSkills,
-        'Soft Skills': profile_data.softSkills,
-        'Tools & Technologies': profile_data.toolsAndTechnologies,
-        'Programming Languages': profile_data.programmingLanguages,
-        'Total Years in Tech': str(profile_data.totalYearsInTech),
-        'Highest Degree': profile_data.highestDegree,
-        'Industries': profile_data.industries,
-        'Job_1_Title': profile_data.currentTitle,
-        'Job_1_Company': profile_data.currentCompany,
-    })
+    formatted_candidate = format_candidate(profile_data)
 
     try:
         # Determine the field name that contains job titles
-        title_fields = ['title', 'Title', 'job_title', 'position', 'Position', 'job title']
-        job_field_name = None
-        
-        if JOBS_DATA and len(JOBS_DATA) > 0:
-            sample_keys = list(JOBS_DATA[0].keys())
-            for field in title_fields:
-                if field in sample_keys:
-                    job_field_name = field
-                    break
-        
+        job_field_name = get_job_title_field(jobs_data)
         if not job_field_name:
-            # Log available keys to help diagnose the issue
-            if JOBS_DATA and len(JOBS_DATA) > 0:
-                logger.info(f"Available job fields: {list(JOBS_DATA[0].keys())}")
             raise ValueError("Could not identify job title field in the data")
         
         # Log available job titles for debugging
-        available_titles = [job[job_field_name] for job in JOBS_DATA]
+        available_titles = [job[job_field_name] for job in jobs_data]
         logger.info(f"Available job titles: {available_titles}")
         
         # Use enhanced job matching function
-        job_match = find_matching_job(applied_position, job_field_name, JOBS_DATA)
+        job_match = find_matching_job(applied_position, job_field_name, jobs_data)
         
         # If still no match, return appropriate error
         if job_match is None:
@@ -304,4 +336,47 @@ async def match_applied_position(candidate_input: CandidateRequest):
                 
             raise HTTPException(status_code=404, detail=error_msg)
         else:
-            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/predict-scores", response_class=JSONResponse)
+async def rank_open_positions(candidate_input: CandidateRankingRequest):
+    """Rank a candidate against every open position in one pass"""
+    return await run_inference(rank_candidate, candidate_input)
+
+
+def rank_candidate(candidate_input: CandidateRankingRequest):
+    jobs_data = get_jobs_data()
+
+    if not jobs_data:
+        raise HTTPException(
+            status_code=400, detail="No jobs data available. Check if job_descriptions.xlsx exists in the directory.")
+
+    job_field_name = get_job_title_field(jobs_data)
+    if not job_field_name:
+        raise HTTPException(status_code=500, detail="Could not identify job title field in the data")
+
+    try:
+        scores = matcher.predict_match_scores(format_candidate(candidate_input.profile), jobs_data)
+    except Exception as e:
+        logger.error(f"Error ranking candidate against open positions: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if candidate_input.top_k:
+        scores = scores[:candidate_input.top_k]
+
+    return {
+        "jobs_scored": len(jobs_data),
+        "rankings": [
+            {
+                "position": jobs_data[score["index"]][job_field_name],
+                "match_score": round(score["match_score"], 2),
+                "components": {
+                    name: round(score[name], 4)
+                    for name in ("skill_match", "experience_match", "education_match", "industry_match")
+                }
+            }
+            for score in scores
+        ]
+    }
@@ -0,0 +1,33 @@
+"""
+Build the binary job embedding store from embeddings.csv.
+
+Run from the ai/ directory whenever embeddings.csv changes:
+
+    python -m smart_match.build_index
+"""
+import logging
+from smart_match.index import (
+    EMBEDDINGS_CSV,
+    EMBEDDINGS_NPY,
+    EMBEDDINGS_META,
+    JobEmbeddingIndex,
+    file_sha256,
+    read_embeddings_csv
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_index(csv_path: str = EMBEDDINGS_CSV, npy_path: str = EMBEDDINGS_NPY, meta_path: str = EMBEDDINGS_META):
+    """Parse the CSV once and write the normalised float32 matrix plus metadata"""
+    jobs_df = read_embeddings_csv(csv_path)
+    index = JobEmbeddingIndex.from_dataframe(jobs_df)
+    index.save(npy_path, meta_path, source_sha256=file_sha256(csv_path))
+    logger.info(f"Wrote {index.embeddings.shape[0]} x {index.embeddings.shape[1]} embeddings to {npy_path}")
+    return index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    build_index()
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import logging
+import os
+from functools import lru_cache
+from rapidfuzz import fuzz
+
+logger = logging.getLogger(__name__)
+
+# Default locations of the source CSV and the binary store built from it
+EMBEDDINGS_CSV = "smart_match/embeddings.csv"
+EMBEDDINGS_NPY = "smart_match/embeddings.npy"
+EMBEDDINGS_META = "smart_match/embeddings_meta.json"
+
+# Titles whose fuzzy similarity to the applied position reaches this are excluded
+TITLE_SIMILARITY_THRESHOLD = 80
+
+
+def clean_title(filename: str) -> str:
+    """Turn an embeddings.csv filename into a display job title"""
+    return str(filename).replace(".pdf", "")
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file so the binary store can tell whether its source CSV changed"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_embeddings_csv(csv_path: str = EMBEDDINGS_CSV) -> pd.DataFrame:
+    """Read embeddings.csv, parsing each embedding string into a list of floats"""
+    df = pd.read_csv(csv_path)
+    # Embeddings are stored as JSON-compatible lists, which json parses much faster than ast
+    df["embedding"] = df["embedding"].apply(json.loads)
+    return df
+
+
+class JobEmbeddingIndex:
+    """
+    In-memory index of job description embeddings.
+
+    Holds every chunk embedding as one contiguous, L2-normalised float32 matrix
+    so scoring a profile is a single matrix-vector product. Chunks are mapped to
+    their job title, and title exclusion masks are cached per applied position.
+    """
+
+    def __init__(self, embeddings, filenames, normalized=False):
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(filenames):
+            raise ValueError("Embeddings must be a 2-D matrix with one row per filename")
+
+        if not normalized:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        self.embeddings = matrix
+        self.filenames = list(filenames)
+
+        # Per-title metadata: unique titles in first-seen order and the title of each chunk
+        title_positions = {}
+        title_ids = []
+        for filename in filenames:
+            title = clean_title(filename)
+            title_ids.append(title_positions.setdefault(title, len(title_positions)))
+        self.titles = list(title_positions)
+        self.titles_lower = [title.lower() for title in self.titles]
+        self.title_ids = np.asarray(title_ids, dtype=np.intp)
+        self.one_chunk_per_title = len(self.titles) == len(self.title_ids)
+
+        self._exclusion_masks = lru_cache(maxsize=256)(self._build_exclusion_mask)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build an index from a frame with ``filename`` and parsed ``embedding`` columns"""
+        embeddings = np.array(df["embedding"].tolist(), dtype=np.float32)
+        return cls(embeddings, df["filename"].tolist())
+
+    def save(self, npy_path: str = EMBEDDINGS_NPY, meta_path: str = EMBEDDINGS_META, source_sha256: str = None):
+        """Write the normalised matrix as .npy and the chunk titles as JSON"""
+        np.save(npy_path, self.embeddings)
+        meta = {
+            "count": int(self.embeddings.shape[0]),
+            "dim": int(self.embeddings.shape[1]),
+            "filenames": self.filenames,
+            "source_sha256": source_sha256
+        }
+        with open(meta_path, "w") as file:
+            json.dump(meta, file, indent=2)
+
+    @classmethod
+    def load(cls, npy_path: str = EMBEDDINGS_NPY, meta_path: str = EMBEDDINGS_META):
+        """Memory-map a store written by ``save``; the matrix pages are shared between workers"""
+        with open(meta_path) as file:
+            meta = json.load(file)
+        embeddings = np.load(npy_path, mmap_mode="r")
+        return cls(embeddings, meta["filenames"], normalized=True), meta
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _build_exclusion_mask(self, applied_position: str):
+        mask = np.fromiter(
+            (fuzz.partial_ratio(title, applied_position) >= TITLE_SIMILARITY_THRESHOLD
+             for title in self.titles_lower),
+            dtype=bool,
+            count=len(self.titles_lower)
+        )
+        mask.flags.writeable = False
+        return mask
+
+    def exclusion_mask(self, applied_position: str):
+        """Boolean mask of titles similar to the applied position (cached)"""
+        return self._exclusion_masks(applied_position.strip().lower())
+
+    def title_scores(self, query_embedding):
+        """Cosine similarity of the query against every title (best chunk per title)"""
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        scores = self.embeddings @ query
+        if self.one_chunk_per_title:
+            return scores
+
+        best = np.full(len(self.titles), -np.inf, dtype=np.float32)
+        np.maximum.at(best, self.title_ids, scores)
+        return best
+
+    def search(self, query_embedding, applied_position: str = "", top_k: int = 3):
+        """Return up to ``top_k`` (title, similarity) pairs, best first, excluding the applied position"""
+        scores = self.title_scores(query_embedding)
+        if applied_position:
+            scores = np.where(self.exclusion_mask(applied_position), -np.inf, scores)
+
+        candidates = np.flatnonzero(np.isfinite(scores))
+        k = min(max(top_k, 0), len(candidates))
+        if k == 0:
+            return []
+
+        candidate_scores = scores[candidates]
+        if k < len(candidates):
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+
+        return [(self.titles[candidates[i]], float(candidate_scores[i])) for i in top]
+
+
+def load_job_index(csv_path: str = EMBEDDINGS_CSV, npy_path: str = EMBEDDINGS_NPY, meta_path: str = EMBEDDINGS_META):
+    """
+    Load the job index from the binary store, falling back to parsing the CSV
+    when the store is missing, unreadable or was built from a different CSV.
+
+    Returns:
+        (jobs DataFrame, JobEmbeddingIndex)
+    """
+    if os.path.exists(npy_path) and os.path.exists(meta_path):
+        try:
+            index, meta = JobEmbeddingIndex.load(npy_path, meta_path)
+            source_sha256 = meta.get("source_sha256")
+            if not os.path.exists(csv_path) or source_sha256 in (None, file_sha256(csv_path)):
+                jobs_df = pd.DataFrame({"filename": meta["filenames"]})
+                return jobs_df, index
+            logger.warning(f"{npy_path} is stale, rebuild it with `python -m smart_match.build_index`")
+        except Exception as e:
+            logger.warning(f"Could not load embedding store {npy_path}: {str(e)}")
+
+    logger.info(f"Loading job embeddings from {csv_path}")
+    jobs_df = read_embeddings_csv(csv_path)
+    return jobs_df, JobEmbeddingIndex.from_dataframe(jobs_df)
@@ -1,53 +1,62 @@
-
-
 import pandas as pd
-import ast
-from scipy.spatial.distance import cosine
-from sentence_transformers import SentenceTransformer
+from functools import partial
 from rapidfuzz import fuzz  # Faster alternative to fuzzywuzzy
+from smart_match.index import JobEmbeddingIndex, TITLE_SIMILARITY_THRESHOLD, load_job_index
+from utils.model_registry import model_registry, load_sentence_transformer
+from utils.micro_batcher import MicroBatcher
+
+EMBEDDER_MODEL = "all-MiniLM-L6-v2"
+
+# Sentence Transformer model, loaded on first use or by the startup warm-up
+model_registry.register(EMBEDDER_MODEL, partial(load_sentence_transformer, EMBEDDER_MODEL))
+
+
+def get_embedder():
+    return model_registry.get(EMBEDDER_MODEL)
+
 
-# Load Sentence Transformer Model
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+# Concurrent requests share one batched encode call
+embedding_batcher = MicroBatcher(f"smart_match:{EMBEDDER_MODEL}", lambda texts: get_embedder().encode(texts))
 
-# Load precomputed job embeddings
-df = pd.read_csv("smart_match/embeddings.csv")
-df["embedding"] = df["embedding"].apply(ast.literal_eval)
+
+# Load precomputed job embeddings from the memory-mapped store (falls back to embeddings.csv)
+# Requests then only do a matrix-vector product against the index
+df, job_index = load_job_index()
 
 # Function to generate embedding
 
 
 def generate_embedding(text: str):
-    return embedder.encode(text).tolist()
+    return embedding_batcher.encode([text])[0]
 
 # Function to check if the job title is similar to the applied position
 
 
-def is_similar(job_title: str, applied_position: str, threshold=80):
+def is_similar(job_title: str, applied_position: str, threshold=TITLE_SIMILARITY_THRESHOLD):
     return fuzz.partial_ratio(job_title.lower(), applied_position.lower()) >= threshold
 
 # Function to match jobs (excluding applied position from results)
 
 
-def match_jobs_to_applicant(profile: str, applied_position: str, jobs_df: pd.DataFrame):
-    query_embedding = generate_embedding(profile)
-    job_matches = []
-
-    for _, row in jobs_df.iterrows():
-        similarity = 1 - cosine(query_embedding, row["embedding"])
-        job_matches.append((row["filename"], similarity))
+def match_jobs_to_applicant(profile: str, applied_position: str, jobs_df: pd.DataFrame = None, top_k: int = 3):
+    # Reuse the prebuilt index unless a different set of jobs is passed in
+    index = job_index if jobs_df is None or jobs_df is df else JobEmbeddingIndex.from_dataframe(jobs_df)
 
-    # Remove ".pdf" and filter out the applied position from job matches
-    filtered_matches = [
-        (row[0].replace(".pdf", ""), row[1])
-        for row in job_matches
-        if not is_similar(row[0].replace(".pdf", ""), applied_position)
-    ]
+    query_embedding = generate_embedding(profile)
+    matches = index.search(query_embedding, applied_position, top_k=max(top_k, 1))
 
     # If all jobs are filtered out, return a default message
-    if not filtered_matches:
-        return {"Job Title": "No suitable job found", "Match Percentage": 0}
+    if not matches:
+        return {"Job Title": "No suitable job found", "Match Percentage": 0, "Top Matches": []}
 
-    # Sort matches by similarity and get the best match
-    best_match = sorted(filtered_matches, key=lambda x: x[1], reverse=True)[0]
+    top_matches = [
+        {"Job Title": title, "Match Percentage": round(similarity * 100, 2)}
+        for title, similarity in matches[:top_k]
+    ]
+    best_title, best_similarity = matches[0]
 
-    return {"Job Title": best_match[0], "Match Percentage": round(best_match[1] * 100, 2)}
\ No newline at end of file
+    return {
+        "Job Title": best_title,
+        "Match Percentage": round(best_similarity * 100, 2),
+        "Top Matches": top_matches
+    }
@@ -0,0 +1,72 @@
+"""
+Startup import-time benchmark.
+
+Imports the app in a fresh interpreter with ``python -X importtime``, prints the
+slowest imports and exits non-zero when importing takes longer than the budget.
+Models are not loaded during import (see utils.model_registry), so the budget
+covers what has to happen before /health can answer.
+
+Usage (from the ai/ directory):
+
+    python startup_benchmark.py [--budget-ms 3000] [--top 15]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Cold-start budget for importing app.py, in milliseconds
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "3000"))
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(module="app"):
+    """Import ``module`` with -X importtime and return (wall ms, [(cumulative us, self us, depth, name)])"""
+    env = {**os.environ, "MODEL_WARMUP": "lazy"}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-4000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            depth = (len(indent) - 1) // 2
+            entries.append((int(cumulative_us), int(self_us), depth, name))
+    return wall_ms, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check app import time against a budget")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Maximum total import time in ms (default: {DEFAULT_BUDGET_MS:.0f})")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show")
+    args = parser.parse_args()
+
+    wall_ms, entries = run_importtime(args.module)
+    total_ms = sum(cumulative for cumulative, _, depth, _ in entries if depth == 0) / 1000
+
+    print(f"Slowest imports of '{args.module}' (cumulative ms / self ms):")
+    for cumulative, self_us, depth, name in sorted(entries, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:9.1f}  {self_us / 1000:8.1f}  {'  ' * depth}{name}")
+    print(f"Total import time: {total_ms:.0f} ms (interpreter wall time {wall_ms:.0f} ms), budget {args.budget_ms:.0f} ms")
+
+    if total_ms > args.budget_ms:
+        print("FAIL: import time exceeds the startup budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import os
+from contextlib import contextmanager
+import pandas as pd
+import pytest
+from attrition.predictor import EmployeeData, FEATURE_COLUMNS, predict_attrition, predict_attrition_batch
+import routers.attrition_router as attrition_router
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What StayOrStrayPredictor sends for an employee, and the row the monthly sweep reads for them
+CLIENT_REQUESTS = [
+    {"age": 31, "region": "Greater Accra", "work_mode": "hybrid", "skills": ["Python", "SQL"],
+     "department": "Engineering", "duration": 3},
+    {"age": 45, "region": "Ashanti", "work_mode": "remote", "skills": ["Excel"],
+     "department": "Finance", "duration": 12},
+]
+
+
+@pytest.fixture(autouse=True)
+def model_dir(monkeypatch):
+    # The model is loaded relative to ai/
+    monkeypatch.chdir(AI_DIR)
+
+
+def frame_of(employees):
+    return pd.DataFrame({column: [employee[column] for employee in employees] for column in FEATURE_COLUMNS})
+
+
+@pytest.mark.parametrize("employee", CLIENT_REQUESTS)
+def test_batch_of_one_matches_single_prediction(employee):
+    single = predict_attrition(EmployeeData(**employee))
+    assert predict_attrition_batch(frame_of([employee])) == [single.dict()]
+
+
+def test_database_sweep_matches_client_requests(monkeypatch):
+    rows = [{"id": i + 1, **employee} for i, employee in enumerate(CLIENT_REQUESTS)]
+
+    class Cursor:
+        def execute(self, query):
+            pass
+
+        def fetchall(self):
+            return rows
+
+        def close(self):
+            pass
+
+    @contextmanager
+    def connection():
+        yield None
+
+    monkeypatch.setattr(attrition_router, "db_connection", connection)
+    monkeypatch.setattr(attrition_router, "get_db_cursor", lambda conn: Cursor())
+
+    frame = attrition_router.fetch_active_employees()
+    assert frame.pop("id").tolist() == ["1", "2"]
+    expected = [predict_attrition(EmployeeData(**employee)).dict() for employee in CLIENT_REQUESTS]
+    assert predict_attrition_batch(frame) == expected
@@ -0,0 +1,73 @@
+from cv_screening.local_extract import (
+    extract_email,
+    extract_phone,
+    extract_highest_degree,
+    extract_graduation_year,
+    extract_programming_languages,
+    extract_local_fields,
+    merge_languages,
+)
+
+MIXED_CV = (
+    "Certified Scrum Master (CSM), 2021 / Software Engineer at University of Ghana IT Dept, 2020 - 2024 / "
+    "Education: BSc Computer Science, KNUST, 2016 - 2019"
+)
+
+
+def test_contact_details():
+    text = "Jane Doe\njane.doe@example.com | +233 24 123 4567\nExperience: 2019 - 2024"
+    assert extract_email(text) == "jane.doe@example.com"
+    assert extract_phone(text) == "+233 24 123 4567"
+
+
+def test_date_ranges_are_not_phone_numbers():
+    assert extract_phone("Software Engineer, 2016 - 2019, 2020 - 2024") is None
+
+
+def test_only_email_and_phone_replace_the_llm():
+    fields = extract_local_fields(MIXED_CV + "\njane@example.com")
+    assert set(fields) == {"email"}
+
+
+def test_certification_title_is_not_a_degree():
+    assert extract_highest_degree(MIXED_CV) == "Bachelor's Degree"
+
+
+def test_master_as_plain_word_is_not_a_degree():
+    assert extract_highest_degree("Master data management, Scrum Master") is None
+    assert extract_highest_degree("Master of Science in Data Science") == "Master's Degree"
+    assert extract_highest_degree("M.Sc. Computer Science") == "Master's Degree"
+    assert extract_highest_degree("MSc Statistics") == "Master's Degree"
+
+
+def test_graduation_year_comes_from_education_section():
+    assert extract_graduation_year(MIXED_CV) == 2019
+    text = "EXPERIENCE\nEngineer, 2020 - 2024\nEDUCATION\nBSc Physics, 2015 - 2018\nSKILLS\nPython, 2023"
+    assert extract_graduation_year(text) == 2018
+
+
+def test_no_graduation_year_without_education_section():
+    assert extract_graduation_year("Software Engineer at Acme, 2020 - 2024") is None
+
+
+def test_single_letters_and_names_are_not_languages():
+    assert extract_programming_languages("Grade: C, section B") is None
+    assert extract_programming_languages("Ruby Mensah, Taylor Swift fan, R&D team") is None
+    assert extract_programming_languages("Skills: Python, Ruby, Swift") == ["Python", "Ruby", "Swift"]
+
+
+def test_languages_merge_keeps_llm_answer():
+    assert merge_languages("Python, Go", ["Python", "SQL"]) == ["Python", "Go", "SQL"]
+    assert merge_languages("Not specified", ["SQL"]) == ["SQL"]
+    assert merge_languages("Not specified", None) == "Not specified"
+
+
+def test_llm_answer_wins_over_hints(monkeypatch):
+    import cv_screening.cv_processor as cv_processor
+    llm_json = '{"highest_degree": "Bachelor\'s Degree", "graduation_year": 2019, "programming_languages": "Java"}'
+    monkeypatch.setattr(cv_processor, "complete", lambda *args, **kwargs: llm_json)
+    cv_info = cv_processor.extract_cv_info(MIXED_CV + "\nPython, SQL\njane@example.com")
+    assert cv_info["highestDegree"] == "Bachelor's Degree"
+    assert cv_info["graduationYear"] == 2019
+    assert cv_info["programmingLanguages"] == ["Java", "Python", "SQL"]
+    assert cv_info["email"] == "jane@example.com"
@@ -0,0 +1,32 @@
+import asyncio
+import pytest
+import report.llm_helpers as llm_helpers
+import routers.report_router as report_router
+from report.cache import ReportCache
+
+
+@pytest.fixture
+def employees_cache(monkeypatch):
+    monkeypatch.setattr(report_router, "build_employees_report", lambda: ("# Employee Report\n", "{}"))
+    cache = ReportCache(ttl=300, stale_ttl=3600, fingerprint_ttl=0)
+    cache.register("employees", report_router.generate_employees_report, lambda: "v1")
+    return cache
+
+
+def test_llm_failure_is_not_cached(monkeypatch, employees_cache):
+    def unavailable(template, **values):
+        raise RuntimeError("Groq unavailable")
+    monkeypatch.setattr(llm_helpers, "complete_insights", unavailable)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(employees_cache.get("employees"))
+    assert employees_cache.stats()["reports"] == {}
+
+
+def test_report_is_cached_once_llm_recovers(monkeypatch, employees_cache):
+    monkeypatch.setattr(llm_helpers, "complete_insights", lambda template, **values: "## Key Insights\n- Stable")
+
+    entry, status = asyncio.run(employees_cache.get("employees"))
+    assert status == "MISS"
+    assert "LLM Analysis Error" not in entry.markdown
+    assert list(employees_cache.stats()["reports"]) == ["employees"]
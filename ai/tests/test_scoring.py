@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+from predict_score.scoring import CandidateJobMatcher
+
+# Candidates reach the matcher as a Series, as format_candidate builds them
+CANDIDATE = pd.Series({"Technical Skills": "Python, SQL", "Industries": "Fintech", "Total Years in Tech": "4"})
+
+
+@pytest.fixture
+def matcher(monkeypatch):
+    matcher = CandidateJobMatcher()
+    # Deterministic 8-dimensional embeddings instead of the transformer
+    monkeypatch.setattr(matcher, "encode_texts",
+                        lambda texts: [np.random.default_rng(len(text)).random(8, dtype=np.float32) for text in texts])
+    return matcher
+
+
+def test_no_job_lists_skills(matcher):
+    jobs = [{"title": "Analyst", "min_experience": "2 years"}, {"title": "Clerk"}]
+    scores = matcher.predict_match_scores(CANDIDATE, jobs)
+    assert [score["skill_match"] for score in scores] == [0.0, 0.0]
+
+
+def test_only_jobs_with_skills_get_a_skill_score(matcher):
+    jobs = [{"title": "Engineer", "skills": "Python, Django"}, {"title": "Clerk"}]
+    scores = {score["index"]: score for score in matcher.predict_match_scores(CANDIDATE, jobs)}
+    assert scores[0]["skill_match"] > 0
+    assert scores[1]["skill_match"] == 0.0
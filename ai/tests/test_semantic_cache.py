@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from kairo.semantic_cache import SemanticSQLCache, query_signature, sql_literals_match
+
+HIRED_LAST_MONTH_SQL = """SELECT COUNT(*) FROM recruitments WHERE "currentStatus" = 'Hired'
+AND "updatedAt" >= date_trunc('month', NOW()) - INTERVAL '1 month'"""
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SemanticSQLCache(["id", "currentStatus", "source", "updatedAt"], threshold=0.9)
+    # Every question embeds identically, so only the signature and literal checks decide
+    monkeypatch.setattr(cache, "embed", lambda query: np.array([1.0, 0.0]))
+    return cache
+
+
+def test_request_paraphrases_share_a_signature():
+    assert query_signature("how many candidates were hired last month") == query_signature("hired count last month")
+
+
+def test_paraphrase_reuses_cached_sql(cache):
+    cache.store("how many candidates were hired last month", HIRED_LAST_MONTH_SQL)
+    assert cache.lookup("hired count last month") == (HIRED_LAST_MONTH_SQL, 1.0)
+    assert cache.lookup("hire count last month") == (HIRED_LAST_MONTH_SQL, 1.0)
+
+
+@pytest.mark.parametrize("question", [
+    "how many candidates were hired last year",
+    "list candidates hired last month",
+    "how many candidates were rejected last month",
+])
+def test_different_question_misses(cache, question):
+    cache.store("how many candidates were hired last month", HIRED_LAST_MONTH_SQL)
+    assert cache.lookup(question) is None
+
+
+def test_numbers_must_match():
+    assert query_signature("top five positions") == query_signature("top 5 positions")
+    assert query_signature("top 5 positions") != query_signature("top 10 positions")
+
+
+def test_sql_literals_come_from_the_question():
+    sql = "SELECT COUNT(*) FROM recruitments WHERE source = 'LinkedIn'"
+    assert sql_literals_match(sql, "how many candidates came from LinkedIn")
+    assert not sql_literals_match(sql, "how many candidates came from Indeed")
@@ -0,0 +1,70 @@
+import pytest
+from kairo.sql_guard import SQLGuardError, check_statement, tokenize, has_top_level_limit, inject_limit
+
+
+def test_tokenize_skips_strings_comments_and_quoted_identifiers():
+    tokens = tokenize("""SELECT 'drop; table' AS "delete", e'it\\'s' -- insert
+        /* outer /* nested */ update */ $tag$ ; $tag$, $$x$$ FROM t""")
+    words = [text for kind, text, _ in tokens if kind == "word"]
+    assert words == ["select", "as", "from", "t"]
+    assert [kind for kind, _, _ in tokens].count("string") == 4
+    assert ("quoted", '"delete"', 0) in tokens
+
+
+def test_tokenize_tracks_parenthesis_depth():
+    tokens = tokenize("SELECT count(*) FROM (SELECT 1) s")
+    depths = {text: depth for kind, text, depth in tokens if kind == "word"}
+    assert depths["count"] == 0
+    assert depths["s"] == 0
+    assert [depth for kind, text, depth in tokens if text == "select"] == [0, 1]
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 'a",
+    "SELECT 1 /* open",
+    "SELECT $x$ open",
+    "SELECT (1",
+    "SELECT 1)",
+])
+def test_tokenize_rejects_unterminated_input(sql):
+    with pytest.raises(SQLGuardError):
+        tokenize(sql)
+
+
+@pytest.mark.parametrize("sql", [
+    'SELECT comment FROM recruitments',
+    'SELECT r.source AS set FROM recruitments r',
+    'SELECT count(*) AS load FROM employees',
+    'SELECT analyze, lock, do, call, execute, prepare, import FROM t',
+    'WITH hires AS (SELECT * FROM recruitments) SELECT count(*) FROM hires;',
+    "SELECT * FROM recruitments WHERE status = 'delete me; drop table x'",
+    "SELECT substring(name from 1 for 3) FROM t",
+    'SELECT * FROM "update"',
+])
+def test_read_only_selects_are_accepted(sql):
+    assert check_statement(sql) == sql.rstrip(";")
+
+
+@pytest.mark.parametrize("sql", [
+    "DELETE FROM recruitments",
+    "UPDATE recruitments SET status = 'x'",
+    "WITH gone AS (DELETE FROM recruitments RETURNING *) SELECT * FROM gone",
+    "WITH gone AS MATERIALIZED (UPDATE t SET a = 1 RETURNING *) SELECT * FROM gone",
+    "SELECT * INTO backup FROM recruitments",
+    "SELECT * FROM recruitments FOR UPDATE",
+    "SELECT * FROM recruitments FOR NO KEY UPDATE",
+    "SELECT * FROM recruitments FOR SHARE",
+    "SELECT 1; DROP TABLE recruitments",
+    "SELECT pg_sleep(10)",
+    "SELECT * FROM dblink('host=x', 'select 1') AS t(a int)",
+    "",
+])
+def test_writes_locks_and_dangerous_functions_are_rejected(sql):
+    with pytest.raises(SQLGuardError):
+        check_statement(sql)
+
+
+def test_limit_is_only_added_at_top_level():
+    assert not has_top_level_limit("SELECT * FROM (SELECT 1 LIMIT 1) s")
+    assert inject_limit("SELECT * FROM t LIMIT 5", 100) == ("SELECT * FROM t LIMIT 5", False)
+    assert inject_limit("SELECT * FROM t", 100) == ("SELECT * FROM t\nLIMIT 100", True)
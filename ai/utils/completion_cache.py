@@ -0,0 +1,214 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config.settings import LLM_CACHE_BACKEND, LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+def completion_key(model, system_prompt, user_prompt, temperature) -> str:
+    """Content hash identifying a completion request"""
+    payload = json.dumps([model, system_prompt, user_prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryBackend:
+    """Bounded in-process LRU of completions"""
+
+    name = "memory"
+
+    def __init__(self, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (text, expires_at)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            text, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, text, expires_at):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (text, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "evictions": self.evictions}
+
+
+class SqliteBackend:
+    """Completions persisted in a local SQLite file, shared by workers and kept across restarts"""
+
+    name = "sqlite"
+
+    def __init__(self, path=LLM_CACHE_PATH, table="completions"):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._connect().execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, text TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _connect(self):
+        # sqlite3 connections are per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Cached text can hold candidate data: the file (and the WAL files SQLite
+            # derives from its mode) is readable by the owner only
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+            os.chmod(self.path, 0o600)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            f"SELECT text, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() >= row[1]:
+            return None
+        return row[0], row[1]
+
+    def set(self, key, text, expires_at):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, text, expires_at) VALUES (?, ?, ?)",
+                (key, text, expires_at))
+            # Drop expired rows now and then so the file doesn't grow without bound
+            self._writes += 1
+            if self._writes % 100 == 0:
+                conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute(f"DELETE FROM {self.table}")
+
+    def stats(self):
+        (entries,) = self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return {"entries": entries, "path": self.path}
+
+
+class CompletionCache:
+    """
+    Content-addressed cache of LLM completions.
+
+    Keys hash (model, system prompt, user prompt, temperature), so an identical
+    request is answered without a network round trip. Lookups go to the
+    in-memory LRU first, then the optional persistent backend. Each call site
+    passes its own TTL, and hits/misses are counted per call site. Call sites
+    passing ``persist=False`` never touch the persistent backend.
+    """
+
+    def __init__(self, memory, persistent=None):
+        self.memory = memory
+        self.persistent = persistent
+        self._lock = threading.Lock()
+        self._counters = {}  # call site -> {"hits", "misses", "stores"}
+
+    def _count(self, call_site, counter):
+        with self._lock:
+            counters = self._counters.setdefault(call_site, {"hits": 0, "misses": 0, "stores": 0})
+            counters[counter] += 1
+
+    def get(self, key, call_site="default", persist=True):
+        entry = self.memory.get(key)
+        if entry is None and persist and self.persistent is not None:
+            try:
+                entry = self.persistent.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache read failed: {str(e)}")
+                entry = None
+            if entry is not None:
+                self.memory.set(key, *entry)
+        self._count(call_site, "misses" if entry is None else "hits")
+        return None if entry is None else entry[0]
+
+    def set(self, key, text, ttl, call_site="default", persist=True):
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        self.memory.set(key, text, expires_at)
+        if persist and self.persistent is not None:
+            try:
+                self.persistent.set(key, text, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {str(e)}")
+        self._count(call_site, "stores")
+
+    def clear(self):
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    def stats(self):
+        with self._lock:
+            call_sites = {
+                site: {**counters, "hit_rate": round(counters["hits"] / max(1, counters["hits"] + counters["misses"]), 4)}
+                for site, counters in self._counters.items()
+            }
+        stats = {"memory": self.memory.stats(), "call_sites": call_sites}
+        if self.persistent is not None:
+            try:
+                stats[self.persistent.name] = self.persistent.stats()
+            except sqlite3.Error as e:
+                stats[self.persistent.name] = {"error": str(e)}
+        return stats
+
+
+def create_completion_cache(backend=LLM_CACHE_BACKEND):
+    persistent = None
+    if backend == "sqlite" and not LLM_CACHE_PATH:
+        logger.warning("LLM_CACHE_BACKEND=sqlite needs LLM_CACHE_PATH, using memory only")
+    elif backend == "sqlite":
+        try:
+            persistent = SqliteBackend()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"LLM cache file unavailable, using memory only: {str(e)}")
+    elif backend != "memory":
+        logger.warning(f"Unknown LLM_CACHE_BACKEND '{backend}', using memory only")
+    return CompletionCache(MemoryBackend(), persistent)
+
+
+_completion_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_completion_cache():
+    """Process-wide completion cache, created on first use"""
+    global _completion_cache
+    with _cache_lock:
+        if _completion_cache is None:
+            _completion_cache = create_completion_cache()
+        return _completion_cache
+
+
+def get_completion_cache_stats():
+    return get_completion_cache().stats()
@@ -1,27 +1,305 @@
 import psycopg2
 import psycopg2.extras
+import psycopg2.extensions
 import logging
-from config.settings import DB_CONFIG
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from utils.executor import run_io
+from config.settings import (
+    DB_CONFIG,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_POOL_MAX_IDLE,
+    DB_POOL_PING_INTERVAL,
+    DB_CONNECT_TIMEOUT
+)
 
 logger = logging.getLogger(__name__)
 
-def get_db_connection():
-    """Get a connection to the PostgreSQL database"""
-    try:
-        conn = psycopg2.connect(
-            host=DB_CONFIG["host"],
-            port=DB_CONFIG["port"],
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            database=DB_CONFIG["database"]
-        )
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class DatabasePool:
+    """
+    Thread-safe PostgreSQL connection pool.
+
+    Keeps up to ``max_size`` connections open, hands out the most recently
+    used idle connection first, pings connections that have been idle for a
+    while before reuse and closes connections that sat idle past ``max_idle``.
+    """
+
+    def __init__(self, min_size=DB_POOL_MIN_SIZE, max_size=DB_POOL_MAX_SIZE,
+                 timeout=DB_POOL_TIMEOUT, max_idle=DB_POOL_MAX_IDLE,
+                 ping_interval=DB_POOL_PING_INTERVAL):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.ping_interval = ping_interval
+
+        self._idle = deque()  # (connection, returned_at) pairs, most recent on the right
+        self._open = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_ms": 0.0,
+            "timeouts": 0,
+            "connects": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+            "peak_in_use": 0
+        }
+
+        # Open the minimum number of connections up front
+        for _ in range(min_size):
+            self._open += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                self._open -= 1
+                self.close()
+                raise
+            self._idle.append((conn, time.monotonic()))
+
+    def _connect(self):
+        try:
+            conn = psycopg2.connect(
+                host=DB_CONFIG["host"],
+                port=DB_CONFIG["port"],
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                database=DB_CONFIG["database"],
+                connect_timeout=DB_CONNECT_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(f"Database connection error: {str(e)}")
+            # Log more detailed information for debugging
+            logger.error(f"DB Config: {DB_CONFIG['host']}:{DB_CONFIG['port']}, DB: {DB_CONFIG['database']}")
+            raise
+        with self._cond:
+            self._stats["connects"] += 1
+        return conn
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn):
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _validate(self, conn, returned_at):
+        """Return the connection if it is still usable, otherwise close it and return None"""
+        idle_for = time.monotonic() - returned_at
+        if conn.closed or idle_for > self.max_idle:
+            self._close_quietly(conn)
+            with self._cond:
+                self._stats["recycled"] += 1
+            return None
+        if idle_for > self.ping_interval and not self._is_healthy(conn):
+            logger.warning("Discarding unhealthy pooled database connection")
+            self._close_quietly(conn)
+            with self._cond:
+                self._stats["unhealthy"] += 1
+            return None
+        return conn
+
+    def _reap_idle(self):
+        """Close connections idle past max_idle while keeping min_size open. Caller holds the lock."""
+        now = time.monotonic()
+        while self._idle and self._open > self.min_size and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._open -= 1
+            self._stats["recycled"] += 1
+            self._close_quietly(conn)
+
+    def getconn(self):
+        """Check out a connection, waiting up to ``timeout`` seconds for one to free up"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        with self._cond:
+            if self._closed:
+                raise psycopg2.InterfaceError("Database pool is closed")
+
+            waited = False
+            while not self._idle and self._open >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.timeout}s "
+                        f"({self._in_use}/{self.max_size} in use)")
+                waited = True
+                self._cond.wait(remaining)
+
+            if self._idle:
+                conn, returned_at = self._idle.pop()
+            else:
+                # Reserve a slot for a new connection, opened outside the lock
+                conn, returned_at = None, None
+                self._open += 1
+
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._in_use)
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time_ms"] += (time.monotonic() - start) * 1000
+
+        try:
+            if conn is not None:
+                conn = self._validate(conn, returned_at)
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
         return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {str(e)}")
-        # Log more detailed information for debugging
-        logger.error(f"DB Config: {DB_CONFIG['host']}:{DB_CONFIG['port']}, DB: {DB_CONFIG['database']}")
-        raise
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool, rolling back any open transaction"""
+        if not discard and not conn.closed:
+            status = conn.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                discard = True
+            elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+
+        discard = discard or bool(conn.closed)
+        if discard:
+            self._close_quietly(conn)
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._open -= 1
+                if not discard:
+                    self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._reap_idle()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and always returns it"""
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # The connection itself is likely broken, don't hand it out again
+            discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def stats(self):
+        """Snapshot of pool size, saturation and checkout counters"""
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "saturation": round(self._in_use / self.max_size, 4),
+                **self._stats,
+                "wait_time_ms": round(self._stats["wait_time_ms"], 2)
+            }
+
+    def close(self):
+        """Close all idle connections; checked-out ones are closed when returned"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._open -= 1
+                self._close_quietly(conn)
+            self._cond.notify_all()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def init_db_pool():
+    """Create the shared connection pool (called on app startup)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DatabasePool()
+            logger.info(f"Database pool ready (min={_pool.min_size}, max={_pool.max_size})")
+        return _pool
+
+
+def get_db_pool():
+    """Return the shared pool, creating it on first use"""
+    return _pool if _pool is not None else init_db_pool()
+
+
+def close_db_pool():
+    """Close the shared connection pool (called on app shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def get_db_pool_stats():
+    """Return pool metrics without creating the pool"""
+    pool = _pool
+    if pool is None:
+        return {"initialized": False}
+    return {"initialized": True, **pool.stats()}
+
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection for the duration of a ``with`` block"""
+    with get_db_pool().connection() as conn:
+        yield conn
+
 
 def get_db_cursor(conn):
     """Get a cursor that returns results as dictionaries"""
-    return conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
\ No newline at end of file
+    return conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+
+async def run_with_connection(func, *args, **kwargs):
+    """
+    Run ``func(conn, *args, **kwargs)`` on a pooled connection in the I/O worker
+    pool, so async endpoints don't block the event loop on psycopg2 calls.
+    """
+    def call():
+        with db_connection() as conn:
+            return func(conn, *args, **kwargs)
+
+    return await run_io(call)
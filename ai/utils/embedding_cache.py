@@ -0,0 +1,143 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from config.settings import EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_TTL
+
+# Every cache created in the process, by name, for the metrics endpoint
+_caches = {}
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different strings share an entry"""
+    return " ".join(str(text).lower().split())
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Thread-safe embedding cache keyed by a hash of the normalized text.
+
+    Holds two tiers: pinned embeddings precomputed for known texts (e.g. job
+    descriptions), which never expire, and a bounded LRU of on-demand
+    embeddings that expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, name, max_size=EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (embedding, stored_at)
+        self._pinned = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "pinned_hits": 0, "misses": 0, "evictions": 0, "expired": 0, "encoded": 0}
+        _caches[name] = self
+
+    def get(self, text):
+        """Cached embedding for ``text``, or None"""
+        key = text_key(text)
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key):
+        embedding = self._pinned.get(key)
+        if embedding is not None:
+            self._counters["pinned_hits"] += 1
+            return embedding
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            embedding, stored_at = entry
+            if time.monotonic() - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return embedding
+            del self._entries[key]
+            self._counters["expired"] += 1
+        self._counters["misses"] += 1
+        return None
+
+    def put(self, text, embedding):
+        self._store(text_key(text), embedding)
+
+    def _store(self, key, embedding):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (embedding, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def pin(self, texts, embeddings):
+        """Replace the pinned tier with precomputed embeddings for ``texts``"""
+        pinned = {text_key(text): self._freeze(embedding) for text, embedding in zip(texts, embeddings)}
+        with self._lock:
+            self._pinned = pinned
+
+    def encode(self, texts, encoder):
+        """
+        Return one embedding per text, calling ``encoder`` once with the texts
+        that are not cached (duplicates are encoded once).
+        """
+        keys = [text_key(text) for text in texts]
+        results = [None] * len(texts)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in missing:
+                    missing[key].append(i)
+                    continue
+                embedding = self._lookup(key)
+                if embedding is None:
+                    missing[key] = [i]
+                else:
+                    results[i] = embedding
+
+        if missing:
+            positions = list(missing.values())
+            encoded = encoder([texts[indexes[0]] for indexes in positions])
+            with self._lock:
+                self._counters["encoded"] += len(positions)
+            for key, indexes, embedding in zip(missing, positions, encoded):
+                embedding = self._freeze(embedding)
+                self._store(key, embedding)
+                for i in indexes:
+                    results[i] = embedding
+        return results
+
+    @staticmethod
+    def _freeze(embedding):
+        # Cached arrays are shared between requests, so make them read-only
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+            pinned = len(self._pinned)
+        lookups = counters["hits"] + counters["pinned_hits"] + counters["misses"]
+        return {
+            **counters,
+            "size": size,
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "pinned": pinned,
+            "hit_rate": round((counters["hits"] + counters["pinned_hits"]) / lookups, 4) if lookups else None
+        }
+
+
+def get_embedding_cache_stats():
+    """Hit/miss counters of every embedding cache in the process"""
+    return {name: cache.stats() for name, cache in list(_caches.items())}
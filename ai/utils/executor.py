@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from config.settings import (
+    IO_POOL_SIZE, IO_QUEUE_LIMIT,
+    INFERENCE_POOL_SIZE, INFERENCE_QUEUE_LIMIT,
+    CPU_POOL_SIZE, CPU_QUEUE_LIMIT,
+    REPORT_QUERY_PARALLELISM, REPORT_QUERY_QUEUE_LIMIT,
+    EXECUTOR_RETRY_AFTER
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a worker pool's queue is full; the app turns it into a 503"""
+
+    def __init__(self, pool_name, retry_after=EXECUTOR_RETRY_AFTER):
+        super().__init__(f"The {pool_name} worker pool is saturated, please retry later")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+
+class WorkerPool:
+    """
+    Bounded executor for blocking work called from async endpoints.
+
+    At most ``max_workers`` tasks run at once and ``queue_limit`` more may
+    wait; anything beyond that is rejected immediately with
+    PoolSaturatedError instead of queueing without bound and stalling
+    every request behind it.
+    """
+
+    def __init__(self, name, max_workers, queue_limit, kind="thread"):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.queue_limit = max(0, queue_limit)
+        self.kind = kind
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self._wait_ms = 0.0
+        self._run_ms = 0.0
+
+    def _get_executor(self):
+        # Created on first use so importing the app starts no threads or processes
+        if self._executor is None:
+            if self.kind == "process":
+                # Spawned workers don't inherit the parent's threads, locks or loaded models
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker")
+        return self._executor
+
+    def _admit(self, func, args, kwargs):
+        """Reserve a slot (or reject) and return the executor plus the call to run"""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.queue_limit:
+                self._counters["rejected"] += 1
+                raise PoolSaturatedError(self.name)
+            self._in_flight += 1
+            self._counters["submitted"] += 1
+            executor = self._get_executor()
+
+        call = partial(func, *args, **kwargs)
+        if self.kind != "process":
+            call = partial(self._timed, call, time.perf_counter())
+        return executor, call
+
+    def _release(self, failed):
+        with self._lock:
+            self._in_flight -= 1
+            self._counters["completed"] += 1
+            if failed:
+                self._counters["failed"] += 1
+
+    async def run(self, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` in the pool and await its result"""
+        executor, call = self._admit(func, args, kwargs)
+        failed = False
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(failed)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Submit ``func(*args, **kwargs)`` from synchronous code (e.g. a fan-out
+        inside a worker thread); returns a concurrent.futures.Future.
+        """
+        executor, call = self._admit(func, args, kwargs)
+        try:
+            future = executor.submit(call)
+        except BaseException:
+            self._release(True)
+            raise
+        future.add_done_callback(lambda done: self._release(done.cancelled() or done.exception() is not None))
+        return future
+
+    def _timed(self, call, submitted_at):
+        """Record queue wait and run time of a task (thread pools only)"""
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._wait_ms += (started_at - submitted_at) * 1000
+        try:
+            return call()
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._run_ms += (time.perf_counter() - started_at) * 1000
+
+    def stats(self):
+        with self._lock:
+            completed = self._counters["completed"]
+            stats = {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self._in_flight,
+                "saturation": round(self._in_flight / (self.max_workers + self.queue_limit), 3),
+                **self._counters
+            }
+            if self.kind != "process":
+                stats["running"] = self._running
+                stats["queued"] = max(0, self._in_flight - self._running)
+                stats["avg_wait_ms"] = round(self._wait_ms / completed, 2) if completed else None
+                stats["avg_run_ms"] = round(self._run_ms / completed, 2) if completed else None
+        return stats
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Blocking I/O: psycopg2 queries, Groq/LLM HTTP calls, file handling
+io_pool = WorkerPool("io", IO_POOL_SIZE, IO_QUEUE_LIMIT)
+# Model inference on in-process models (torch and numpy release the GIL)
+inference_pool = WorkerPool("inference", INFERENCE_POOL_SIZE, INFERENCE_QUEUE_LIMIT)
+# Pure CPU-bound functions with picklable arguments, e.g. PDF parsing
+cpu_pool = WorkerPool("cpu", CPU_POOL_SIZE, CPU_QUEUE_LIMIT, kind="process")
+# Report aggregate queries fanned out from an io worker; each holds a pooled connection
+report_query_pool = WorkerPool("report_query", REPORT_QUERY_PARALLELISM, REPORT_QUERY_QUEUE_LIMIT)
+
+_pools = (io_pool, inference_pool, cpu_pool, report_query_pool)
+
+
+async def run_io(func, *args, **kwargs):
+    return await io_pool.run(func, *args, **kwargs)
+
+
+async def run_inference(func, *args, **kwargs):
+    return await inference_pool.run(func, *args, **kwargs)
+
+
+async def run_cpu(func, *args, **kwargs):
+    """Run a module-level function in a worker process (arguments and result must be picklable)"""
+    return await cpu_pool.run(func, *args, **kwargs)
+
+
+def get_executor_stats():
+    return {pool.name: pool.stats() for pool in _pools}
+
+
+def shutdown_executors():
+    for pool in _pools:
+        pool.shutdown()
@@ -0,0 +1,140 @@
+import importlib.util
+import logging
+import threading
+from functools import lru_cache
+from utils.completion_cache import completion_key, get_completion_cache
+from config.settings import (
+    api_key,
+    LLM_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_HTTP2
+)
+
+logger = logging.getLogger(__name__)
+
+# Models used across the app
+REPORT_MODEL = "llama-3.3-70b-versatile"
+CV_MODEL = "llama-3.3-70b-versatile"
+SQL_MODEL = "gemma2-9b-it"
+NSP_MODEL = "llama-3.1-8b-instant"
+
+_lock = threading.Lock()
+_http_client = None
+_groq_client = None
+
+
+def get_http_client():
+    """Process-wide httpx client, so every LLM call reuses pooled keep-alive connections"""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            import httpx
+            http2 = LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+            _http_client = httpx.Client(
+                http2=http2,
+                timeout=LLM_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+                )
+            )
+            logger.info(f"LLM HTTP client created ({'HTTP/2' if http2 else 'HTTP/1.1'} keep-alive)")
+        return _http_client
+
+
+def get_groq_client():
+    """Shared Groq client on top of the pooled HTTP client (created on first use)"""
+    global _groq_client
+    if _groq_client is None:
+        if not api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set")
+        from groq import Groq
+        http_client = get_http_client()
+        with _lock:
+            if _groq_client is None:
+                _groq_client = Groq(api_key=api_key, http_client=http_client, max_retries=LLM_MAX_RETRIES)
+    return _groq_client
+
+
+@lru_cache(maxsize=64)
+def get_prompt(template: str):
+    """Compiled prompt template (f-string syntax, ``{{`` for literal braces), parsed once"""
+    from langchain_core.prompts import PromptTemplate
+    return PromptTemplate.from_template(template)
+
+
+def render_prompt(template: str, **values) -> str:
+    return get_prompt(template).format(**values)
+
+
+def build_messages(user_prompt, system_prompt=None):
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": user_prompt})
+    return messages
+
+
+def complete(model, user_prompt, system_prompt=None, temperature=None, cache_ttl=0, call_site="default",
+             validate=None, cache_persist=True) -> str:
+    """
+    Text of a single chat completion.
+
+    With ``cache_ttl`` > 0, identical requests within the TTL are answered from
+    the completion cache; ``call_site`` labels the hit-rate metrics. Pass
+    ``validate`` to cache only responses it accepts (e.g. parseable JSON), and
+    ``cache_persist=False`` to keep the completion out of the persistent cache.
+    """
+    key = None
+    if cache_ttl > 0:
+        key = completion_key(model, system_prompt, user_prompt, temperature)
+        cached = get_completion_cache().get(key, call_site, persist=cache_persist)
+        if cached is not None:
+            return cached
+
+    kwargs = {"temperature": temperature} if temperature is not None else {}
+    response = get_groq_client().chat.completions.create(
+        messages=build_messages(user_prompt, system_prompt), model=model, **kwargs)
+    text = response.choices[0].message.content
+
+    if key is not None and text and (validate is None or validate(text)):
+        get_completion_cache().set(key, text, cache_ttl, call_site, persist=cache_persist)
+    return text
+
+
+def stream_complete(model, user_prompt, system_prompt=None, temperature=None, cache_ttl=0, call_site="default"):
+    """Yield the completion text chunk by chunk as it is generated (a cached completion comes as one chunk)"""
+    key = None
+    if cache_ttl > 0:
+        key = completion_key(model, system_prompt, user_prompt, temperature)
+        cached = get_completion_cache().get(key, call_site)
+        if cached is not None:
+            yield cached
+            return
+
+    kwargs = {"temperature": temperature} if temperature is not None else {}
+    stream = get_groq_client().chat.completions.create(
+        messages=build_messages(user_prompt, system_prompt), model=model, stream=True, **kwargs)
+    chunks = []
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            chunks.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+
+    # Only a completion that streamed to the end is cached
+    if key is not None and chunks:
+        get_completion_cache().set(key, "".join(chunks), cache_ttl, call_site)
+
+
+def close_llm_gateway():
+    """Close pooled LLM connections"""
+    global _http_client, _groq_client
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _groq_client = None
@@ -0,0 +1,147 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from config.settings import MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS, MICRO_BATCH_RESULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Every batcher created in the process, by name, for the metrics endpoint
+_batchers = {}
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent encode calls into one batched call.
+
+    Callers (worker threads) submit texts and block until their embeddings
+    are ready. A single background thread takes the first pending request,
+    waits up to ``max_wait_ms`` for more to arrive or until ``max_batch``
+    texts are collected, runs ``encode_fn`` once on all of them and hands
+    each caller its slice of the result.
+    """
+
+    def __init__(self, name, encode_fn, max_batch=MICRO_BATCH_MAX_SIZE, max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+                 result_timeout=MICRO_BATCH_RESULT_TIMEOUT):
+        self.name = name
+        self.encode_fn = encode_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.result_timeout = result_timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._histogram = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self._overflow = 0
+        self._counters = {"batches": 0, "requests": 0, "texts": 0, "errors": 0}
+        self._encode_ms = 0.0
+        _batchers[name] = self
+
+    def encode(self, texts):
+        """Embeddings for ``texts`` (a list), computed together with other pending requests"""
+        texts = list(texts)
+        if not texts:
+            return []
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((texts, future))
+        try:
+            return future.result(timeout=self.result_timeout)
+        except FuturesTimeoutError:
+            # Drop the request if the worker hasn't picked it up yet
+            future.cancel()
+            raise TimeoutError(f"{self.name} did not return embeddings within {self.result_timeout:g}s")
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name=f"micro-batcher-{self.name}", daemon=True)
+                    self._thread.start()
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or the wait is over"""
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            error = None
+            try:
+                self._process(batch)
+            except BaseException as e:
+                # Anything, not just Exception: the worker must survive to serve later requests
+                error = e if isinstance(e, Exception) else RuntimeError(f"Batched encode aborted: {type(e).__name__}")
+                logger.error(f"Batched encode failed in {self.name}: {str(e) or type(e).__name__}")
+                with self._stats_lock:
+                    self._counters["errors"] += 1
+            finally:
+                # Whatever went wrong, no caller is left waiting on this batch
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error or RuntimeError(f"{self.name} batch was not completed"))
+
+    def _process(self, batch):
+        # Requests that timed out and were cancelled while queued are skipped
+        batch[:] = [request for request in batch if request[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        start = time.perf_counter()
+        embeddings = self.encode_fn(texts)
+        self._record(len(batch), len(texts), (time.perf_counter() - start) * 1000)
+
+        offset = 0
+        for request_texts, future in batch:
+            future.set_result(embeddings[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+    def _record(self, requests, size, elapsed_ms):
+        with self._stats_lock:
+            self._counters["batches"] += 1
+            self._counters["requests"] += requests
+            self._counters["texts"] += size
+            self._encode_ms += elapsed_ms
+            for bucket in BATCH_SIZE_BUCKETS:
+                if size <= bucket:
+                    self._histogram[bucket] += 1
+                    break
+            else:
+                self._overflow += 1
+
+    def stats(self):
+        """Counters plus a batch-size histogram (texts per encode call, by bucket upper bound)"""
+        with self._stats_lock:
+            batches = self._counters["batches"]
+            histogram = {str(bucket): count for bucket, count in self._histogram.items()}
+            histogram["+Inf"] = self._overflow
+            return {
+                **self._counters,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "pending": self._queue.qsize(),
+                "avg_batch_size": round(self._counters["texts"] / batches, 2) if batches else None,
+                "avg_encode_ms": round(self._encode_ms / batches, 2) if batches else None,
+                "batch_size_histogram": histogram
+            }
+
+
+def get_batcher_stats():
+    return {name: batcher.stats() for name, batcher in list(_batchers.items())}
@@ -0,0 +1,190 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from config.settings import MODEL_WARMUP, MODEL_RELOAD_CHECK_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+def load_sentence_transformer(model_name: str):
+    """Load a SentenceTransformer, importing torch only when a model is actually needed"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def file_signature(path: str):
+    """Cheap change detector for a model file: (mtime, size)"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_version(path: str) -> str:
+    """Short content hash used as the model version"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class ModelEntry:
+    """A registered model (or data file) and its loading state"""
+
+    def __init__(self, name, loader, path=None):
+        self.name = name
+        self.loader = loader
+        self.path = path  # Set for file-backed models that are hot-reloaded
+        self.value = None
+        self.state = "pending"  # pending -> loading -> ready | failed
+        self.error = None
+        self.load_time_ms = None
+        self.loaded_at = None
+        self.version = None
+        self.signature = None
+        self.checked_at = 0.0
+        self.reloads = 0
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of models that are expensive to load.
+
+    Modules register a loader at import time (cheap) and call ``get`` when they
+    need the model. Loading happens once, either on first use or during the
+    background warm-up started by the app, so importing the app stays fast.
+    Models registered with a ``path`` are reloaded when the file's content changes.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._warmup_thread = None
+
+    def register(self, name, loader, path=None):
+        """Register a loader under ``name``; registering an existing name is a no-op"""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = ModelEntry(name, loader, path)
+            return self._entries[name]
+
+    def get(self, name):
+        """Return the loaded model, loading it first (or reloading it if its file changed)"""
+        entry = self._entries[name]
+        if entry.state == "ready" and not self._file_changed(entry):
+            return entry.value
+        with entry.lock:
+            if entry.state != "ready":
+                self._load(entry)
+            elif self._file_changed(entry, force=True):
+                self._reload(entry)
+        return entry.value
+
+    def info(self, name):
+        """Version and load time of a model, e.g. for response headers"""
+        entry = self._entries[name]
+        return {"version": entry.version, "load_time_ms": entry.load_time_ms, "loaded_at": entry.loaded_at}
+
+    def _file_changed(self, entry, force=False):
+        """Check the model file at most every MODEL_RELOAD_CHECK_INTERVAL seconds"""
+        if entry.path is None:
+            return False
+        now = time.monotonic()
+        if not force and now - entry.checked_at < MODEL_RELOAD_CHECK_INTERVAL:
+            return False
+        entry.checked_at = now
+        try:
+            return file_signature(entry.path) != entry.signature
+        except OSError:
+            return False  # Keep serving the loaded model if the file is briefly missing
+
+    def _load(self, entry):
+        entry.state = "loading"
+        start = time.perf_counter()
+        try:
+            signature, version = self._file_state(entry)
+            value = entry.loader()
+        except Exception as e:
+            entry.state = "failed"
+            entry.error = str(e)
+            logger.error(f"Failed to load {entry.name}: {str(e)}")
+            raise
+        self._set_loaded(entry, value, start, signature, version)
+        logger.info(f"Loaded {entry.name} in {entry.load_time_ms} ms")
+
+    def _reload(self, entry):
+        """Swap in the new file's model; on failure keep serving the old one"""
+        start = time.perf_counter()
+        try:
+            signature, version = self._file_state(entry)
+            if version == entry.version:
+                # Touched but not modified
+                entry.signature = signature
+                return
+            value = entry.loader()
+        except Exception as e:
+            entry.error = f"Reload failed: {str(e)}"
+            logger.error(f"Failed to reload {entry.name}, keeping version {entry.version}: {str(e)}")
+            return
+        previous = entry.version
+        self._set_loaded(entry, value, start, signature, version)
+        entry.reloads += 1
+        logger.info(f"Reloaded {entry.name} ({previous} -> {version}) in {entry.load_time_ms} ms")
+
+    def _file_state(self, entry):
+        if entry.path is None or not os.path.exists(entry.path):
+            return None, None
+        return file_signature(entry.path), file_version(entry.path)
+
+    def _set_loaded(self, entry, value, start, signature, version):
+        entry.value = value
+        entry.signature = signature
+        entry.version = version
+        entry.checked_at = time.monotonic()
+        entry.load_time_ms = round((time.perf_counter() - start) * 1000, 2)
+        entry.loaded_at = datetime.now().isoformat()
+        entry.error = None
+        entry.state = "ready"
+
+    def warm_up(self, names=None):
+        """Load the given (or all) models, logging failures instead of raising"""
+        for name in names or list(self._entries):
+            try:
+                self.get(name)
+            except Exception:
+                pass  # Already logged; the model is retried on next use
+
+    def start_warmup(self):
+        """Load all registered models in a background thread"""
+        if self._warmup_thread is None or not self._warmup_thread.is_alive():
+            self._warmup_thread = threading.Thread(
+                target=self.warm_up, name="model-warmup", daemon=True)
+            self._warmup_thread.start()
+
+    def status(self):
+        """Loading state of every registered model"""
+        return {
+            name: {
+                "state": entry.state,
+                "version": entry.version,
+                "load_time_ms": entry.load_time_ms,
+                "loaded_at": entry.loaded_at,
+                "reloads": entry.reloads,
+                "error": entry.error
+            }
+            for name, entry in list(self._entries.items())
+        }
+
+    def is_ready(self):
+        """True once every model is loaded (with lazy loading, once none has failed)"""
+        states = [entry.state for entry in list(self._entries.values())]
+        if MODEL_WARMUP == "lazy":
+            return "failed" not in states
+        return all(state == "ready" for state in states)
+
+
+# Shared registry used across the app
+model_registry = ModelRegistry()
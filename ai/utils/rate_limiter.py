@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+
+# Every bucket created in the process, by name, for the metrics endpoint
+_buckets = {}
+
+
+class TokenBucket:
+    """
+    Token bucket for pacing calls against an external quota.
+
+    Holds up to ``capacity`` tokens and refills at ``rate`` tokens per second.
+    ``acquire`` waits (without blocking the event loop) until enough tokens
+    are available; requests larger than the capacity take the whole bucket.
+    """
+
+    def __init__(self, name, rate, capacity):
+        self.name = name
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._counters = {"acquired": 0, "waits": 0}
+        self._wait_ms = 0.0
+        _buckets[name] = self
+
+    def _take(self, amount):
+        """Take ``amount`` tokens now, or return the seconds to wait before retrying"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    async def acquire(self, amount=1.0):
+        if self.rate <= 0:
+            return  # Unlimited
+        amount = min(float(amount), self.capacity)
+        start = time.monotonic()
+        waited = False
+        while True:
+            delay = self._take(amount)
+            if not delay:
+                break
+            waited = True
+            await asyncio.sleep(delay)
+        with self._lock:
+            self._counters["acquired"] += 1
+            if waited:
+                self._counters["waits"] += 1
+                self._wait_ms += (time.monotonic() - start) * 1000
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                "available": round(min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate), 2),
+                "wait_time_ms": round(self._wait_ms, 2)
+            }
+
+
+def get_rate_limiter_stats():
+    return {name: bucket.stats() for name, bucket in list(_buckets.items())}